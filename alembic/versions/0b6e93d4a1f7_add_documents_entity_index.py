@@ -0,0 +1,25 @@
+"""add_documents_entity_index
+
+Revision ID: 0b6e93d4a1f7
+Revises: f18c4b2d7e05
+Create Date: 2026-10-19 16:24:11.530284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e93d4a1f7'
+down_revision: Union[str, None] = 'f18c4b2d7e05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_documents_entity', 'documents', ['entity_type', 'entity_id', 'uploaded_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_entity', table_name='documents')
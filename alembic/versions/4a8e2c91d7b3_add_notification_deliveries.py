@@ -0,0 +1,42 @@
+"""add_notification_deliveries
+
+Revision ID: 4a8e2c91d7b3
+Revises: 35bbf56e6ff8
+Create Date: 2026-10-19 09:12:41.508114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '4a8e2c91d7b3'
+down_revision: Union[str, None] = '35bbf56e6ff8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('notification_deliveries',
+    sa.Column('notification_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('channel', sa.Enum('EMAIL', 'TELEGRAM', name='deliverychannel'), nullable=False),
+    sa.Column('type', postgresql.ENUM('MAINTENANCE_REMINDER', 'CONTRACT_EXPIRY', 'LICENSE_EXPIRY', 'MEDICAL_EXPIRY', 'MILEAGE_ALERT', 'BUDGET_ALERT', 'SYSTEM', name='notificationtype', create_type=False), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'SENT', 'SKIPPED', name='deliverystatus'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['notification_id'], ['notifications.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notification_deliveries_pending', 'notification_deliveries', ['status', 'user_id', 'channel', 'type'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_deliveries_pending', table_name='notification_deliveries')
+    op.drop_table('notification_deliveries')
+    sa.Enum(name='deliverystatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='deliverychannel').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,32 @@
+"""add_document_search
+
+Revision ID: 7d2a58c0e3b6
+Revises: 0b6e93d4a1f7
+Create Date: 2026-10-19 17:48:03.662417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a58c0e3b6'
+down_revision: Union[str, None] = '0b6e93d4a1f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('content_text', sa.Text(), nullable=True))
+    op.add_column('documents', sa.Column('text_extracted_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('documents', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("to_tsvector('simple', filename || ' ' || coalesce(content_text, ''))", persisted=True), nullable=True))
+    op.create_index('ix_documents_search_vector', 'documents', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_search_vector', table_name='documents', postgresql_using='gin')
+    op.drop_column('documents', 'search_vector')
+    op.drop_column('documents', 'text_extracted_at')
+    op.drop_column('documents', 'content_text')
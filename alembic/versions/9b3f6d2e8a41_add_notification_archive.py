@@ -0,0 +1,45 @@
+"""add_notification_archive
+
+Revision ID: 9b3f6d2e8a41
+Revises: 4a8e2c91d7b3
+Create Date: 2026-10-19 10:03:17.224590
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f6d2e8a41'
+down_revision: Union[str, None] = '4a8e2c91d7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('notifications_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=300), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('type', postgresql.ENUM('MAINTENANCE_REMINDER', 'CONTRACT_EXPIRY', 'LICENSE_EXPIRY', 'MEDICAL_EXPIRY', 'MILEAGE_ALERT', 'BUDGET_ALERT', 'SYSTEM', name='notificationtype', create_type=False), nullable=False),
+    sa.Column('entity_type', sa.String(length=50), nullable=True),
+    sa.Column('entity_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notifications_archive_user_id'), 'notifications_archive', ['user_id'], unique=False)
+    op.create_index(op.f('ix_notifications_archive_archived_at'), 'notifications_archive', ['archived_at'], unique=False)
+    op.create_index('ix_notifications_user_created', 'notifications', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_notifications_read_created', 'notifications', ['created_at'], unique=False, postgresql_where=sa.text('is_read'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_read_created', table_name='notifications')
+    op.drop_index('ix_notifications_user_created', table_name='notifications')
+    op.drop_index(op.f('ix_notifications_archive_archived_at'), table_name='notifications_archive')
+    op.drop_index(op.f('ix_notifications_archive_user_id'), table_name='notifications_archive')
+    op.drop_table('notifications_archive')
@@ -0,0 +1,30 @@
+"""add_user_department
+
+Revision ID: 9c41e7b2f5d8
+Revises: 7d2a58c0e3b6
+Create Date: 2026-10-19 19:12:40.218553
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41e7b2f5d8'
+down_revision: Union[str, None] = '7d2a58c0e3b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('department', sa.String(length=200), nullable=True))
+    op.create_index(op.f('ix_vehicles_department'), 'vehicles', ['department'], unique=False)
+    op.create_index(op.f('ix_drivers_department'), 'drivers', ['department'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_drivers_department'), table_name='drivers')
+    op.drop_index(op.f('ix_vehicles_department'), table_name='vehicles')
+    op.drop_column('users', 'department')
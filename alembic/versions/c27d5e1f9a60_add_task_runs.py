@@ -0,0 +1,39 @@
+"""add_task_runs
+
+Revision ID: c27d5e1f9a60
+Revises: 9b3f6d2e8a41
+Create Date: 2026-10-19 11:21:05.781342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27d5e1f9a60'
+down_revision: Union[str, None] = '9b3f6d2e8a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_runs',
+    sa.Column('task_name', sa.String(length=200), nullable=False),
+    sa.Column('run_key', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.Enum('RUNNING', 'SUCCEEDED', 'FAILED', name='task_run_status'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('task_name', 'run_key', name='uq_task_runs_task_name_run_key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_runs')
+    sa.Enum(name='task_run_status').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,28 @@
+"""add_document_derivatives
+
+Revision ID: e5a71c3b9d24
+Revises: c27d5e1f9a60
+Create Date: 2026-10-19 14:02:37.415920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a71c3b9d24'
+down_revision: Union[str, None] = 'c27d5e1f9a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('thumbnail_key', sa.String(length=1000), nullable=True))
+    op.add_column('documents', sa.Column('preview_key', sa.String(length=1000), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('documents', 'preview_key')
+    op.drop_column('documents', 'thumbnail_key')
@@ -0,0 +1,38 @@
+"""add_document_blobs
+
+Revision ID: f18c4b2d7e05
+Revises: e5a71c3b9d24
+Create Date: 2026-10-19 15:10:52.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f18c4b2d7e05'
+down_revision: Union[str, None] = 'e5a71c3b9d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('document_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('s3_key', sa.String(length=1000), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('s3_key'),
+    sa.UniqueConstraint('sha256')
+    )
+    op.create_index(op.f('ix_documents_s3_key'), 'documents', ['s3_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_documents_s3_key'), table_name='documents')
+    op.drop_table('document_blobs')
@@ -4,44 +4,78 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
 from app.models.user import User, UserRole
+from app.permissions import Permission, has_permission
 from app.repositories.user_repo import UserRepository
+from app.services.token_revocation import claims_trusted
 from app.utils.security import decode_token
 
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    """Extract and validate user from JWT Bearer token."""
+def _access_claims(credentials: HTTPAuthorizationCredentials) -> dict:
     payload = decode_token(credentials.credentials)
     if not payload or payload.get("type") != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    return payload
+
 
+async def _load_user(payload: dict, db: AsyncSession) -> User:
     user_id = UUID(payload["sub"])
     repo = UserRepository(db)
     user = await repo.get_by_id(user_id)
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or disabled")
-
     return user
 
 
-def require_roles(*roles: UserRole):
-    """Dependency factory: require user to have one of the specified roles."""
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Extract and validate user from JWT Bearer token."""
+    return await _load_user(_access_claims(credentials), db)
+
+
+async def get_token_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Resolve the caller for role checks.
+
+    With ``JWT_STATELESS_ROLES`` the signed ``sub``/``role``/``dept``
+    claims are trusted unless the token predates a revocation, and the
+    result is a detached User with only ``id``, ``role`` and ``department``
+    set. Otherwise, and for tokens issued without those claims, the user is
+    loaded as usual.
+    """
+    payload = _access_claims(credentials)
+    if settings.JWT_STATELESS_ROLES and payload.keys() >= {"iat", "role", "dept"}:
+        user_id = UUID(payload["sub"])
+        if await claims_trusted(user_id, payload["iat"]):
+            return User(id=user_id, role=UserRole(payload["role"]), department=payload["dept"], is_active=True)
+    return await _load_user(payload, db)
+
+
+def require_permission(permission: Permission):
+    """Dependency factory: require the user's role to grant ``permission``.
+
+    Handlers get the principal from ``get_token_principal``: rely on its
+    ``id``, ``role`` and ``department`` only, and depend on
+    ``get_current_user`` for the full user.
+    """
 
-    async def check_role(user: User = Depends(get_current_user)) -> User:
-        if user.role not in roles:
+    async def check_permission(user: User = Depends(get_token_principal)) -> User:
+        if not has_permission(user, permission):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return user
 
-    return check_role
+    return check_permission
 
 
 # Convenience shortcuts
-require_admin = require_roles(UserRole.ADMIN)
-require_fleet_manager = require_roles(UserRole.ADMIN, UserRole.FLEET_MANAGER)
-require_driver = require_roles(UserRole.ADMIN, UserRole.FLEET_MANAGER, UserRole.DRIVER)
+require_authenticated = require_permission(Permission.VIEW)
+require_fleet_manager = require_permission(Permission.MANAGE_FLEET)
+require_admin = require_permission(Permission.MANAGE_USERS)
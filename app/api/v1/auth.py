@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
@@ -13,6 +13,7 @@ from app.schemas.user import (
     UserRead,
 )
 from app.services.auth_service import AuthService
+from app.services.login_throttle import LoginThrottledError
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -35,11 +36,17 @@ async def register(data: UserCreate, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
+async def login(data: LoginRequest, request: Request, db: AsyncSession = Depends(get_db)):
     service = AuthService(db)
     try:
-        user, access_token, refresh_token = await service.authenticate(data.username, data.password)
+        user, access_token, refresh_token = await service.authenticate(
+            data.username, data.password, ip=request.client.host if request.client else None
+        )
         return TokenResponse(access_token=access_token, refresh_token=refresh_token)
+    except LoginThrottledError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
@@ -1,14 +1,15 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.responses import RedirectResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import require_authenticated, require_permission
 from app.database import get_db
 from app.models.document import DocumentType, EntityType
 from app.models.user import User
-from app.services.document_service import DocumentService
+from app.permissions import Permission, department_scope
+from app.services.document_service import DocumentService, UploadedFile
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -20,13 +21,12 @@ async def upload_document(
     entity_id: UUID = Form(...),
     doc_type: DocumentType = Form(DocumentType.OTHER),
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(require_permission(Permission.MANAGE_DOCUMENTS)),
 ):
-    service = DocumentService(db)
-    file_data = await file.read()
+    service = DocumentService(db, department_scope(user))
     try:
         doc = await service.upload(
-            file_data=file_data,
+            fileobj=file.file,
             filename=file.filename or "unknown",
             mime_type=file.content_type or "application/octet-stream",
             entity_type=entity_type,
@@ -34,6 +34,8 @@ async def upload_document(
             doc_type=doc_type,
             uploaded_by=user.id,
         )
+        await db.commit()
+        await service.after_commit()
         return {
             "id": str(doc.id),
             "filename": doc.filename,
@@ -44,13 +46,79 @@ async def upload_document(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/upload/bulk", status_code=status.HTTP_201_CREATED)
+async def upload_documents(
+    files: list[UploadFile] = File(...),
+    entity_type: EntityType = Form(...),
+    entity_id: UUID = Form(...),
+    doc_type: DocumentType = Form(DocumentType.OTHER),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(require_permission(Permission.MANAGE_DOCUMENTS)),
+):
+    service = DocumentService(db, department_scope(user))
+    try:
+        docs = await service.upload_many(
+            [
+                UploadedFile(f.file, f.filename or "unknown", f.content_type or "application/octet-stream")
+                for f in files
+            ],
+            entity_type=entity_type,
+            entity_id=entity_id,
+            doc_type=doc_type,
+            uploaded_by=user.id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await db.commit()
+    await service.after_commit()
+    return [
+        {
+            "id": str(doc.id),
+            "filename": doc.filename,
+            "mime_type": doc.mime_type,
+            "size_bytes": doc.size_bytes,
+        }
+        for doc in docs
+    ]
+
+
+@router.get("/search")
+async def search_documents(
+    q: str = Query(..., min_length=2, max_length=200),
+    entity_type: EntityType = Query(...),
+    entity_id: UUID | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(require_authenticated),
+):
+    """Search document filenames and extracted text (invoices, acts, contracts) within one entity type."""
+    service = DocumentService(db, department_scope(user))
+    try:
+        results = await service.search(q, entity_type, entity_id=entity_id, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return [
+        {
+            "id": str(d.id),
+            "entity_id": str(d.entity_id),
+            "filename": d.filename,
+            "mime_type": d.mime_type,
+            "type": d.type.value,
+            "uploaded_at": d.uploaded_at.isoformat() if d.uploaded_at else None,
+            "rank": rank,
+            "snippet": snippet,
+        }
+        for d, rank, snippet in results
+    ]
+
+
 @router.get("/{doc_id}/download")
 async def download_document(
     doc_id: UUID,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user),
+    user: User = Depends(require_authenticated),
 ):
-    service = DocumentService(db)
+    service = DocumentService(db, department_scope(user))
     url = await service.get_download_url(doc_id)
     if not url:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -62,9 +130,9 @@ async def list_entity_documents(
     entity_type: EntityType,
     entity_id: UUID,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user),
+    user: User = Depends(require_authenticated),
 ):
-    service = DocumentService(db)
+    service = DocumentService(db, department_scope(user))
     docs = await service.list_for_entity(entity_type, entity_id)
     return [
         {
@@ -79,14 +147,35 @@ async def list_entity_documents(
     ]
 
 
+@router.get("/entity/{entity_type}/{entity_id}/zip")
+async def download_entity_documents(
+    entity_type: EntityType,
+    entity_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(require_authenticated),
+):
+    """Stream all documents of an entity as one zip archive."""
+    service = DocumentService(db, department_scope(user))
+    docs = await service.list_for_entity(entity_type, entity_id)
+    if not docs:
+        raise HTTPException(status_code=404, detail="No documents found")
+    return StreamingResponse(
+        service.iter_zip(docs),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{entity_type.value}-{entity_id}.zip"'},
+    )
+
+
 @router.delete("/{doc_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
     doc_id: UUID,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user),
+    user: User = Depends(require_permission(Permission.MANAGE_DOCUMENTS)),
 ):
-    service = DocumentService(db)
+    service = DocumentService(db, department_scope(user))
     try:
         await service.delete(doc_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    await db.commit()
+    await service.after_commit()
@@ -3,10 +3,11 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, require_fleet_manager
+from app.api.deps import require_authenticated, require_fleet_manager
 from app.database import get_db
 from app.models.driver import DriverStatus
 from app.models.user import User
+from app.permissions import department_scope
 from app.repositories.base import BaseRepository
 from app.schemas.common import PaginatedResponse
 from app.schemas.driver import DriverCreate, DriverRead, DriverUpdate
@@ -22,9 +23,9 @@ async def list_drivers(
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user),
+    user: User = Depends(require_authenticated),
 ):
-    service = DriverService(db)
+    service = DriverService(db, department_scope(user))
     items, total = await service.list_drivers(q=q, status=status, page=page, size=size)
     return PaginatedResponse(
         items=[DriverRead.model_validate(d) for d in items],
@@ -34,8 +35,8 @@ async def list_drivers(
 
 
 @router.get("/{driver_id}", response_model=DriverRead)
-async def get_driver(driver_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user)):
-    service = DriverService(db)
+async def get_driver(driver_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(require_authenticated)):
+    service = DriverService(db, department_scope(user))
     driver = await service.get_by_id(driver_id)
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found")
@@ -43,14 +44,14 @@ async def get_driver(driver_id: UUID, db: AsyncSession = Depends(get_db), _: Use
 
 
 @router.post("", response_model=DriverRead, status_code=status.HTTP_201_CREATED)
-async def create_driver(data: DriverCreate, db: AsyncSession = Depends(get_db), _: User = Depends(require_fleet_manager)):
-    service = DriverService(db)
+async def create_driver(data: DriverCreate, db: AsyncSession = Depends(get_db), user: User = Depends(require_fleet_manager)):
+    service = DriverService(db, department_scope(user))
     return await service.create(data)
 
 
 @router.patch("/{driver_id}", response_model=DriverRead)
-async def update_driver(driver_id: UUID, data: DriverUpdate, db: AsyncSession = Depends(get_db), _: User = Depends(require_fleet_manager)):
-    service = DriverService(db)
+async def update_driver(driver_id: UUID, data: DriverUpdate, db: AsyncSession = Depends(get_db), user: User = Depends(require_fleet_manager)):
+    service = DriverService(db, department_scope(user))
     try:
         return await service.update(driver_id, data)
     except ValueError as e:
@@ -58,8 +59,8 @@ async def update_driver(driver_id: UUID, data: DriverUpdate, db: AsyncSession =
 
 
 @router.delete("/{driver_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_driver(driver_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(require_fleet_manager)):
-    service = DriverService(db)
+async def delete_driver(driver_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(require_fleet_manager)):
+    service = DriverService(db, department_scope(user))
     try:
         await service.delete(driver_id)
     except ValueError as e:
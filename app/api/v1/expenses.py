@@ -3,10 +3,11 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, require_fleet_manager
+from app.api.deps import require_authenticated, require_fleet_manager
 from app.database import get_db
 from app.models.expense import ExpenseCategory
 from app.models.user import User
+from app.permissions import department_scope
 from app.repositories.base import BaseRepository
 from app.schemas.common import PaginatedResponse
 from app.schemas.expense import ExpenseCreate, ExpenseRead, ExpenseUpdate
@@ -21,9 +22,9 @@ async def list_expenses(
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user),
+    user: User = Depends(require_authenticated),
 ):
-    service = ExpenseService(db)
+    service = ExpenseService(db, department_scope(user))
     items, total = await service.list_all(category=category, page=page, size=size)
     return PaginatedResponse(
         items=[ExpenseRead.model_validate(i) for i in items],
@@ -33,8 +34,8 @@ async def list_expenses(
 
 
 @router.get("/{expense_id}", response_model=ExpenseRead)
-async def get_expense(expense_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user)):
-    service = ExpenseService(db)
+async def get_expense(expense_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(require_authenticated)):
+    service = ExpenseService(db, department_scope(user))
     expense = await service.get_by_id(expense_id)
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
@@ -43,13 +44,16 @@ async def get_expense(expense_id: UUID, db: AsyncSession = Depends(get_db), _: U
 
 @router.post("", response_model=ExpenseRead, status_code=status.HTTP_201_CREATED)
 async def create_expense(data: ExpenseCreate, db: AsyncSession = Depends(get_db), user: User = Depends(require_fleet_manager)):
-    service = ExpenseService(db)
-    return await service.create(data, user.id)
+    service = ExpenseService(db, department_scope(user))
+    try:
+        return await service.create(data, user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.patch("/{expense_id}", response_model=ExpenseRead)
-async def update_expense(expense_id: UUID, data: ExpenseUpdate, db: AsyncSession = Depends(get_db), _: User = Depends(require_fleet_manager)):
-    service = ExpenseService(db)
+async def update_expense(expense_id: UUID, data: ExpenseUpdate, db: AsyncSession = Depends(get_db), user: User = Depends(require_fleet_manager)):
+    service = ExpenseService(db, department_scope(user))
     try:
         return await service.update(expense_id, data)
     except ValueError as e:
@@ -57,8 +61,8 @@ async def update_expense(expense_id: UUID, data: ExpenseUpdate, db: AsyncSession
 
 
 @router.delete("/{expense_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_expense(expense_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(require_fleet_manager)):
-    service = ExpenseService(db)
+async def delete_expense(expense_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(require_fleet_manager)):
+    service = ExpenseService(db, department_scope(user))
     try:
         await service.delete(expense_id)
     except ValueError as e:
@@ -3,10 +3,11 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, require_fleet_manager
+from app.api.deps import require_authenticated, require_fleet_manager
 from app.database import get_db
 from app.models.maintenance import MaintenanceStatus
 from app.models.user import User
+from app.permissions import department_scope
 from app.repositories.base import BaseRepository
 from app.schemas.common import PaginatedResponse
 from app.schemas.maintenance import MaintenanceCreate, MaintenanceRead, MaintenanceUpdate
@@ -21,9 +22,9 @@ async def list_maintenance(
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user),
+    user: User = Depends(require_authenticated),
 ):
-    service = MaintenanceService(db)
+    service = MaintenanceService(db, department_scope(user))
     items, total = await service.list_all(status=status, page=page, size=size)
     return PaginatedResponse(
         items=[MaintenanceRead.model_validate(i) for i in items],
@@ -33,8 +34,8 @@ async def list_maintenance(
 
 
 @router.get("/{record_id}", response_model=MaintenanceRead)
-async def get_maintenance(record_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user)):
-    service = MaintenanceService(db)
+async def get_maintenance(record_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(require_authenticated)):
+    service = MaintenanceService(db, department_scope(user))
     record = await service.get_by_id(record_id)
     if not record:
         raise HTTPException(status_code=404, detail="Record not found")
@@ -43,13 +44,16 @@ async def get_maintenance(record_id: UUID, db: AsyncSession = Depends(get_db), _
 
 @router.post("", response_model=MaintenanceRead, status_code=status.HTTP_201_CREATED)
 async def create_maintenance(data: MaintenanceCreate, db: AsyncSession = Depends(get_db), user: User = Depends(require_fleet_manager)):
-    service = MaintenanceService(db)
-    return await service.create(data, user.id)
+    service = MaintenanceService(db, department_scope(user))
+    try:
+        return await service.create(data, user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.patch("/{record_id}", response_model=MaintenanceRead)
-async def update_maintenance(record_id: UUID, data: MaintenanceUpdate, db: AsyncSession = Depends(get_db), _: User = Depends(require_fleet_manager)):
-    service = MaintenanceService(db)
+async def update_maintenance(record_id: UUID, data: MaintenanceUpdate, db: AsyncSession = Depends(get_db), user: User = Depends(require_fleet_manager)):
+    service = MaintenanceService(db, department_scope(user))
     try:
         return await service.update(record_id, data)
     except ValueError as e:
@@ -57,8 +61,8 @@ async def update_maintenance(record_id: UUID, data: MaintenanceUpdate, db: Async
 
 
 @router.patch("/{record_id}/complete", response_model=MaintenanceRead)
-async def complete_maintenance(record_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(require_fleet_manager)):
-    service = MaintenanceService(db)
+async def complete_maintenance(record_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(require_fleet_manager)):
+    service = MaintenanceService(db, department_scope(user))
     try:
         return await service.complete(record_id)
     except ValueError as e:
@@ -66,8 +70,8 @@ async def complete_maintenance(record_id: UUID, db: AsyncSession = Depends(get_d
 
 
 @router.delete("/{record_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_maintenance(record_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(require_fleet_manager)):
-    service = MaintenanceService(db)
+async def delete_maintenance(record_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(require_fleet_manager)):
+    service = MaintenanceService(db, department_scope(user))
     try:
         await service.delete(record_id)
     except ValueError as e:
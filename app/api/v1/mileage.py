@@ -3,9 +3,10 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import require_authenticated, require_permission
 from app.database import get_db
 from app.models.user import User
+from app.permissions import Permission, department_scope
 from app.schemas.mileage import BulkMileageCreate, MileageCreate, MileageRead
 from app.services.mileage_service import MileageService
 
@@ -16,9 +17,9 @@ router = APIRouter(prefix="/mileage", tags=["mileage"])
 async def add_mileage(
     data: MileageCreate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(require_permission(Permission.RECORD_MILEAGE)),
 ):
-    service = MileageService(db)
+    service = MileageService(db, department_scope(user))
     try:
         return await service.add_reading(data, user.id)
     except ValueError as e:
@@ -29,9 +30,9 @@ async def add_mileage(
 async def add_bulk_mileage(
     data: BulkMileageCreate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(require_permission(Permission.RECORD_MILEAGE)),
 ):
-    service = MileageService(db)
+    service = MileageService(db, department_scope(user))
     try:
         return await service.add_bulk(data.entries, user.id)
     except ValueError as e:
@@ -43,7 +44,7 @@ async def get_vehicle_mileage(
     vehicle_id: UUID,
     limit: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user),
+    user: User = Depends(require_authenticated),
 ):
-    service = MileageService(db)
+    service = MileageService(db, department_scope(user))
     return await service.get_history(vehicle_id, limit=limit)
@@ -4,9 +4,10 @@ from fastapi import APIRouter, Depends, Query
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, require_fleet_manager
-from app.database import get_db
+from app.api.deps import require_authenticated, require_permission
+from app.database import get_read_db
 from app.models.user import User
+from app.permissions import Permission, department_scope
 from app.services.report_service import ReportService
 
 router = APIRouter(prefix="/reports", tags=["reports"])
@@ -16,19 +17,19 @@ router = APIRouter(prefix="/reports", tags=["reports"])
 async def tco_report(
     start_date: dt.date | None = None,
     end_date: dt.date | None = None,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(require_authenticated),
 ):
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     return await svc.tco_report(start_date, end_date)
 
 
 @router.get("/fleet-utilization")
 async def fleet_utilization(
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(require_authenticated),
 ):
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     return await svc.fleet_utilization()
 
 
@@ -36,10 +37,10 @@ async def fleet_utilization(
 async def fuel_consumption(
     start_date: dt.date | None = None,
     end_date: dt.date | None = None,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(require_authenticated),
 ):
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     return await svc.fuel_consumption(start_date, end_date)
 
 
@@ -47,10 +48,10 @@ async def fuel_consumption(
 async def expense_analysis(
     start_date: dt.date | None = None,
     end_date: dt.date | None = None,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(require_authenticated),
 ):
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     return await svc.expense_analysis(start_date, end_date)
 
 
@@ -58,10 +59,10 @@ async def expense_analysis(
 async def maintenance_history(
     start_date: dt.date | None = None,
     end_date: dt.date | None = None,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(require_authenticated),
 ):
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     return await svc.maintenance_history(start_date, end_date)
 
 
@@ -71,10 +72,10 @@ async def maintenance_history(
 async def export_tco_excel(
     start_date: dt.date | None = None,
     end_date: dt.date | None = None,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(require_fleet_manager),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(require_permission(Permission.EXPORT_REPORTS)),
 ):
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     data = await svc.export_tco_excel(start_date, end_date)
     return Response(
         content=data,
@@ -87,10 +88,10 @@ async def export_tco_excel(
 async def export_fuel_excel(
     start_date: dt.date | None = None,
     end_date: dt.date | None = None,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(require_fleet_manager),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(require_permission(Permission.EXPORT_REPORTS)),
 ):
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     data = await svc.export_fuel_excel(start_date, end_date)
     return Response(
         content=data,
@@ -103,10 +104,10 @@ async def export_fuel_excel(
 async def export_maintenance_excel(
     start_date: dt.date | None = None,
     end_date: dt.date | None = None,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(require_fleet_manager),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(require_permission(Permission.EXPORT_REPORTS)),
 ):
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     data = await svc.export_maintenance_excel(start_date, end_date)
     return Response(
         content=data,
@@ -119,10 +120,10 @@ async def export_maintenance_excel(
 async def export_expenses_csv(
     start_date: dt.date | None = None,
     end_date: dt.date | None = None,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(require_fleet_manager),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(require_permission(Permission.EXPORT_REPORTS)),
 ):
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     data = await svc.export_expense_csv(start_date, end_date)
     return Response(
         content=data,
@@ -5,6 +5,7 @@ from app.api.v1.contracts import router as contracts_router
 from app.api.v1.documents import router as documents_router
 from app.api.v1.drivers import router as drivers_router
 from app.api.v1.reports import router as reports_router
+from app.api.v1.system import router as system_router
 from app.api.v1.expenses import router as expenses_router
 from app.api.v1.maintenance import router as maintenance_router
 from app.api.v1.mileage import router as mileage_router
@@ -23,6 +24,7 @@ api_router.include_router(expenses_router)
 api_router.include_router(contracts_router)
 api_router.include_router(documents_router)
 api_router.include_router(reports_router)
+api_router.include_router(system_router)
 
 
 @api_router.get("/health", tags=["system"])
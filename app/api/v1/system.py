@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import require_permission
+from app.database import pool_stats
+from app.models.user import User
+from app.permissions import Permission
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+
+@router.get("/queues")
+async def queue_metrics(_: User = Depends(require_permission(Permission.VIEW_SYSTEM))):
+    """Celery queue depth and wait-time percentiles."""
+    from app.tasks.metrics import queue_stats  # keeps Celery out of web startup
+
+    return await run_in_threadpool(queue_stats)
+
+
+@router.get("/db-pool")
+async def db_pool_metrics(_: User = Depends(require_permission(Permission.VIEW_SYSTEM))):
+    """Database connection pool usage and checkout waits for the worker serving this request."""
+    return pool_stats()
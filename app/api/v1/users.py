@@ -1,3 +1,4 @@
+import logging
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -10,10 +11,35 @@ from app.repositories.user_repo import UserRepository
 from app.schemas.common import PaginatedResponse
 from app.schemas.user import UserCreate, UserRead, UserUpdate
 from app.services.auth_service import AuthService
+from app.services.session_store import revoke_user_sessions
+from app.services.token_revocation import TokenRevocationError, revoke_tokens
+from app.services.user_cache import invalidate_user
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
+async def _revoke_before_commit(user_id: UUID) -> None:
+    """Revoke the user's tokens, or fail the request so the change is rolled back."""
+    try:
+        await revoke_tokens(user_id)
+    except TokenRevocationError as e:
+        logger.error("%s, change not applied", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not revoke the user's access tokens, try again later",
+        )
+
+
+async def _revoke_after_commit(user_id: UUID) -> None:
+    """Revoke tokens issued while the change was committed; the earlier revocation stands if this fails."""
+    try:
+        await revoke_tokens(user_id)
+    except TokenRevocationError:
+        logger.error("Could not re-revoke access tokens of user %s after commit", user_id, exc_info=True)
+
+
 @router.get("", response_model=PaginatedResponse[UserRead])
 async def list_users(
     page: int = Query(1, ge=1),
@@ -60,6 +86,7 @@ async def create_user(
             password=data.password,
             role=data.role,
             language=data.language,
+            department=data.department,
         )
         return user
     except ValueError as e:
@@ -83,6 +110,16 @@ async def update_user(
         return user
 
     user = await repo.update(user, **update_data)
+    revoke = bool(update_data.keys() & {"role", "is_active", "department"})
+    if revoke:
+        await _revoke_before_commit(user.id)
+    # Role, department and is_active changes must reach the caches before the next request
+    await db.commit()
+    await invalidate_user(user.id)
+    if revoke:
+        await _revoke_after_commit(user.id)
+    if not user.is_active:
+        await revoke_user_sessions(user.id)
     return user
 
 
@@ -101,3 +138,8 @@ async def delete_user(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     await repo.delete(user)
+    await _revoke_before_commit(user_id)
+    await db.commit()
+    await invalidate_user(user_id)
+    await _revoke_after_commit(user_id)
+    await revoke_user_sessions(user_id)
@@ -3,10 +3,11 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, require_fleet_manager
+from app.api.deps import require_authenticated, require_fleet_manager
 from app.database import get_db
 from app.models.user import User
 from app.models.vehicle import BodyType, FuelType, VehicleStatus
+from app.permissions import department_scope
 from app.repositories.base import BaseRepository
 from app.schemas.common import PaginatedResponse
 from app.schemas.vehicle import VehicleCreate, VehicleRead, VehicleUpdate
@@ -26,9 +27,9 @@ async def list_vehicles(
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user),
+    user: User = Depends(require_authenticated),
 ):
-    service = VehicleService(db)
+    service = VehicleService(db, department_scope(user))
     items, total = await service.list_vehicles(
         q=q, status=status, brand=brand, fuel_type=fuel_type,
         body_type=body_type, department=department, page=page, size=size,
@@ -44,9 +45,9 @@ async def list_vehicles(
 async def get_vehicle(
     vehicle_id: UUID,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user),
+    user: User = Depends(require_authenticated),
 ):
-    service = VehicleService(db)
+    service = VehicleService(db, department_scope(user))
     vehicle = await service.get_by_id(vehicle_id)
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
@@ -57,9 +58,9 @@ async def get_vehicle(
 async def create_vehicle(
     data: VehicleCreate,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(require_fleet_manager),
+    user: User = Depends(require_fleet_manager),
 ):
-    service = VehicleService(db)
+    service = VehicleService(db, department_scope(user))
     try:
         return await service.create(data)
     except ValueError as e:
@@ -71,9 +72,9 @@ async def update_vehicle(
     vehicle_id: UUID,
     data: VehicleUpdate,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(require_fleet_manager),
+    user: User = Depends(require_fleet_manager),
 ):
-    service = VehicleService(db)
+    service = VehicleService(db, department_scope(user))
     try:
         return await service.update(vehicle_id, data)
     except ValueError as e:
@@ -84,9 +85,9 @@ async def update_vehicle(
 async def delete_vehicle(
     vehicle_id: UUID,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(require_fleet_manager),
+    user: User = Depends(require_fleet_manager),
 ):
-    service = VehicleService(db)
+    service = VehicleService(db, department_scope(user))
     try:
         await service.delete(vehicle_id)
     except ValueError as e:
@@ -2,17 +2,48 @@
 
 Priority for secret resolution:
 1. Explicit environment variables (highest priority)
-2. Vault secrets (injected into env if not already set)
+2. Vault secrets (``VaultSettingsSource``)
 3. Pydantic field defaults (non-sensitive values only)
+
+Nothing is loaded at import: ``settings`` builds the Settings instance the
+first time one of its attributes is used. When Vault values rotate, the
+provider (app/utils/vault.py) refreshes them in the background and
+``settings`` switches to a rebuilt instance. Code that reads ``settings``
+when it needs a value picks up the change. Clients built once at startup,
+such as the database engine, keep the values they were built with until
+the process restarts.
 """
 
-from pydantic_settings import BaseSettings
+import logging
+import threading
+from typing import Any
+
+from pydantic.fields import FieldInfo
+from pydantic_settings import BaseSettings, PydanticBaseSettingsSource
+
+from app.utils.vault import get_vault_provider
+
+logger = logging.getLogger(__name__)
+
 
-# Inject Vault secrets into environment BEFORE Settings instantiation.
-# This ensures Pydantic Settings picks them up naturally via env vars.
-from app.utils.vault import inject_vault_secrets_to_env
+class VaultSettingsSource(PydanticBaseSettingsSource):
+    """Settings values from the Vault secret, for fields not set in the environment."""
 
-inject_vault_secrets_to_env()
+    def get_field_value(self, field: FieldInfo, field_name: str) -> tuple[Any, str, bool]:
+        provider = get_vault_provider()
+        value = provider.get().get(field_name) if provider else None
+        return value, field_name, self.field_is_complex(field)
+
+    def __call__(self) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        for field_name, field in self.settings_cls.model_fields.items():
+            value, key, is_complex = self.get_field_value(field, field_name)
+            if value is None:
+                continue
+            if is_complex and isinstance(value, str):
+                value = self.decode_complex_value(key, field, value)
+            data[key] = value
+        return data
 
 
 class Settings(BaseSettings):
@@ -24,7 +55,29 @@ class Settings(BaseSettings):
 
     # Database (no defaults — must come from Vault or env)
     DATABASE_URL: str = ""
-    DATABASE_URL_SYNC: str = ""
+    CELERY_DB_POOL_SIZE: int = 2  # per worker process
+    # Engine tuning. Pool limits are per process: keep
+    # web workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) + celery processes * CELERY_DB_POOL_SIZE
+    # below the server's max_connections
+    DB_ECHO: bool = False  # log every statement; costly, enable only when debugging queries
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: int = 10  # seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # reopen connections older than this (seconds)
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection
+    DB_SERVER_SETTINGS: dict[str, str] = {"jit": "off", "application_name": "fleetcore"}
+    # Connecting through PgBouncer in transaction pooling mode: disables the prepared
+    # statement cache and sends only application_name at startup (set jit=off on the
+    # database instead). Read-only endpoints then run each SELECT in its own transaction
+    DB_PGBOUNCER: bool = False
+    # Streaming replicas for read-only endpoints (JSON list in env). Each replica
+    # gets its own pool of the same size. Replicas lagging more than
+    # DB_REPLICA_MAX_LAG_SECONDS are skipped; lag is re-checked every
+    # DB_REPLICA_CHECK_INTERVAL seconds per process
+    DATABASE_REPLICA_URLS: list[str] = []
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0
 
     # Redis
     REDIS_URL: str = ""
@@ -34,6 +87,22 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     ALGORITHM: str = "HS256"
+    # API role checks trust the access token's role claim instead of loading the user;
+    # role changes and deactivation revoke earlier tokens via Redis
+    JWT_STATELESS_ROLES: bool = False
+    # Web sessions live in Redis; the cookie holds only the session id
+    SESSION_MAX_AGE: int = 86400 * 7  # seconds since the last request
+    SESSION_HTTPS_ONLY: bool = False
+    PASSWORD_HASH_CONCURRENCY: int = 4  # bcrypt threads per process
+    # Failed logins allowed per window before further attempts get 429
+    LOGIN_RATE_WINDOW_SECONDS: int = 900
+    LOGIN_MAX_FAILURES_PER_USERNAME: int = 5
+    LOGIN_MAX_FAILURES_PER_IP: int = 50
+    # Authenticated users are cached per process and in Redis; writes invalidate both,
+    # other processes may serve their local copy for up to USER_CACHE_LOCAL_TTL
+    USER_CACHE_TTL: int = 60  # seconds
+    USER_CACHE_LOCAL_TTL: int = 5  # seconds
+    USER_CACHE_SIZE: int = 1024
 
     # MinIO / S3
     MINIO_ENDPOINT: str = ""
@@ -42,6 +111,17 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str = ""
     MINIO_BUCKET: str = "fleetcore"
     MINIO_USE_SSL: bool = False
+    S3_MAX_POOL_CONNECTIONS: int = 50
+    S3_MAX_CONCURRENCY: int = 8  # concurrent S3 calls per process from async code
+    S3_MULTIPART_PART_SIZE_MB: int = 8
+    S3_CONNECT_TIMEOUT: int = 5
+    S3_READ_TIMEOUT: int = 60
+
+    # Documents. Uploads are streamed to S3, so the size limit does not bound worker memory
+    MAX_UPLOAD_SIZE_MB: int = 50
+    DOCUMENT_LISTING_CACHE_TTL: int = 300  # seconds; listings are also invalidated on upload/delete
+    # Unreferenced S3 objects younger than this are left alone (uploads in flight)
+    STORAGE_GC_GRACE_HOURS: int = 24
 
     # SMTP
     SMTP_HOST: str = ""
@@ -54,11 +134,75 @@ class Settings(BaseSettings):
     TELEGRAM_BOT_TOKEN: str = ""
     TELEGRAM_CHAT_ID: str = ""
 
+    # Notifications (default digest window when a user has no preference)
+    NOTIFICATION_DIGEST_WINDOW_MINUTES: int = 15
+
+    # Notification retention: read notifications move to the archive after
+    # RETENTION_DAYS and are purged from it after ARCHIVE_RETENTION_DAYS
+    NOTIFICATION_RETENTION_DAYS: int = 90
+    NOTIFICATION_ARCHIVE_RETENTION_DAYS: int = 365
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = 1000
+    NOTIFICATION_RETENTION_MAX_BATCHES: int = 200
+    NOTIFICATION_RETENTION_PAUSE_SECONDS: float = 0.2
+    # Scheduled-task ledger rows (task_runs) are deleted by the same job after this long
+    TASK_RUN_RETENTION_DAYS: int = 30
+
     # Pagination (non-sensitive)
     DEFAULT_PAGE_SIZE: int = 50
     MAX_PAGE_SIZE: int = 200
 
     model_config = {"extra": "ignore"}
 
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return init_settings, env_settings, VaultSettingsSource(settings_cls), dotenv_settings, file_secret_settings
+
+
+_current: Settings | None = None
+_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    global _current
+    if _current is None:
+        with _lock:
+            if _current is None:
+                provider = get_vault_provider()
+                if provider is not None:
+                    provider.subscribe(_reload)
+                _current = Settings()
+    return _current
+
+
+def _reload(_secrets: dict[str, Any]) -> None:
+    """Switch to Settings rebuilt from rotated Vault values; keep the old ones if they don't validate."""
+    global _current
+    try:
+        _current = Settings()
+    except ValueError:
+        logger.exception("Rotated Vault secrets do not validate; keeping the previous settings")
+        return
+    logger.info("Settings reloaded after a Vault secret change")
+
+
+class _LazySettings:
+    """Stands in for the Settings instance until something reads from it."""
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(get_settings(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(get_settings(), name)
+
 
-settings = Settings()
+settings: Settings = _LazySettings()  # type: ignore[assignment]
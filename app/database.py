@@ -1,38 +1,241 @@
+"""Database engines and request sessions.
+
+Writes and ordinary requests use the primary through ``get_db``. Read-only
+endpoints (reports, exports, dashboard widgets, list pages) depend on
+``get_read_db``, which sends their SELECTs to a replica from
+``DATABASE_REPLICA_URLS`` whose replication lag is within
+``DB_REPLICA_MAX_LAG_SECONDS``, or to the primary when none is. Routing is
+per statement (``RoutingSession``): flushes and other DML always go to the
+primary, and once a session has written, its later reads do too. After a
+web user writes, their reads stay on the primary for the lag window, so a
+redirect to a list page shows the new row.
+
+``EndTransactionsMiddleware`` commits a request's sessions as the response
+starts, so no transaction stays open while a body is sent. With
+``DB_PGBOUNCER`` (PgBouncer in transaction pooling mode) prepared statements
+are not cached and get unique names, and each SELECT of a ``get_read_db``
+session runs in its own transaction.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import random
+import time
+from collections import deque
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from uuid import uuid4
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import Session, sessionmaker
+from fastapi import Request
+from sqlalchemy import Select, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import settings
 
-# Async engine for FastAPI
-async_engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.APP_DEBUG,
-    pool_size=20,
-    max_overflow=10,
-)
+logger = logging.getLogger(__name__)
 
-AsyncSessionLocal = async_sessionmaker(
-    async_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+POOL_WAIT_SAMPLES = 1000
+
+# Web session field: reads stay on the primary until this timestamp
+PRIMARY_PIN_FIELD = "db_primary_until"
+# Tables always read from the primary: identity and role changes must apply at once
+PRIMARY_TABLES = frozenset({"users"})
+LAG_CHECK_TIMEOUT = 1.0
+# ASGI scope key listing the sessions EndTransactionsMiddleware commits
+REQUEST_SESSIONS_KEY = "fleetcore.db_sessions"
 
-# Sync engine for Celery tasks
-sync_engine = create_engine(
-    settings.DATABASE_URL_SYNC,
-    echo=False,
-    pool_size=5,
-    max_overflow=5,
+# NULL (unhealthy) unless the standby is streaming: once its WAL receiver
+# stops, receive and replay positions match and it would look caught up.
+# Reading the receiver status needs superuser or pg_read_all_stats.
+_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
 )
 
-SyncSessionLocal = sessionmaker(bind=sync_engine)
 
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection.
+
+    Waits include opening a new connection when the pool grows. Samples are
+    kept per process, like the pool itself.
+    """
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_ms: deque[float] = deque(maxlen=POOL_WAIT_SAMPLES)
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_ms.append((time.perf_counter() - start) * 1000)
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def _connect_args() -> dict:
+    if not settings.DB_PGBOUNCER:
+        return {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": settings.DB_SERVER_SETTINGS,
+        }
+    # A server connection may serve another client between transactions, so
+    # statements prepared on it are not ours to reuse, and their names must
+    # not collide. PgBouncer also rejects startup parameters it does not track.
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": _prepared_statement_name,
+        "server_settings": {k: v for k, v in settings.DB_SERVER_SETTINGS.items() if k == "application_name"},
+    }
+
+
+def engine_options(pool_size: int, max_overflow: int) -> dict:
+    """Keyword arguments for ``create_async_engine`` from the DB_* settings."""
+    return {
+        "echo": settings.DB_ECHO,
+        "poolclass": InstrumentedPool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": _connect_args(),
+    }
+
+
+# Engines and the sessionmaker are built on first use rather than at import,
+# so importing this module (or the app) does not load Settings
+@functools.cache
+def get_engine() -> AsyncEngine:
+    """The process's async engine for the primary."""
+    return create_async_engine(
+        settings.DATABASE_URL,
+        **engine_options(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+    )
+
+
+@dataclass
+class Replica:
+    engine: AsyncEngine
+    lag: float | None = None  # seconds; None when unknown or unreachable
+    checked_at: float = 0.0
+
+    async def refresh(self) -> None:
+        """Re-measure replication lag at most every ``DB_REPLICA_CHECK_INTERVAL`` seconds."""
+        now = time.monotonic()
+        if now - self.checked_at < settings.DB_REPLICA_CHECK_INTERVAL:
+            return
+        self.checked_at = now  # concurrent requests keep using the previous value
+        try:
+            async with asyncio.timeout(LAG_CHECK_TIMEOUT), self.engine.connect() as conn:
+                lag = (await conn.execute(_LAG_SQL)).scalar()
+            self.lag = None if lag is None else float(lag)
+        except Exception as e:
+            logger.warning("Replica %s lag check failed: %r", self.engine.url.host, e)
+            self.lag = None
+
+
+@functools.cache
+def get_replicas() -> list[Replica]:
+    """The process's replicas from ``DATABASE_REPLICA_URLS``."""
+    return [
+        Replica(create_async_engine(url, **engine_options(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)))
+        for url in settings.DATABASE_REPLICA_URLS
+    ]
+
+
+async def choose_replica() -> Replica | None:
+    """A random replica within the lag tolerance, or None to read from the primary."""
+    replicas = get_replicas()
+    if not replicas:
+        return None
+    await asyncio.gather(*(replica.refresh() for replica in replicas))
+    healthy = [r for r in replicas if r.lag is not None and r.lag <= settings.DB_REPLICA_MAX_LAG_SECONDS]
+    return random.choice(healthy) if healthy else None
+
+
+@functools.cache
+def _autocommit(engine: AsyncEngine):
+    """``engine`` in autocommit mode, sharing its pool. Cached: the session keys connections by bind."""
+    return engine.sync_engine.execution_options(isolation_level="AUTOCOMMIT")
+
+
+class RoutingSession(Session):
+    """Sends plain SELECTs to ``info["replica"]`` when set, everything else to the primary.
+
+    With ``info["autocommit_reads"]`` those SELECTs run outside a transaction
+    until the session first writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        primary = get_engine()
+        if self._flushing or not isinstance(clause, Select) or clause._for_update_arg is not None:
+            self._wrote()
+            return primary.sync_engine
+        if self.info.get("wrote"):
+            return primary.sync_engine
+        replica: Replica | None = self.info.get("replica")
+        if replica is None or (mapper is not None and mapper.local_table.name in PRIMARY_TABLES):
+            engine = primary
+        else:
+            engine = replica.engine
+        return _autocommit(engine) if self.info.get("autocommit_reads") else engine.sync_engine
+
+    def _wrote(self) -> None:
+        self.info["wrote"] = True
+        web_session = self.info.get("web_session")
+        if web_session is not None:
+            pin_seconds = settings.DB_REPLICA_MAX_LAG_SECONDS + settings.DB_REPLICA_CHECK_INTERVAL
+            web_session[PRIMARY_PIN_FIELD] = time.time() + pin_seconds
+
+
+@functools.cache
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Sessionmaker for request sessions, scripts and tools (routes statements with RoutingSession)."""
+    return async_sessionmaker(
+        get_engine(),
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+    )
+
+
+def _web_session(request: Request) -> dict | None:
+    """The signed-in user's web session, if any (API requests have none)."""
+    session = request.scope.get("session")
+    return session if session and session.get("user_id") else None
+
+
+@asynccontextmanager
+async def _session(
+    request: Request, replica: Replica | None = None, autocommit_reads: bool = False
+) -> AsyncGenerator[AsyncSession, None]:
+    info = {"replica": replica, "autocommit_reads": autocommit_reads, "web_session": _web_session(request)}
+    async with get_sessionmaker()(info=info) as session:
+        request_sessions = request.scope.get(REQUEST_SESSIONS_KEY)
+        if request_sessions is not None:
+            request_sessions.append(session)
         try:
             yield session
             await session.commit()
@@ -41,6 +244,84 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
-def get_sync_db() -> Session:
-    """Get sync session for Celery tasks."""
-    return SyncSessionLocal()
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with _session(request) as session:
+        yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints; SELECTs may be served by a replica."""
+    web_session = _web_session(request)
+    pinned = web_session is not None and web_session.get(PRIMARY_PIN_FIELD, 0) > time.time()
+    replica = None if pinned else await choose_replica()
+    async with _session(request, replica, autocommit_reads=settings.DB_PGBOUNCER) as session:
+        yield session
+
+
+class EndTransactionsMiddleware:
+    """Commit the request's database sessions when the response starts.
+
+    FastAPI closes ``get_db`` only after the response has been sent, which
+    would keep the transaction, and its connection, open while a template
+    response or an export streams to a slow client. A failed commit turns
+    the response into a 500 before anything is sent; sessions of handlers
+    that raised were already rolled back by then.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sessions: list[AsyncSession] = []
+        scope[REQUEST_SESSIONS_KEY] = sessions
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                for session in sessions:
+                    if session.in_transaction():
+                        await session.commit()
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def pool_stats() -> dict:
+    """Connection pool usage and checkout waits (ms) for this process's engine."""
+    pool = get_engine().pool
+    samples = sorted(pool.wait_ms)
+
+    def percentile(pct: float) -> float | None:
+        if not samples:
+            return None
+        return round(samples[min(len(samples) - 1, int(round(pct * (len(samples) - 1))))], 2)
+
+    return {
+        "pid": os.getpid(),
+        "pool_size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # Negative while the pool has not opened all of its pool_size connections yet
+        "overflow": pool.overflow(),
+        "timeouts": pool.timeouts,
+        "checkout_wait_ms": {
+            "samples": len(samples),
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(samples[-1], 2) if samples else None,
+        },
+        "replicas": [
+            {
+                "host": replica.engine.url.host,
+                "lag_seconds": replica.lag,
+                "in_use": replica.engine.pool.checkedout(),
+                "timeouts": replica.engine.pool.timeouts,
+            }
+            for replica in get_replicas()
+        ],
+    }
@@ -4,13 +4,15 @@ from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from starlette.middleware.sessions import SessionMiddleware
 
 from fastapi.responses import RedirectResponse
 
 from app.config import settings
+from app.database import EndTransactionsMiddleware
 from app.i18n import _, get_available_languages, load_translations
+from app.permissions import can
 from app.web.deps import WebRedirectException
+from app.web.sessions import RedisSessionMiddleware
 
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 
@@ -30,16 +32,20 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
-    # Middleware
+    # Middleware (the last added runs first)
+    application.add_middleware(EndTransactionsMiddleware)
     application.add_middleware(
-        SessionMiddleware,
-        secret_key=settings.SECRET_KEY,
+        RedisSessionMiddleware,
         session_cookie="fleetcore_session",
-        max_age=86400 * 7,
+        max_age=settings.SESSION_MAX_AGE,
+        https_only=settings.SESSION_HTTPS_ONLY,
+        exclude_paths=("/static/",),
     )
 
     # Templates
     templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+    templates.env.globals["max_upload_mb"] = settings.MAX_UPLOAD_SIZE_MB
+    templates.env.globals["can"] = can
     application.state.templates = templates
 
     def get_lang(request: Request) -> str:
@@ -79,6 +85,3 @@ def create_app() -> FastAPI:
     application.include_router(web_router)
 
     return application
-
-
-app = create_app()
@@ -37,9 +37,15 @@ from app.models.user import User  # noqa: E402, F401
 from app.models.driver import Driver  # noqa: E402, F401
 from app.models.vehicle import Vehicle  # noqa: E402, F401
 from app.models.mileage import MileageLog  # noqa: E402, F401
-from app.models.document import Document  # noqa: E402, F401
+from app.models.document import Document, DocumentBlob  # noqa: E402, F401
 from app.models.maintenance import MaintenanceRecord  # noqa: E402, F401
 from app.models.expense import Expense  # noqa: E402, F401
 from app.models.contract import Contract  # noqa: E402, F401
 from app.models.audit_log import AuditLog  # noqa: E402, F401
-from app.models.notification import Notification, NotificationPreference  # noqa: E402, F401
+from app.models.notification import (  # noqa: E402, F401
+    Notification,
+    NotificationArchive,
+    NotificationDelivery,
+    NotificationPreference,
+)
+from app.models.task_run import TaskRun  # noqa: E402, F401
@@ -1,8 +1,8 @@
 import enum
 import uuid
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Computed, DateTime, Enum, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base, UUIDPrimaryKey
@@ -30,6 +30,11 @@ class DocumentType(str, enum.Enum):
 
 class Document(Base, UUIDPrimaryKey):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Per-entity listing, newest first (scanned backwards) and per-entity counts
+        Index("ix_documents_entity", "entity_type", "entity_id", "uploaded_at"),
+        Index("ix_documents_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     entity_type: Mapped[EntityType] = mapped_column(Enum(EntityType, name="entity_type"), nullable=False)
     entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
@@ -37,9 +42,21 @@ class Document(Base, UUIDPrimaryKey):
         Enum(DocumentType, name="document_type"), default=DocumentType.OTHER, nullable=False
     )
     filename: Mapped[str] = mapped_column(String(500), nullable=False)
-    s3_key: Mapped[str] = mapped_column(String(1000), nullable=False)
+    # Content-addressed (see DocumentBlob), so several documents may share one key
+    s3_key: Mapped[str] = mapped_column(String(1000), nullable=False, index=True)
     mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
     size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    # WebP derivatives of images, filled in by the ingestion worker
+    thumbnail_key: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    preview_key: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    # Extracted text for search, filled in by the ingestion worker (NULL timestamp = not extracted yet)
+    content_text: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    text_extracted_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', filename || ' ' || coalesce(content_text, ''))", persisted=True),
+        deferred=True,
+    )
     uploaded_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
@@ -48,3 +65,18 @@ class Document(Base, UUIDPrimaryKey):
     )
 
     uploader = relationship("User", foreign_keys=[uploaded_by])
+
+
+class DocumentBlob(Base, UUIDPrimaryKey):
+    """A stored S3 object, shared by every document with the same content (SHA-256)."""
+
+    __tablename__ = "document_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    s3_key: Mapped[str] = mapped_column(String(1000), unique=True, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DocumentBlob {self.sha256[:12]} refs={self.ref_count}>"
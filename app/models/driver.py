@@ -29,7 +29,7 @@ class Driver(Base, UUIDPrimaryKey, TimestampMixin):
     license_expiry: Mapped[str | None] = mapped_column(Date, nullable=True)
     medical_expiry: Mapped[str | None] = mapped_column(Date, nullable=True)
     hire_date: Mapped[str | None] = mapped_column(Date, nullable=True)
-    department: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    department: Mapped[str | None] = mapped_column(String(200), nullable=True, index=True)
     status: Mapped[DriverStatus] = mapped_column(
         Enum(DriverStatus, name="driver_status"),
         default=DriverStatus.ACTIVE,
@@ -2,7 +2,7 @@
 
 import enum
 
-from sqlalchemy import UUID, Boolean, DateTime, Enum, ForeignKey, String, Text, func
+from sqlalchemy import UUID, Boolean, DateTime, Enum, ForeignKey, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -19,8 +19,24 @@ class NotificationType(str, enum.Enum):
     SYSTEM = "system"
 
 
+class DeliveryChannel(str, enum.Enum):
+    EMAIL = "email"
+    TELEGRAM = "telegram"
+
+
+class DeliveryStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    SKIPPED = "skipped"
+
+
 class Notification(UUIDPrimaryKey, Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_created", "user_id", "created_at"),
+        # Retention scan: only read notifications are ever archived
+        Index("ix_notifications_read_created", "created_at", postgresql_where=text("is_read")),
+    )
 
     user_id: Mapped[str] = mapped_column(UUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title: Mapped[str] = mapped_column(String(300), nullable=False)
@@ -34,6 +50,24 @@ class Notification(UUIDPrimaryKey, Base):
     )
 
 
+class NotificationArchive(Base):
+    """Read notifications moved out of the hot table by the retention job."""
+
+    __tablename__ = "notifications_archive"
+
+    id: Mapped[str] = mapped_column(UUID, primary_key=True)
+    user_id: Mapped[str] = mapped_column(UUID, nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(300), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    type: Mapped[NotificationType] = mapped_column(Enum(NotificationType), nullable=False)
+    entity_type: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    entity_id: Mapped[str | None] = mapped_column(UUID, nullable=True)
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[str] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
+
+
 class NotificationPreference(UUIDPrimaryKey, Base):
     __tablename__ = "notification_preferences"
 
@@ -44,3 +78,28 @@ class NotificationPreference(UUIDPrimaryKey, Base):
     telegram_enabled: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     telegram_chat_id: Mapped[str | None] = mapped_column(String(50), nullable=True)
     preferences: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
+
+class NotificationDelivery(UUIDPrimaryKey, Base):
+    """Pending out-of-app delivery of a notification, coalesced into digests."""
+
+    __tablename__ = "notification_deliveries"
+    __table_args__ = (
+        Index("ix_notification_deliveries_pending", "status", "user_id", "channel", "type"),
+    )
+
+    notification_id: Mapped[str] = mapped_column(
+        UUID, ForeignKey("notifications.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id: Mapped[str] = mapped_column(UUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    channel: Mapped[DeliveryChannel] = mapped_column(Enum(DeliveryChannel), nullable=False)
+    type: Mapped[NotificationType] = mapped_column(Enum(NotificationType), nullable=False)
+    status: Mapped[DeliveryStatus] = mapped_column(
+        Enum(DeliveryStatus), default=DeliveryStatus.PENDING, nullable=False
+    )
+    created_at: Mapped[str] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    sent_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    notification = relationship("Notification")
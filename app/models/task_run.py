@@ -0,0 +1,32 @@
+import enum
+
+from sqlalchemy import DateTime, Enum, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base, UUIDPrimaryKey
+
+
+class TaskRunStatus(str, enum.Enum):
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class TaskRun(Base, UUIDPrimaryKey):
+    """Ledger of scheduled task runs; one row per (task, schedule slot)."""
+
+    __tablename__ = "task_runs"
+    __table_args__ = (UniqueConstraint("task_name", "run_key", name="uq_task_runs_task_name_run_key"),)
+
+    task_name: Mapped[str] = mapped_column(String(200), nullable=False)
+    run_key: Mapped[str] = mapped_column(String(100), nullable=False)
+    status: Mapped[TaskRunStatus] = mapped_column(Enum(TaskRunStatus, name="task_run_status"), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<TaskRun {self.task_name} {self.run_key} ({self.status.value})>"
@@ -27,6 +27,8 @@ class User(Base, UUIDPrimaryKey, TimestampMixin):
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     language: Mapped[str] = mapped_column(String(5), default="ru", nullable=False)
+    # Limits the user to one department's vehicles, drivers and their records (see app/permissions.py)
+    department: Mapped[str | None] = mapped_column(String(200), nullable=True)
 
     def __repr__(self) -> str:
         return f"<User {self.username} ({self.role.value})>"
@@ -67,7 +67,7 @@ class Vehicle(Base, UUIDPrimaryKey, TimestampMixin):
     assigned_driver_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("drivers.id", ondelete="SET NULL"), nullable=True
     )
-    department: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    department: Mapped[str | None] = mapped_column(String(200), nullable=True, index=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Relationships
@@ -0,0 +1,93 @@
+"""Role permissions and department row scopes.
+
+``ROLE_PERMISSIONS`` is the single source of truth for what each role may
+do. It is compiled once, at import, into one int bitmask per role, so a
+check is a dict lookup and an AND. API routes depend on
+``require_permission`` (app/api/deps.py), web routes call
+``has_permission`` or ``web_require_permission`` (app/web/deps.py), and
+templates use the ``can(user, "manage_fleet")`` global.
+
+Users with a ``department`` and without ``ALL_DEPARTMENTS`` only see that
+department's vehicles and drivers, and the maintenance records, expenses,
+contracts, mileage logs, documents and report rows of those vehicles.
+Repositories and services created with ``department=department_scope(user)``
+add ``department_clause`` to their queries, so out-of-scope rows are never
+loaded.
+"""
+
+import enum
+
+from sqlalchemy import ColumnElement, select
+
+from app.models.user import User, UserRole
+from app.models.vehicle import Vehicle
+
+
+class Permission(enum.IntFlag):
+    VIEW = enum.auto()  # dashboards, lists, details, reports
+    RECORD_MILEAGE = enum.auto()
+    MANAGE_FLEET = enum.auto()  # vehicles, drivers, maintenance, expenses, contracts
+    MANAGE_DOCUMENTS = enum.auto()
+    EXPORT_REPORTS = enum.auto()
+    MANAGE_USERS = enum.auto()
+    VIEW_AUDIT_LOG = enum.auto()
+    VIEW_SYSTEM = enum.auto()  # queue metrics
+    ALL_DEPARTMENTS = enum.auto()
+
+
+_VIEWER = Permission.VIEW
+_DRIVER = _VIEWER | Permission.RECORD_MILEAGE
+_FLEET_MANAGER = _DRIVER | Permission.MANAGE_FLEET | Permission.MANAGE_DOCUMENTS | Permission.EXPORT_REPORTS
+
+ROLE_PERMISSIONS: dict[UserRole, Permission] = {
+    UserRole.VIEWER: _VIEWER,
+    UserRole.DRIVER: _DRIVER,
+    UserRole.FLEET_MANAGER: _FLEET_MANAGER,
+    UserRole.ADMIN: ~Permission(0),  # every permission
+}
+
+
+def _compile() -> dict[UserRole, int]:
+    missing = set(UserRole) - set(ROLE_PERMISSIONS)
+    if missing:
+        raise RuntimeError(f"No permissions defined for roles: {sorted(r.value for r in missing)}")
+    return {role: int(ROLE_PERMISSIONS[role]) for role in UserRole}
+
+
+_ROLE_MASKS = _compile()
+
+
+def has_permission(user: User, permission: Permission) -> bool:
+    """Whether the user's role grants every flag in ``permission``."""
+    return _ROLE_MASKS[user.role] & permission == permission
+
+
+def can(user: User | None, name: str) -> bool:
+    """Template helper: ``can(user, "manage_fleet")``."""
+    return user is not None and has_permission(user, Permission[name.upper()])
+
+
+def department_scope(user: User) -> str | None:
+    """The department the user is limited to, or None if they see all of them."""
+    if not user.department or has_permission(user, Permission.ALL_DEPARTMENTS):
+        return None
+    return user.department
+
+
+def department_clause(model, department: str | None) -> ColumnElement[bool] | None:
+    """Filter for rows of ``model`` in ``department``; None when unscoped.
+
+    Rows without a department of their own (maintenance, expenses, contracts,
+    mileage) belong to the department of their vehicle.
+    """
+    if department is None:
+        return None
+    if hasattr(model, "department"):
+        return model.department == department
+    return model.vehicle_id.in_(select(Vehicle.id).where(Vehicle.department == department))
+
+
+def department_filters(model, department: str | None) -> list[ColumnElement[bool]]:
+    """``department_clause`` as ``where()`` arguments: empty when unscoped."""
+    clause = department_clause(model, department)
+    return [] if clause is None else [clause]
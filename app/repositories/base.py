@@ -6,17 +6,28 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Base
+from app.permissions import department_clause
 
 ModelType = TypeVar("ModelType", bound=Base)
 
 
 class BaseRepository(Generic[ModelType]):
-    def __init__(self, model: type[ModelType], session: AsyncSession):
+    def __init__(self, model: type[ModelType], session: AsyncSession, department: str | None = None):
         self.model = model
         self.session = session
+        # Row scope: when set, every query only sees this department's rows
+        self.department = department
+
+    def scoped(self, query):
+        """``query`` limited to the repository's department (unchanged when unscoped)."""
+        clause = department_clause(self.model, self.department)
+        return query if clause is None else query.where(clause)
 
     async def get_by_id(self, id: UUID) -> ModelType | None:
-        return await self.session.get(self.model, id)
+        if self.department is None:
+            return await self.session.get(self.model, id)
+        result = await self.session.execute(self.scoped(select(self.model).where(self.model.id == id)))
+        return result.scalar_one_or_none()
 
     async def list(
         self,
@@ -27,8 +38,8 @@ class BaseRepository(Generic[ModelType]):
         filters: dict[str, Any] | None = None,
     ) -> tuple[list[ModelType], int]:
         """Return (items, total_count)."""
-        query = select(self.model)
-        count_query = select(func.count()).select_from(self.model)
+        query = self.scoped(select(self.model))
+        count_query = self.scoped(select(func.count()).select_from(self.model))
 
         if filters:
             for key, value in filters.items():
@@ -8,8 +8,8 @@ from app.repositories.base import BaseRepository
 
 
 class DriverRepository(BaseRepository[Driver]):
-    def __init__(self, session: AsyncSession):
-        super().__init__(Driver, session)
+    def __init__(self, session: AsyncSession, department: str | None = None):
+        super().__init__(Driver, session, department)
 
     async def search(
         self,
@@ -21,8 +21,8 @@ class DriverRepository(BaseRepository[Driver]):
         limit: int = 50,
         order_by: str = "-created_at",
     ) -> tuple[list[Driver], int]:
-        query = select(Driver)
-        count_query = select(func.count()).select_from(Driver)
+        query = self.scoped(select(Driver))
+        count_query = self.scoped(select(func.count()).select_from(Driver))
 
         if q:
             pattern = f"%{q}%"
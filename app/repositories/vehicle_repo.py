@@ -1,6 +1,6 @@
 from typing import Any
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import exists, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.vehicle import Vehicle, VehicleStatus
@@ -8,8 +8,8 @@ from app.repositories.base import BaseRepository
 
 
 class VehicleRepository(BaseRepository[Vehicle]):
-    def __init__(self, session: AsyncSession):
-        super().__init__(Vehicle, session)
+    def __init__(self, session: AsyncSession, department: str | None = None):
+        super().__init__(Vehicle, session, department)
 
     async def search(
         self,
@@ -24,8 +24,8 @@ class VehicleRepository(BaseRepository[Vehicle]):
         limit: int = 50,
         order_by: str = "-created_at",
     ) -> tuple[list[Vehicle], int]:
-        query = select(Vehicle)
-        count_query = select(func.count()).select_from(Vehicle)
+        query = self.scoped(select(Vehicle))
+        count_query = self.scoped(select(func.count()).select_from(Vehicle))
 
         if q:
             pattern = f"%{q}%"
@@ -57,15 +57,19 @@ class VehicleRepository(BaseRepository[Vehicle]):
         return list(result.scalars().all()), total
 
     async def get_by_plate(self, plate: str) -> Vehicle | None:
-        result = await self.session.execute(select(Vehicle).where(Vehicle.license_plate == plate))
+        result = await self.session.execute(self.scoped(select(Vehicle).where(Vehicle.license_plate == plate)))
         return result.scalar_one_or_none()
 
     async def get_by_vin(self, vin: str) -> Vehicle | None:
-        result = await self.session.execute(select(Vehicle).where(Vehicle.vin == vin))
+        result = await self.session.execute(self.scoped(select(Vehicle).where(Vehicle.vin == vin)))
         return result.scalar_one_or_none()
 
+    async def is_taken(self, column, value: str) -> bool:
+        """Whether any vehicle, in any department, has ``value`` in the unique ``column``."""
+        return bool(await self.session.scalar(select(exists().where(column == value))))
+
     async def count_by_status(self) -> dict[str, int]:
         result = await self.session.execute(
-            select(Vehicle.status, func.count()).group_by(Vehicle.status)
+            self.scoped(select(Vehicle.status, func.count())).group_by(Vehicle.status)
         )
         return {row[0].value: row[1] for row in result.all()}
@@ -13,6 +13,7 @@ class UserCreate(BaseModel):
     password: str = Field(..., min_length=6, max_length=128)
     role: UserRole = UserRole.VIEWER
     language: str = Field("ru", max_length=5)
+    department: str | None = Field(None, max_length=200)
 
 
 class UserUpdate(BaseModel):
@@ -21,6 +22,7 @@ class UserUpdate(BaseModel):
     role: UserRole | None = None
     is_active: bool | None = None
     language: str | None = Field(None, max_length=5)
+    department: str | None = Field(None, max_length=200)
 
 
 class UserRead(BaseModel):
@@ -31,6 +33,7 @@ class UserRead(BaseModel):
     role: UserRole
     is_active: bool
     language: str
+    department: str | None
     created_at: datetime
     updated_at: datetime
 
@@ -4,12 +4,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User, UserRole
 from app.repositories.user_repo import UserRepository
+from app.services.login_throttle import check_login_allowed, clear_login_failures, record_login_failure
 from app.utils.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
 )
 
 
@@ -27,6 +28,7 @@ class AuthService:
         password: str,
         role: UserRole = UserRole.VIEWER,
         language: str = "ru",
+        department: str | None = None,
     ) -> User:
         """Register a new user."""
         existing = await self.repo.get_by_username(username)
@@ -41,22 +43,30 @@ class AuthService:
             email=email,
             username=username,
             full_name=full_name,
-            hashed_password=hash_password(password),
+            hashed_password=await hash_password_async(password),
             role=role,
             language=language,
+            department=department,
         )
         return user
 
-    async def authenticate(self, username: str, password: str) -> tuple[User, str, str]:
-        """Authenticate user, return (user, access_token, refresh_token)."""
+    async def authenticate(self, username: str, password: str, ip: str | None = None) -> tuple[User, str, str]:
+        """Authenticate user, return (user, access_token, refresh_token).
+
+        Raises LoginThrottledError (a ValueError) after too many failures for the
+        username or client ``ip``.
+        """
+        await check_login_allowed(username, ip)
         user = await self.repo.get_by_username(username)
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(password, user.hashed_password):
+            await record_login_failure(username, ip)
             raise ValueError("Invalid username or password")
+        await clear_login_failures(username)
 
         if not user.is_active:
             raise ValueError("User account is disabled")
 
-        access_token = create_access_token(user.id, user.role.value)
+        access_token = create_access_token(user.id, user.role.value, user.department)
         refresh_token = create_refresh_token(user.id)
         return user, access_token, refresh_token
 
@@ -71,7 +81,7 @@ class AuthService:
         if not user or not user.is_active:
             raise ValueError("User not found or disabled")
 
-        new_access = create_access_token(user.id, user.role.value)
+        new_access = create_access_token(user.id, user.role.value, user.department)
         new_refresh = create_refresh_token(user.id)
         return new_access, new_refresh
 
@@ -81,10 +91,10 @@ class AuthService:
         if not user:
             raise ValueError("User not found")
 
-        if not verify_password(current_password, user.hashed_password):
+        if not await verify_password_async(current_password, user.hashed_password):
             raise ValueError("Current password is incorrect")
 
-        await self.repo.update(user, hashed_password=hash_password(new_password))
+        await self.repo.update(user, hashed_password=await hash_password_async(new_password))
 
     async def get_user_by_id(self, user_id: UUID) -> User | None:
         """Get user by ID."""
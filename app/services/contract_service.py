@@ -5,15 +5,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.contract import Contract, ContractStatus
 from app.repositories.base import BaseRepository
+from app.repositories.vehicle_repo import VehicleRepository
 from app.schemas.contract import ContractCreate, ContractUpdate
 
 
 class ContractService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, department: str | None = None):
+        """``department`` limits the service to contracts of that department's vehicles (see app/permissions.py)."""
         self.session = session
-        self.repo = BaseRepository(Contract, session)
+        self.repo = BaseRepository(Contract, session, department)
+        self.vehicles = VehicleRepository(session, department)
 
     async def create(self, data: ContractCreate, user_id: UUID) -> Contract:
+        if not await self.vehicles.get_by_id(data.vehicle_id):
+            raise ValueError("Vehicle not found")
         return await self.repo.create(**data.model_dump(), created_by=user_id)
 
     async def update(self, contract_id: UUID, data: ContractUpdate) -> Contract:
@@ -26,8 +31,8 @@ class ContractService:
         return await self.repo.get_by_id(contract_id)
 
     async def list_for_vehicle(self, vehicle_id: UUID, offset: int = 0, limit: int = 50) -> tuple[list[Contract], int]:
-        query = select(Contract).where(Contract.vehicle_id == vehicle_id)
-        count_q = select(func.count()).select_from(Contract).where(Contract.vehicle_id == vehicle_id)
+        query = self.repo.scoped(select(Contract).where(Contract.vehicle_id == vehicle_id))
+        count_q = self.repo.scoped(select(func.count()).select_from(Contract).where(Contract.vehicle_id == vehicle_id))
         total = (await self.session.execute(count_q)).scalar() or 0
         result = await self.session.execute(query.order_by(Contract.end_date.desc()).offset(offset).limit(limit))
         return list(result.scalars().all()), total
@@ -5,21 +5,26 @@ from datetime import date, timedelta
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.contract import Contract, ContractStatus
-from app.models.driver import Driver, DriverStatus
+from app.models.driver import Driver
 from app.models.expense import Expense
-from app.models.maintenance import MaintenanceRecord, MaintenanceStatus
-from app.models.vehicle import Vehicle, VehicleStatus
+from app.models.maintenance import MaintenanceRecord
+from app.models.vehicle import Vehicle
+from app.permissions import department_filters
+from app.services.reminder_service import ReminderService
 
 
 class DashboardService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, department: str | None = None):
+        """``department`` limits every widget to that department's rows (see app/permissions.py)."""
         self.db = db
+        self.department = department
 
     async def fleet_overview(self) -> dict:
         """Get vehicle counts by status."""
         result = await self.db.execute(
-            select(Vehicle.status, func.count(Vehicle.id)).group_by(Vehicle.status)
+            select(Vehicle.status, func.count(Vehicle.id))
+            .where(*department_filters(Vehicle, self.department))
+            .group_by(Vehicle.status)
         )
         counts = {str(row[0].value): row[1] for row in result.all()}
         total = sum(counts.values())
@@ -33,72 +38,22 @@ class DashboardService:
 
     async def attention_needed(self) -> dict:
         """Get items needing attention: overdue maintenance, expiring contracts, docs."""
-        today = date.today()
-        deadline_30 = today + timedelta(days=30)
-        deadline_14 = today + timedelta(days=14)
-
-        # Overdue maintenance
-        overdue_maint = await self.db.execute(
-            select(func.count(MaintenanceRecord.id)).where(
-                MaintenanceRecord.status == MaintenanceStatus.SCHEDULED,
-                MaintenanceRecord.scheduled_date < today,
-            )
-        )
-        overdue_maintenance = overdue_maint.scalar() or 0
-
-        # Upcoming maintenance (next 14 days)
-        upcoming_maint = await self.db.execute(
-            select(func.count(MaintenanceRecord.id)).where(
-                MaintenanceRecord.status == MaintenanceStatus.SCHEDULED,
-                MaintenanceRecord.scheduled_date >= today,
-                MaintenanceRecord.scheduled_date <= deadline_14,
-            )
-        )
-        upcoming_maintenance = upcoming_maint.scalar() or 0
-
-        # Expiring contracts (next 30 days)
-        exp_contracts = await self.db.execute(
-            select(func.count(Contract.id)).where(
-                Contract.status == ContractStatus.ACTIVE,
-                Contract.end_date >= today,
-                Contract.end_date <= deadline_30,
-            )
-        )
-        expiring_contracts = exp_contracts.scalar() or 0
-
-        # Expiring driver licenses (next 30 days)
-        exp_licenses = await self.db.execute(
-            select(func.count(Driver.id)).where(
-                Driver.status == DriverStatus.ACTIVE,
-                Driver.license_expiry >= today,
-                Driver.license_expiry <= deadline_30,
-            )
-        )
-        expiring_licenses = exp_licenses.scalar() or 0
-
-        # Expiring medical certs (next 30 days)
-        exp_medical = await self.db.execute(
-            select(func.count(Driver.id)).where(
-                Driver.status == DriverStatus.ACTIVE,
-                Driver.medical_expiry >= today,
-                Driver.medical_expiry <= deadline_30,
-            )
-        )
-        expiring_medical = exp_medical.scalar() or 0
-
+        counts = await ReminderService(self.db, department=self.department).counts()
         return {
-            "overdue_maintenance": overdue_maintenance,
-            "upcoming_maintenance": upcoming_maintenance,
-            "expiring_contracts": expiring_contracts,
-            "expiring_licenses": expiring_licenses,
-            "expiring_medical": expiring_medical,
-            "total_alerts": overdue_maintenance + expiring_contracts + expiring_licenses + expiring_medical,
+            **counts,
+            "total_alerts": (
+                counts["overdue_maintenance"]
+                + counts["expiring_contracts"]
+                + counts["expiring_licenses"]
+                + counts["expiring_medical"]
+            ),
         }
 
     async def expense_summary(self, months: int = 6) -> dict:
         """Get expense summary by month and category for last N months."""
         today = date.today()
         start_date = today.replace(day=1) - timedelta(days=months * 30)
+        filters = [Expense.date >= start_date, *department_filters(Expense, self.department)]
 
         # Monthly totals
         result = await self.db.execute(
@@ -106,7 +61,7 @@ class DashboardService:
                 func.date_trunc("month", Expense.date).label("month"),
                 func.sum(Expense.amount).label("total"),
             )
-            .where(Expense.date >= start_date)
+            .where(*filters)
             .group_by("month")
             .order_by("month")
         )
@@ -120,7 +75,7 @@ class DashboardService:
                 Expense.category,
                 func.sum(Expense.amount).label("total"),
             )
-            .where(Expense.date >= start_date)
+            .where(*filters)
             .group_by(Expense.category)
             .order_by(func.sum(Expense.amount).desc())
         )
@@ -131,7 +86,7 @@ class DashboardService:
 
         # Total
         total_result = await self.db.execute(
-            select(func.sum(Expense.amount)).where(Expense.date >= start_date)
+            select(func.sum(Expense.amount)).where(*filters)
         )
         total = float(total_result.scalar() or 0)
 
@@ -145,9 +100,9 @@ class DashboardService:
     async def maintenance_stats(self) -> dict:
         """Get maintenance statistics for kanban-style overview."""
         result = await self.db.execute(
-            select(MaintenanceRecord.status, func.count(MaintenanceRecord.id)).group_by(
-                MaintenanceRecord.status
-            )
+            select(MaintenanceRecord.status, func.count(MaintenanceRecord.id))
+            .where(*department_filters(MaintenanceRecord, self.department))
+            .group_by(MaintenanceRecord.status)
         )
         counts = {str(row[0].value): row[1] for row in result.all()}
         return {
@@ -161,6 +116,7 @@ class DashboardService:
         """Get recent maintenance records."""
         result = await self.db.execute(
             select(MaintenanceRecord)
+            .where(*department_filters(MaintenanceRecord, self.department))
             .order_by(MaintenanceRecord.created_at.desc())
             .limit(limit)
         )
@@ -180,7 +136,9 @@ class DashboardService:
     async def driver_stats(self) -> dict:
         """Get driver statistics."""
         result = await self.db.execute(
-            select(Driver.status, func.count(Driver.id)).group_by(Driver.status)
+            select(Driver.status, func.count(Driver.id))
+            .where(*department_filters(Driver, self.department))
+            .group_by(Driver.status)
         )
         counts = {str(row[0].value): row[1] for row in result.all()}
         total = sum(counts.values())
@@ -202,6 +160,7 @@ class DashboardService:
                 func.sum(Expense.amount).label("total_cost"),
             )
             .join(Expense, Expense.vehicle_id == Vehicle.id)
+            .where(*department_filters(Vehicle, self.department))
             .group_by(Vehicle.id, Vehicle.license_plate, Vehicle.brand, Vehicle.model)
             .order_by(func.sum(Expense.amount).desc())
             .limit(limit)
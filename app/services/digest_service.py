@@ -0,0 +1,102 @@
+"""Coalescing of pending email/Telegram deliveries into per-user digests.
+
+Digest frequency is read from ``NotificationPreference.preferences``::
+
+    {"digest_frequency": "hourly"}
+    {"digest_frequency": {"email": "daily", "telegram": "immediate"}}
+
+Values are one of ``DIGEST_FREQUENCIES`` or a number of minutes. Users without
+a preference fall back to ``settings.NOTIFICATION_DIGEST_WINDOW_MINUTES``.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from html import escape
+from uuid import UUID
+
+from app.config import settings
+from app.i18n import _
+from app.models.notification import DeliveryChannel, NotificationDelivery, NotificationType
+
+DIGEST_FREQUENCIES = {
+    "immediate": 0,
+    "hourly": 60,
+    "daily": 24 * 60,
+}
+
+# Keep digests readable and under Telegram's 4096-character message limit
+DIGEST_MAX_ITEMS = 25
+
+def digest_window(preferences: dict | None, channel: DeliveryChannel) -> timedelta:
+    """Return how long deliveries on ``channel`` may wait before being flushed."""
+    value = (preferences or {}).get("digest_frequency")
+    if isinstance(value, dict):
+        value = value.get(channel.value)
+
+    if isinstance(value, int) and value >= 0:
+        return timedelta(minutes=value)
+    if isinstance(value, str) and value in DIGEST_FREQUENCIES:
+        return timedelta(minutes=DIGEST_FREQUENCIES[value])
+    return timedelta(minutes=settings.NOTIFICATION_DIGEST_WINDOW_MINUTES)
+
+
+@dataclass
+class DigestGroup:
+    """Pending deliveries for one (user, channel, notification type)."""
+
+    user_id: UUID
+    channel: DeliveryChannel
+    type: NotificationType
+    deliveries: list[NotificationDelivery] = field(default_factory=list)
+
+    @property
+    def oldest(self) -> datetime:
+        return min(d.created_at for d in self.deliveries)
+
+    def is_due(self, window: timedelta, now: datetime) -> bool:
+        return self.oldest + window <= now
+
+
+def group_deliveries(deliveries: list[NotificationDelivery]) -> list[DigestGroup]:
+    """Group deliveries per user, channel and type, preserving input order."""
+    groups: dict[tuple, DigestGroup] = {}
+    for delivery in deliveries:
+        key = (delivery.user_id, delivery.channel, delivery.type)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = DigestGroup(delivery.user_id, delivery.channel, delivery.type)
+        group.deliveries.append(delivery)
+    return list(groups.values())
+
+
+def render_digest(group: DigestGroup, lang: str | None = None) -> tuple[str, str]:
+    """Render a group as (subject, body) in ``lang``, the recipient's language.
+
+    Email bodies are HTML, Telegram bodies use Telegram's HTML subset.
+    """
+    lang = lang or settings.DEFAULT_LANGUAGE
+    notifications = [d.notification for d in group.deliveries]
+
+    if len(notifications) == 1:
+        subject = notifications[0].title
+    else:
+        title = _(f"digest.title.{group.type.value}", lang)
+        subject = _("digest.subject", lang, title=title, count=len(notifications))
+
+    shown = notifications[:DIGEST_MAX_ITEMS]
+    hidden = len(notifications) - len(shown)
+    more = _("digest.more", lang, count=hidden)
+
+    if group.channel == DeliveryChannel.TELEGRAM:
+        lines = [f"<b>{escape(subject)}</b>", ""]
+        if len(notifications) == 1:
+            lines.append(escape(notifications[0].message))
+        else:
+            lines.extend(f"• <b>{escape(n.title)}</b> — {escape(n.message)}" for n in shown)
+        if hidden:
+            lines.append(escape(more))
+        return subject, "\n".join(lines)
+
+    items = "".join(f"<li><strong>{escape(n.title)}</strong><br>{escape(n.message)}</li>" for n in shown)
+    footer = f"<p>{escape(more)}</p>" if hidden else ""
+    return subject, f"<h3>{escape(subject)}</h3><ul>{items}</ul>{footer}"
@@ -0,0 +1,88 @@
+"""Redis cache of per-entity document listings.
+
+Listings are stored as JSON under ``fleetcore:documents:<entity_type>:<entity_id>``
+with a TTL of ``settings.DOCUMENT_LISTING_CACHE_TTL``. Writers invalidate them
+after committing: DocumentService.after_commit() on upload/delete and the
+ingestion worker when derivatives are recorded.
+
+Invalidation also replaces the entity's generation token. A reader notes the
+token before querying and fills the cache with ``FILL_LISTING`` only if the
+token is unchanged, so a listing read before a writer's commit is never
+stored after that writer has invalidated it.
+"""
+
+import json
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from app.config import settings
+from app.models.document import Document, DocumentType, EntityType
+
+LISTING_CACHE_PREFIX = "fleetcore:documents"
+
+# KEYS: generation, listing. ARGV: generation seen before the query ("" if none), listing, ttl
+FILL_LISTING = """
+local current = redis.call('GET', KEYS[1]) or ''
+if current ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+def listing_key(entity_type: EntityType, entity_id: UUID) -> str:
+    return f"{LISTING_CACHE_PREFIX}:{entity_type.value}:{entity_id}"
+
+
+def generation_key(entity_type: EntityType, entity_id: UUID) -> str:
+    return f"{listing_key(entity_type, entity_id)}:generation"
+
+
+def queue_invalidation(pipe, entities) -> None:
+    """Queue the commands invalidating the listings of ``entities`` on a (sync or async) Redis pipeline."""
+    for entity_type, entity_id in entities:
+        # Outlives the listings, so an in-flight fill always sees the change
+        pipe.set(generation_key(entity_type, entity_id), uuid4().hex, ex=2 * settings.DOCUMENT_LISTING_CACHE_TTL)
+        pipe.delete(listing_key(entity_type, entity_id))
+
+
+def dump_listing(documents: list[Document]) -> str:
+    return json.dumps(
+        [
+            {
+                "id": str(doc.id),
+                "type": doc.type.value,
+                "filename": doc.filename,
+                "s3_key": doc.s3_key,
+                "mime_type": doc.mime_type,
+                "size_bytes": doc.size_bytes,
+                "uploaded_by": str(doc.uploaded_by) if doc.uploaded_by else None,
+                "uploaded_at": doc.uploaded_at.isoformat(),
+                "thumbnail_key": doc.thumbnail_key,
+                "preview_key": doc.preview_key,
+            }
+            for doc in documents
+        ]
+    )
+
+
+def load_listing(data: str, entity_type: EntityType, entity_id: UUID) -> list[Document]:
+    """Rebuild detached (read-only) Document objects from a cached listing."""
+    return [
+        Document(
+            id=UUID(row["id"]),
+            entity_type=entity_type,
+            entity_id=entity_id,
+            type=DocumentType(row["type"]),
+            filename=row["filename"],
+            s3_key=row["s3_key"],
+            mime_type=row["mime_type"],
+            size_bytes=row["size_bytes"],
+            uploaded_by=UUID(row["uploaded_by"]) if row["uploaded_by"] else None,
+            uploaded_at=datetime.fromisoformat(row["uploaded_at"]),
+            thumbnail_key=row["thumbnail_key"],
+            preview_key=row["preview_key"],
+        )
+        for row in json.loads(data)
+    ]
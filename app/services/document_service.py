@@ -1,20 +1,73 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import BinaryIO
 from uuid import UUID
 
-from sqlalchemy import select
+from redis.exceptions import RedisError
+from sqlalchemy import ColumnElement, and_, delete, exists, func, or_, select, text, union, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.document import Document, DocumentType, EntityType
-from app.utils.s3 import ALLOWED_MIME_TYPES, MAX_FILE_SIZE, get_s3_client
+from app.config import settings
+from app.models.contract import Contract
+from app.models.document import Document, DocumentBlob, DocumentType, EntityType
+from app.models.driver import Driver
+from app.models.expense import Expense
+from app.models.maintenance import MaintenanceRecord
+from app.models.vehicle import Vehicle
+from app.permissions import department_clause
+from app.services.document_cache import (
+    FILL_LISTING,
+    dump_listing,
+    generation_key,
+    listing_key,
+    load_listing,
+    queue_invalidation,
+)
+from app.utils.archive import ZipEntry, stream_zip
+from app.utils.redis_client import get_async_redis
+from app.utils.s3 import ALLOWED_MIME_TYPES, content_key, get_s3_client_async, hash_stream
+
+logger = logging.getLogger(__name__)
+
+MAX_BULK_FILES = 20
+
+# Already compressed formats are stored as-is in zip downloads
+_STORED_IN_ZIP = ("image/", "application/pdf", "application/vnd.openxmlformats-officedocument.")
+
+# A document is in the department of the entity it is attached to
+_ENTITY_MODELS = {
+    EntityType.VEHICLE: Vehicle,
+    EntityType.DRIVER: Driver,
+    EntityType.MAINTENANCE: MaintenanceRecord,
+    EntityType.CONTRACT: Contract,
+    EntityType.EXPENSE: Expense,
+}
+
+
+@dataclass
+class UploadedFile:
+    fileobj: BinaryIO
+    filename: str
+    mime_type: str
 
 
 class DocumentService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, department: str | None = None):
+        """``department`` limits the service to documents of that department's entities (see app/permissions.py)."""
         self.session = session
+        self.department = department
+        # Post-commit work collected by upload_many()/delete(), run by after_commit()
+        self._uploaded: list[Document] = []
+        self._changed_entities: set[tuple[EntityType, UUID]] = set()
+        self._released_keys: list[str] = []
 
     async def upload(
         self,
         *,
-        file_data: bytes,
+        fileobj: BinaryIO,
         filename: str,
         mime_type: str,
         entity_type: EntityType,
@@ -22,38 +75,175 @@ class DocumentService:
         doc_type: DocumentType = DocumentType.OTHER,
         uploaded_by: UUID | None = None,
     ) -> Document:
-        if mime_type not in ALLOWED_MIME_TYPES:
-            raise ValueError(f"File type {mime_type} not allowed")
-        if len(file_data) > MAX_FILE_SIZE:
-            raise ValueError("File too large (max 10 MB)")
-
-        s3 = get_s3_client()
-        folder = f"{entity_type.value}/{entity_id}"
-        s3_key = s3.upload_file(file_data, filename, mime_type, folder=folder)
-
-        doc = Document(
+        [doc] = await self.upload_many(
+            [UploadedFile(fileobj, filename, mime_type)],
             entity_type=entity_type,
             entity_id=entity_id,
-            type=doc_type,
-            filename=filename,
-            s3_key=s3_key,
-            mime_type=mime_type,
-            size_bytes=len(file_data),
+            doc_type=doc_type,
             uploaded_by=uploaded_by,
         )
-        self.session.add(doc)
-        await self.session.flush()
         await self.session.refresh(doc)
         return doc
 
+    async def upload_many(
+        self,
+        files: list[UploadedFile],
+        *,
+        entity_type: EntityType,
+        entity_id: UUID,
+        doc_type: DocumentType = DocumentType.OTHER,
+        uploaded_by: UUID | None = None,
+    ) -> list[Document]:
+        """Store uploads, keyed by their SHA-256 so identical content is stored once.
+
+        File objects must be seekable (Starlette spools uploads to a temp file):
+        they are hashed first, and only content not stored yet is streamed to
+        S3, concurrently. All rows are inserted with a single flush.
+        """
+        if not files:
+            raise ValueError("No files uploaded")
+        if not await self._entity_in_scope(entity_type, entity_id):
+            raise ValueError(f"{entity_type.value.capitalize()} not found")
+        if len(files) > MAX_BULK_FILES:
+            raise ValueError(f"Too many files (max {MAX_BULK_FILES})")
+        for f in files:
+            if f.mime_type not in ALLOWED_MIME_TYPES:
+                raise ValueError(f"File type {f.mime_type} not allowed")
+
+        hashes = await asyncio.gather(*(asyncio.to_thread(hash_stream, f.fileobj) for f in files))
+
+        entries: dict[str, tuple[str, int, int]] = {}
+        for f, (sha256, size) in zip(files, hashes):
+            key, _, count = entries.get(sha256, (content_key(sha256, f.filename), size, 0))
+            entries[sha256] = (key, size, count + 1)
+        blobs = await self._acquire_blobs(entries)
+
+        uploads = {}
+        for f, (sha256, _) in zip(files, hashes):
+            s3_key, is_new = blobs[sha256]
+            if is_new and s3_key not in uploads:
+                uploads[s3_key] = f
+        if uploads:
+            s3 = await get_s3_client_async()
+            await asyncio.gather(
+                *(s3.upload_stream_async(f.fileobj, key, f.mime_type) for key, f in uploads.items())
+            )
+
+        # Reuse thumbnails already rendered for the same content
+        derived = await self._existing_derivatives([key for key, is_new in blobs.values() if not is_new])
+
+        documents = []
+        for f, (sha256, size) in zip(files, hashes):
+            s3_key = blobs[sha256][0]
+            thumbnail_key, preview_key = derived.get(s3_key, (None, None))
+            documents.append(
+                Document(
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    type=doc_type,
+                    filename=f.filename,
+                    s3_key=s3_key,
+                    mime_type=f.mime_type,
+                    size_bytes=size,
+                    uploaded_by=uploaded_by,
+                    thumbnail_key=thumbnail_key,
+                    preview_key=preview_key,
+                )
+            )
+        self.session.add_all(documents)
+        await self.session.flush()
+        self._uploaded.extend(documents)
+        self._changed_entities.add((entity_type, entity_id))
+        return documents
+
+    async def after_commit(self) -> None:
+        """Run once the caller has committed uploads/deletes.
+
+        Invalidates the affected entity listings, queues thumbnail
+        generation and text extraction, and deletes the objects of released
+        blobs. Doing this before the commit would let a worker miss the new
+        row, or leave rows pointing at deleted objects if the commit failed;
+        listings read before the commit are kept out of the cache by the
+        generation check in list_for_entity().
+        """
+        # Imported here: the ingestion tasks pull in Celery, Pillow and pypdf,
+        # which the web process only needs once something is uploaded
+        from app.tasks.ingestion import schedule_derivatives, schedule_text_extraction
+
+        if self._changed_entities:
+            await self._invalidate_listings(self._changed_entities)
+        for doc in self._uploaded:
+            try:
+                schedule_derivatives(doc)
+                schedule_text_extraction(doc)
+            except Exception:
+                # The upload is committed; scripts/backfill_* pick up documents whose tasks were lost
+                logger.exception("Could not queue ingestion tasks for document %s", doc.id)
+        if self._released_keys:
+            await self._delete_released_objects(self._released_keys)
+        self._uploaded.clear()
+        self._changed_entities.clear()
+        self._released_keys.clear()
+
+    async def get(self, doc_id: UUID) -> Document | None:
+        """A document by id, or None if it does not exist or is outside the department."""
+        result = await self.session.execute(select(Document).where(Document.id == doc_id, *self._scope()))
+        return result.scalar_one_or_none()
+
     async def get_download_url(self, doc_id: UUID) -> str | None:
-        doc = await self.session.get(Document, doc_id)
+        doc = await self.get(doc_id)
         if not doc:
             return None
-        s3 = get_s3_client()
+        s3 = await get_s3_client_async()
         return s3.get_presigned_url(doc.s3_key)
 
+    async def get_download_urls(self, documents: list[Document]) -> dict[UUID, str]:
+        """Presign download URLs for already-loaded documents without touching the DB."""
+        s3 = await get_s3_client_async()
+        urls = s3.get_presigned_urls([doc.s3_key for doc in documents])
+        return {doc.id: urls[doc.s3_key] for doc in documents}
+
+    async def get_thumbnail_urls(self, documents: list[Document]) -> dict[UUID, str]:
+        """Presign thumbnail URLs for documents whose derivatives have been generated."""
+        s3 = await get_s3_client_async()
+        with_thumbnails = [doc for doc in documents if doc.thumbnail_key]
+        urls = s3.get_presigned_urls([doc.thumbnail_key for doc in with_thumbnails])
+        return {doc.id: urls[doc.thumbnail_key] for doc in with_thumbnails}
+
     async def list_for_entity(self, entity_type: EntityType, entity_id: UUID) -> list[Document]:
+        """Documents of an entity, newest first. Served from the Redis listing cache when possible.
+
+        Cached results are detached Document objects: read them, don't modify them.
+        Entities outside the department have no documents.
+        """
+        if not await self._entity_in_scope(entity_type, entity_id):
+            return []
+        key, gen_key = listing_key(entity_type, entity_id), generation_key(entity_type, entity_id)
+        try:
+            generation, cached = await get_async_redis().mget(gen_key, key)
+        except RedisError:
+            logger.warning("Document listing cache unavailable", exc_info=True)
+            return await self._query_listing(entity_type, entity_id)
+        if cached is not None:
+            return load_listing(cached, entity_type, entity_id)
+
+        documents = await self._query_listing(entity_type, entity_id)
+        try:
+            # Stored only if no writer invalidated the listing since the generation was read
+            await get_async_redis().eval(
+                FILL_LISTING,
+                2,
+                gen_key,
+                key,
+                generation or "",
+                dump_listing(documents),
+                settings.DOCUMENT_LISTING_CACHE_TTL,
+            )
+        except RedisError:
+            pass
+        return documents
+
+    async def _query_listing(self, entity_type: EntityType, entity_id: UUID) -> list[Document]:
         result = await self.session.execute(
             select(Document)
             .where(Document.entity_type == entity_type, Document.entity_id == entity_id)
@@ -61,11 +251,174 @@ class DocumentService:
         )
         return list(result.scalars().all())
 
+    async def search(
+        self, q: str, entity_type: EntityType, entity_id: UUID | None = None, limit: int = 20
+    ) -> list[tuple[Document, float, str]]:
+        """Full-text search over filenames and extracted text. Returns (document, rank, snippet), best first."""
+        q = q.strip()
+        if not q:
+            raise ValueError("Search query is empty")
+        query = func.websearch_to_tsquery("simple", q)
+        filters = [Document.entity_type == entity_type, Document.search_vector.op("@@")(query), *self._scope()]
+        if entity_id is not None:
+            filters.append(Document.entity_id == entity_id)
+        # Rank on the GIN index hits first; headlines are computed only for the returned page
+        matches = (
+            select(Document.id, func.ts_rank_cd(Document.search_vector, query).label("rank"))
+            .where(*filters)
+            .order_by(text("rank DESC"), Document.uploaded_at.desc())
+            .limit(limit)
+            .subquery()
+        )
+        snippet = func.ts_headline(
+            "simple", func.coalesce(Document.content_text, ""), query, "MaxFragments=2, MaxWords=20, MinWords=5"
+        )
+        result = await self.session.execute(
+            select(Document, matches.c.rank, snippet.label("snippet"))
+            .join(matches, Document.id == matches.c.id)
+            .order_by(matches.c.rank.desc(), Document.uploaded_at.desc())
+        )
+        return [(doc, rank, snippet) for doc, rank, snippet in result.tuples()]
+
+    async def count_for_entities(self, entity_type: EntityType, entity_ids: list[UUID]) -> dict[UUID, int]:
+        """Document counts for many entities in one query (entities without documents are omitted)."""
+        if not entity_ids:
+            return {}
+        result = await self.session.execute(
+            select(Document.entity_id, func.count())
+            .where(Document.entity_type == entity_type, Document.entity_id.in_(entity_ids))
+            .group_by(Document.entity_id)
+        )
+        return dict(result.tuples().all())
+
+    async def iter_zip(self, documents: list[Document]) -> AsyncIterator[bytes]:
+        """Stream already-loaded documents as a zip archive, fetching each object from S3 as it goes.
+
+        Does not use the session, so it is safe to consume after the request's session is closed.
+        """
+        s3 = await get_s3_client_async()
+        entries = (
+            ZipEntry(
+                name=doc.filename,
+                chunks=s3.iter_object_async(doc.s3_key),
+                modified=doc.uploaded_at,
+                compress=not doc.mime_type.startswith(_STORED_IN_ZIP),
+            )
+            for doc in documents
+        )
+        async for chunk in stream_zip(entries):
+            yield chunk
+
     async def delete(self, doc_id: UUID) -> None:
-        doc = await self.session.get(Document, doc_id)
+        doc = await self.get(doc_id)
         if not doc:
             raise ValueError("Document not found")
-        s3 = get_s3_client()
-        s3.delete_file(doc.s3_key)
+        if await self._release_blob(doc.s3_key):
+            # Objects are deleted by after_commit(), once no row can point at them any more
+            self._released_keys.extend(key for key in (doc.s3_key, doc.thumbnail_key, doc.preview_key) if key)
         await self.session.delete(doc)
         await self.session.flush()
+        self._changed_entities.add((doc.entity_type, doc.entity_id))
+
+    def _scope(self) -> list[ColumnElement[bool]]:
+        """Filters limiting Document rows to the department's entities (empty when unscoped)."""
+        if self.department is None:
+            return []
+        owned = [
+            and_(
+                Document.entity_type == entity_type,
+                Document.entity_id.in_(select(model.id).where(department_clause(model, self.department))),
+            )
+            for entity_type, model in _ENTITY_MODELS.items()
+        ]
+        return [or_(*owned)]
+
+    async def _entity_in_scope(self, entity_type: EntityType, entity_id: UUID) -> bool:
+        if self.department is None:
+            return True
+        model = _ENTITY_MODELS[entity_type]
+        return bool(
+            await self.session.scalar(
+                select(exists().where(model.id == entity_id, department_clause(model, self.department)))
+            )
+        )
+
+    async def _invalidate_listings(self, entities: set[tuple[EntityType, UUID]]) -> None:
+        try:
+            async with get_async_redis().pipeline(transaction=False) as pipe:
+                queue_invalidation(pipe, entities)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Could not invalidate document listings %s", entities, exc_info=True)
+
+    async def _delete_released_objects(self, keys: list[str]) -> None:
+        """Delete objects of released blobs, skipping keys that a concurrent upload references again.
+
+        Objects left behind when S3 fails are collected by reconcile_document_storage.
+        """
+        result = await self.session.execute(
+            union(
+                select(DocumentBlob.s3_key).where(DocumentBlob.s3_key.in_(keys)),
+                select(Document.s3_key).where(Document.s3_key.in_(keys)),
+                select(Document.thumbnail_key).where(Document.thumbnail_key.in_(keys)),
+                select(Document.preview_key).where(Document.preview_key.in_(keys)),
+            )
+        )
+        referenced = set(result.scalars())
+        unused = [key for key in dict.fromkeys(keys) if key not in referenced]
+        if not unused:
+            return
+        try:
+            s3 = await get_s3_client_async()
+            await s3.delete_files_async(unused)
+        except Exception:
+            logger.exception("Could not delete released objects %s, leaving them to reconciliation", unused)
+
+    async def _acquire_blobs(self, entries: dict[str, tuple[str, int, int]]) -> dict[str, tuple[str, bool]]:
+        """Add references to blobs, given sha256 -> (s3_key, size, count).
+
+        Returns sha256 -> (stored s3_key, whether the blob is new). Concurrent
+        uploads of the same content serialize on the unique sha256, so exactly
+        one of them sees a new blob and uploads the object.
+        """
+        stmt = insert(DocumentBlob).values(
+            [
+                {"sha256": sha256, "s3_key": key, "size_bytes": size, "ref_count": count}
+                # Sorted so concurrent batches lock rows in the same order
+                for sha256, (key, size, count) in sorted(entries.items())
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DocumentBlob.sha256],
+            set_={"ref_count": DocumentBlob.ref_count + stmt.excluded.ref_count},
+        ).returning(DocumentBlob.sha256, DocumentBlob.s3_key, DocumentBlob.ref_count)
+        rows = (await self.session.execute(stmt)).all()
+        return {row.sha256: (row.s3_key, row.ref_count == entries[row.sha256][2]) for row in rows}
+
+    async def _existing_derivatives(self, s3_keys: list[str]) -> dict[str, tuple[str, str | None]]:
+        if not s3_keys:
+            return {}
+        result = await self.session.execute(
+            select(Document.s3_key, Document.thumbnail_key, Document.preview_key).where(
+                Document.s3_key.in_(s3_keys), Document.thumbnail_key.is_not(None)
+            )
+        )
+        return {row.s3_key: (row.thumbnail_key, row.preview_key) for row in result}
+
+    async def _release_blob(self, s3_key: str) -> bool:
+        """Drop a reference to the object at ``s3_key``. Returns True if it is no longer used."""
+        row = (
+            await self.session.execute(
+                update(DocumentBlob)
+                .where(DocumentBlob.s3_key == s3_key)
+                .values(ref_count=DocumentBlob.ref_count - 1)
+                .returning(DocumentBlob.ref_count)
+            )
+        ).first()
+        if row is None:
+            # Uploaded before content addressing: the object belongs to this document alone
+            return True
+        if row.ref_count > 0:
+            return False
+        await self.session.execute(delete(DocumentBlob).where(DocumentBlob.s3_key == s3_key))
+        return True
@@ -8,17 +8,29 @@ from app.schemas.driver import DriverCreate, DriverUpdate
 
 
 class DriverService:
-    def __init__(self, session: AsyncSession):
-        self.repo = DriverRepository(session)
+    def __init__(self, session: AsyncSession, department: str | None = None):
+        """``department`` limits the service to that department's drivers (see app/permissions.py)."""
+        self.repo = DriverRepository(session, department)
+        self.department = department
+
+    def _check_department(self, department: str | None) -> None:
+        if self.department is not None and department != self.department:
+            raise ValueError(f"Drivers must belong to department {self.department}")
 
     async def create(self, data: DriverCreate) -> Driver:
+        if self.department is not None and data.department is None:
+            data.department = self.department
+        self._check_department(data.department)
         return await self.repo.create(**data.model_dump())
 
     async def update(self, driver_id: UUID, data: DriverUpdate) -> Driver:
         driver = await self.repo.get_by_id(driver_id)
         if not driver:
             raise ValueError("Driver not found")
-        return await self.repo.update(driver, **data.model_dump(exclude_unset=True))
+        update_data = data.model_dump(exclude_unset=True)
+        if "department" in update_data:
+            self._check_department(update_data["department"])
+        return await self.repo.update(driver, **update_data)
 
     async def get_by_id(self, driver_id: UUID) -> Driver | None:
         return await self.repo.get_by_id(driver_id)
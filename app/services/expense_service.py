@@ -5,15 +5,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.expense import Expense, ExpenseCategory
 from app.repositories.base import BaseRepository
+from app.repositories.vehicle_repo import VehicleRepository
 from app.schemas.expense import ExpenseCreate, ExpenseUpdate
 
 
 class ExpenseService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, department: str | None = None):
+        """``department`` limits the service to expenses of that department's vehicles (see app/permissions.py)."""
         self.session = session
-        self.repo = BaseRepository(Expense, session)
+        self.repo = BaseRepository(Expense, session, department)
+        self.vehicles = VehicleRepository(session, department)
 
     async def create(self, data: ExpenseCreate, user_id: UUID) -> Expense:
+        if not await self.vehicles.get_by_id(data.vehicle_id):
+            raise ValueError("Vehicle not found")
         return await self.repo.create(**data.model_dump(), created_by=user_id)
 
     async def update(self, expense_id: UUID, data: ExpenseUpdate) -> Expense:
@@ -26,8 +31,8 @@ class ExpenseService:
         return await self.repo.get_by_id(expense_id)
 
     async def list_for_vehicle(self, vehicle_id: UUID, offset: int = 0, limit: int = 50) -> tuple[list[Expense], int]:
-        query = select(Expense).where(Expense.vehicle_id == vehicle_id)
-        count_q = select(func.count()).select_from(Expense).where(Expense.vehicle_id == vehicle_id)
+        query = self.repo.scoped(select(Expense).where(Expense.vehicle_id == vehicle_id))
+        count_q = self.repo.scoped(select(func.count()).select_from(Expense).where(Expense.vehicle_id == vehicle_id))
         total = (await self.session.execute(count_q)).scalar() or 0
         result = await self.session.execute(query.order_by(Expense.date.desc()).offset(offset).limit(limit))
         return list(result.scalars().all()), total
@@ -39,7 +44,7 @@ class ExpenseService:
         return await self.repo.list(offset=(page - 1) * size, limit=size, order_by="-date", filters=filters)
 
     async def cost_breakdown_by_category(self, vehicle_id: UUID | None = None) -> dict[str, float]:
-        query = select(Expense.category, func.sum(Expense.amount))
+        query = self.repo.scoped(select(Expense.category, func.sum(Expense.amount)))
         if vehicle_id:
             query = query.where(Expense.vehicle_id == vehicle_id)
         query = query.group_by(Expense.category)
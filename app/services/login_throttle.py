@@ -0,0 +1,66 @@
+"""Failed-login rate limiting per username and per client IP.
+
+Failures are counted in Redis under ``fleetcore:login-failures:*`` in fixed
+windows of ``LOGIN_RATE_WINDOW_SECONDS``. Once a username or IP reaches its
+limit, attempts are refused before the password is checked, so guessing
+does not cost bcrypt time either. A successful login clears the username's
+count. If Redis is unavailable, logins are not throttled.
+"""
+
+import logging
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.utils.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_PREFIX = "fleetcore:login-failures"
+
+
+class LoginThrottledError(ValueError):
+    """Too many failed logins; ``retry_after`` is in seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many failed login attempts, try again later")
+        self.retry_after = retry_after
+
+
+def _keys(username: str, ip: str | None) -> list[tuple[str, int]]:
+    keys = [(f"{THROTTLE_PREFIX}:user:{username.lower()}", settings.LOGIN_MAX_FAILURES_PER_USERNAME)]
+    if ip:
+        keys.append((f"{THROTTLE_PREFIX}:ip:{ip}", settings.LOGIN_MAX_FAILURES_PER_IP))
+    return keys
+
+
+async def check_login_allowed(username: str, ip: str | None) -> None:
+    """Raise LoginThrottledError if the username or IP has too many recent failures."""
+    keys = _keys(username, ip)
+    redis = get_async_redis()
+    try:
+        counts = await redis.mget([key for key, _ in keys])
+        for (key, limit), count in zip(keys, counts):
+            if count is not None and int(count) >= limit:
+                ttl = await redis.ttl(key)
+                raise LoginThrottledError(max(ttl, 1))
+    except RedisError:
+        logger.warning("Login throttling unavailable", exc_info=True)
+
+
+async def record_login_failure(username: str, ip: str | None) -> None:
+    try:
+        async with get_async_redis().pipeline(transaction=True) as pipe:
+            for key, _ in _keys(username, ip):
+                pipe.set(key, 0, ex=settings.LOGIN_RATE_WINDOW_SECONDS, nx=True)
+                pipe.incr(key)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Could not record failed login for %s", username, exc_info=True)
+
+
+async def clear_login_failures(username: str) -> None:
+    try:
+        await get_async_redis().delete(_keys(username, None)[0][0])
+    except RedisError:
+        pass
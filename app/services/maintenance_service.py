@@ -6,15 +6,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.maintenance import MaintenanceRecord, MaintenanceStatus
 from app.repositories.base import BaseRepository
+from app.repositories.vehicle_repo import VehicleRepository
 from app.schemas.maintenance import MaintenanceCreate, MaintenanceUpdate
 
 
 class MaintenanceService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, department: str | None = None):
+        """``department`` limits the service to maintenance records of that department's vehicles (see app/permissions.py)."""
         self.session = session
-        self.repo = BaseRepository(MaintenanceRecord, session)
+        self.repo = BaseRepository(MaintenanceRecord, session, department)
+        self.vehicles = VehicleRepository(session, department)
 
     async def create(self, data: MaintenanceCreate, user_id: UUID) -> MaintenanceRecord:
+        if not await self.vehicles.get_by_id(data.vehicle_id):
+            raise ValueError("Vehicle not found")
         return await self.repo.create(**data.model_dump(), created_by=user_id)
 
     async def update(self, record_id: UUID, data: MaintenanceUpdate) -> MaintenanceRecord:
@@ -33,8 +38,8 @@ class MaintenanceService:
         return await self.repo.get_by_id(record_id)
 
     async def list_for_vehicle(self, vehicle_id: UUID, offset: int = 0, limit: int = 50) -> tuple[list[MaintenanceRecord], int]:
-        query = select(MaintenanceRecord).where(MaintenanceRecord.vehicle_id == vehicle_id)
-        count_q = select(func.count()).select_from(MaintenanceRecord).where(MaintenanceRecord.vehicle_id == vehicle_id)
+        query = self.repo.scoped(select(MaintenanceRecord).where(MaintenanceRecord.vehicle_id == vehicle_id))
+        count_q = self.repo.scoped(select(func.count()).select_from(MaintenanceRecord).where(MaintenanceRecord.vehicle_id == vehicle_id))
         total = (await self.session.execute(count_q)).scalar() or 0
         result = await self.session.execute(query.order_by(MaintenanceRecord.scheduled_date.desc()).offset(offset).limit(limit))
         return list(result.scalars().all()), total
@@ -48,7 +53,7 @@ class MaintenanceService:
     async def get_kanban_data(self) -> dict[str, list[MaintenanceRecord]]:
         result = {}
         for status in [MaintenanceStatus.SCHEDULED, MaintenanceStatus.IN_PROGRESS, MaintenanceStatus.COMPLETED]:
-            q = select(MaintenanceRecord).where(MaintenanceRecord.status == status).order_by(MaintenanceRecord.scheduled_date.asc()).limit(50)
+            q = self.repo.scoped(select(MaintenanceRecord).where(MaintenanceRecord.status == status)).order_by(MaintenanceRecord.scheduled_date.asc()).limit(50)
             res = await self.session.execute(q)
             result[status.value] = list(res.scalars().all())
         return result
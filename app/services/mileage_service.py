@@ -4,17 +4,21 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.mileage import MileageLog
-from app.models.vehicle import Vehicle
+from app.repositories.base import BaseRepository
+from app.repositories.vehicle_repo import VehicleRepository
 from app.schemas.mileage import MileageCreate
 
 
 class MileageService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, department: str | None = None):
+        """``department`` limits the service to mileage of that department's vehicles (see app/permissions.py)."""
         self.session = session
+        self.repo = BaseRepository(MileageLog, session, department)
+        self.vehicles = VehicleRepository(session, department)
 
     async def add_reading(self, data: MileageCreate, user_id: UUID) -> MileageLog:
         """Add mileage reading with validation."""
-        vehicle = await self.session.get(Vehicle, data.vehicle_id)
+        vehicle = await self.vehicles.get_by_id(data.vehicle_id)
         if not vehicle:
             raise ValueError("Vehicle not found")
 
@@ -52,8 +56,7 @@ class MileageService:
 
     async def get_history(self, vehicle_id: UUID, limit: int = 50) -> list[MileageLog]:
         result = await self.session.execute(
-            select(MileageLog)
-            .where(MileageLog.vehicle_id == vehicle_id)
+            self.repo.scoped(select(MileageLog).where(MileageLog.vehicle_id == vehicle_id))
             .order_by(MileageLog.recorded_at.desc())
             .limit(limit)
         )
@@ -5,7 +5,13 @@ from uuid import UUID
 from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.notification import Notification, NotificationPreference, NotificationType
+from app.models.notification import (
+    DeliveryChannel,
+    Notification,
+    NotificationDelivery,
+    NotificationPreference,
+    NotificationType,
+)
 from app.models.user import User
 
 
@@ -22,7 +28,29 @@ class NotificationService:
         entity_type: str | None = None,
         entity_id: UUID | None = None,
     ) -> Notification:
-        """Create an in-app notification."""
+        """Create an in-app notification and queue its email/Telegram deliveries."""
+        pref = await self.get_preferences(user_id)
+        notification = self._add_notification(
+            user_id, title, message, notification_type, entity_type, entity_id, pref
+        )
+        await self.db.commit()
+        await self.db.refresh(notification)
+        return notification
+
+    def _add_notification(
+        self,
+        user_id: UUID,
+        title: str,
+        message: str,
+        notification_type: NotificationType,
+        entity_type: str | None,
+        entity_id: UUID | None,
+        pref: NotificationPreference | None,
+    ) -> Notification:
+        """Stage a notification plus one pending delivery per enabled channel.
+
+        Deliveries are not sent here; the digest flush task coalesces them.
+        """
         notification = Notification(
             user_id=user_id,
             title=title,
@@ -32,10 +60,29 @@ class NotificationService:
             entity_id=entity_id,
         )
         self.db.add(notification)
-        await self.db.commit()
-        await self.db.refresh(notification)
+        for channel in self.enabled_channels(pref):
+            self.db.add(
+                NotificationDelivery(
+                    notification=notification,
+                    user_id=user_id,
+                    channel=channel,
+                    type=notification_type,
+                )
+            )
         return notification
 
+    @staticmethod
+    def enabled_channels(pref: NotificationPreference | None) -> list[DeliveryChannel]:
+        """Out-of-app channels a user receives notifications on."""
+        if pref is None:
+            return [DeliveryChannel.EMAIL]
+        channels = []
+        if pref.email_enabled:
+            channels.append(DeliveryChannel.EMAIL)
+        if pref.telegram_enabled and pref.telegram_chat_id:
+            channels.append(DeliveryChannel.TELEGRAM)
+        return channels
+
     async def get_unread_count(self, user_id: UUID) -> int:
         """Get count of unread notifications for a user."""
         result = await self.db.execute(
@@ -120,21 +167,15 @@ class NotificationService:
         from app.models.user import UserRole
 
         result = await self.db.execute(
-            select(User.id).where(
+            select(User.id, NotificationPreference)
+            .outerjoin(NotificationPreference, NotificationPreference.user_id == User.id)
+            .where(
                 User.is_active == True,
                 User.role.in_([UserRole.ADMIN, UserRole.FLEET_MANAGER]),
             )
         )
-        user_ids = [row[0] for row in result.all()]
-        count = 0
-        for uid in user_ids:
-            await self.create_notification(
-                user_id=uid,
-                title=title,
-                message=message,
-                notification_type=notification_type,
-                entity_type=entity_type,
-                entity_id=entity_id,
-            )
-            count += 1
-        return count
+        rows = result.all()
+        for uid, pref in rows:
+            self._add_notification(uid, title, message, notification_type, entity_type, entity_id, pref)
+        await self.db.commit()
+        return len(rows)
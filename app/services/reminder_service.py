@@ -0,0 +1,81 @@
+"""Reminder queries shared by the dashboard and the scheduled reminder tasks."""
+
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.contract import Contract, ContractStatus
+from app.models.driver import Driver, DriverStatus
+from app.models.maintenance import MaintenanceRecord, MaintenanceStatus
+from app.permissions import department_filters
+
+MAINTENANCE_LOOKAHEAD_DAYS = 14
+EXPIRY_LOOKAHEAD_DAYS = 30
+
+
+class ReminderService:
+    def __init__(self, db: AsyncSession, today: date | None = None, department: str | None = None):
+        """``department`` limits the counts to that department's rows (see app/permissions.py)."""
+        self.db = db
+        self.today = today or date.today()
+        self.department = department
+
+    def _criteria(self) -> dict[str, tuple]:
+        """Map each reminder category to (id column, filter clauses)."""
+        today = self.today
+        maintenance_deadline = today + timedelta(days=MAINTENANCE_LOOKAHEAD_DAYS)
+        expiry_deadline = today + timedelta(days=EXPIRY_LOOKAHEAD_DAYS)
+        return {
+            "overdue_maintenance": (
+                MaintenanceRecord.id,
+                (
+                    MaintenanceRecord.status == MaintenanceStatus.SCHEDULED,
+                    MaintenanceRecord.scheduled_date < today,
+                ),
+            ),
+            "upcoming_maintenance": (
+                MaintenanceRecord.id,
+                (
+                    MaintenanceRecord.status == MaintenanceStatus.SCHEDULED,
+                    MaintenanceRecord.scheduled_date >= today,
+                    MaintenanceRecord.scheduled_date <= maintenance_deadline,
+                ),
+            ),
+            "expiring_contracts": (
+                Contract.id,
+                (
+                    Contract.status == ContractStatus.ACTIVE,
+                    Contract.end_date >= today,
+                    Contract.end_date <= expiry_deadline,
+                ),
+            ),
+            "expiring_licenses": (
+                Driver.id,
+                (
+                    Driver.status == DriverStatus.ACTIVE,
+                    Driver.license_expiry >= today,
+                    Driver.license_expiry <= expiry_deadline,
+                ),
+            ),
+            "expiring_medical": (
+                Driver.id,
+                (
+                    Driver.status == DriverStatus.ACTIVE,
+                    Driver.medical_expiry >= today,
+                    Driver.medical_expiry <= expiry_deadline,
+                ),
+            ),
+        }
+
+    async def counts(self, *names: str) -> dict[str, int]:
+        """Count reminder categories (all by default) in a single round trip."""
+        criteria = self._criteria()
+        names = names or tuple(criteria)
+        columns = []
+        for name in names:
+            id_column, clauses = criteria[name]
+            scope = department_filters(id_column.class_, self.department)
+            columns.append(select(func.count(id_column)).where(*clauses, *scope).scalar_subquery().label(name))
+        row = (await self.db.execute(select(*columns))).one()
+        return {name: row._mapping[name] or 0 for name in names}
@@ -9,12 +9,15 @@ from app.models.contract import Contract, ContractStatus
 from app.models.expense import Expense, ExpenseCategory
 from app.models.maintenance import MaintenanceRecord
 from app.models.vehicle import Vehicle, VehicleStatus
+from app.permissions import department_filters
 from app.utils.export import CSVExporter, ExcelExporter
 
 
 class ReportService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, department: str | None = None):
+        """``department`` limits every report to that department's vehicles (see app/permissions.py)."""
         self.db = db
+        self.department = department
 
     async def tco_report(
         self, start_date: dt.date | None = None, end_date: dt.date | None = None
@@ -31,6 +34,7 @@ class ReportService:
                 func.coalesce(func.sum(Expense.amount), 0).label("total_expenses"),
             )
             .outerjoin(Expense, Expense.vehicle_id == Vehicle.id)
+            .where(*department_filters(Vehicle, self.department))
         )
         if start_date:
             query = query.where(Expense.date >= start_date)
@@ -59,7 +63,9 @@ class ReportService:
     async def fleet_utilization(self) -> dict:
         """Fleet utilization statistics."""
         result = await self.db.execute(
-            select(Vehicle.status, func.count(Vehicle.id)).group_by(Vehicle.status)
+            select(Vehicle.status, func.count(Vehicle.id))
+            .where(*department_filters(Vehicle, self.department))
+            .group_by(Vehicle.status)
         )
         counts = {str(row[0].value): row[1] for row in result.all()}
         total = sum(counts.values())
@@ -90,6 +96,7 @@ class ReportService:
             .join(Expense, Expense.vehicle_id == Vehicle.id)
             .where(Expense.category == ExpenseCategory.FUEL)
             .where(Expense.fuel_liters.is_not(None))
+            .where(*department_filters(Vehicle, self.department))
         )
         if start_date:
             query = query.where(Expense.date >= start_date)
@@ -117,7 +124,7 @@ class ReportService:
         self, start_date: dt.date | None = None, end_date: dt.date | None = None
     ) -> dict:
         """Comprehensive expense analysis."""
-        base_filter = []
+        base_filter = department_filters(Expense, self.department)
         if start_date:
             base_filter.append(Expense.date >= start_date)
         if end_date:
@@ -170,19 +177,23 @@ class ReportService:
         self, start_date: dt.date | None = None, end_date: dt.date | None = None
     ) -> list[dict]:
         """Maintenance history report."""
-        query = select(
-            MaintenanceRecord.id,
-            Vehicle.license_plate,
-            Vehicle.brand,
-            Vehicle.model,
-            MaintenanceRecord.type,
-            MaintenanceRecord.title,
-            MaintenanceRecord.status,
-            MaintenanceRecord.scheduled_date,
-            MaintenanceRecord.completed_date,
-            MaintenanceRecord.cost,
-            MaintenanceRecord.service_provider,
-        ).join(Vehicle, Vehicle.id == MaintenanceRecord.vehicle_id)
+        query = (
+            select(
+                MaintenanceRecord.id,
+                Vehicle.license_plate,
+                Vehicle.brand,
+                Vehicle.model,
+                MaintenanceRecord.type,
+                MaintenanceRecord.title,
+                MaintenanceRecord.status,
+                MaintenanceRecord.scheduled_date,
+                MaintenanceRecord.completed_date,
+                MaintenanceRecord.cost,
+                MaintenanceRecord.service_provider,
+            )
+            .join(Vehicle, Vehicle.id == MaintenanceRecord.vehicle_id)
+            .where(*department_filters(Vehicle, self.department))
+        )
 
         if start_date:
             query = query.where(MaintenanceRecord.scheduled_date >= start_date)
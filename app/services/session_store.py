@@ -0,0 +1,115 @@
+"""Server-side web sessions in Redis.
+
+The session cookie holds only an opaque id. The session itself is a Redis
+hash under ``fleetcore:session:<id>`` (one JSON-encoded field per session
+key), so concurrent requests that change different keys do not overwrite
+each other. Every request that loads a session slides its expiry to
+``SESSION_MAX_AGE``.
+
+Signed-in sessions are indexed per user under ``fleetcore:user-sessions:<user_id>``.
+That index lets ``revoke_user_sessions`` sign a user out everywhere and
+``forget_principal`` drop the user snapshot that sessions carry (see
+app/web/deps.py).
+"""
+
+import json
+import logging
+import secrets
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.utils.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+SESSION_PREFIX = "fleetcore:session"
+USER_SESSIONS_PREFIX = "fleetcore:user-sessions"
+PRINCIPAL_FIELD = "principal"
+
+
+def session_key(session_id: str) -> str:
+    return f"{SESSION_PREFIX}:{session_id}"
+
+
+def user_sessions_key(user_id: UUID | str) -> str:
+    return f"{USER_SESSIONS_PREFIX}:{user_id}"
+
+
+def new_session_id() -> str:
+    return secrets.token_urlsafe(32)
+
+
+async def load_session(session_id: str) -> dict | None:
+    """Return the session's data (empty if unknown or expired) and extend its lifetime.
+
+    Returns None when the store is unavailable, so callers can tell an
+    outage from a signed-out session.
+    """
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            pipe.hgetall(session_key(session_id))
+            pipe.expire(session_key(session_id), settings.SESSION_MAX_AGE)
+            fields, _ = await pipe.execute()
+    except RedisError:
+        logger.warning("Session store unavailable", exc_info=True)
+        return None
+    return {key: json.loads(value) for key, value in fields.items()}
+
+
+async def save_session(session_id: str, initial: dict, session: dict) -> None:
+    """Write the keys that changed since ``initial`` was loaded."""
+    changed = {key: json.dumps(value) for key, value in session.items() if initial.get(key) != value}
+    removed = [key for key in initial if key not in session]
+    if not changed and not removed:
+        return
+    key = session_key(session_id)
+    try:
+        async with get_async_redis().pipeline(transaction=True) as pipe:
+            if changed:
+                pipe.hset(key, mapping=changed)
+            if removed:
+                pipe.hdel(key, *removed)
+            pipe.expire(key, settings.SESSION_MAX_AGE)
+            if user_id := session.get("user_id"):
+                pipe.sadd(user_sessions_key(user_id), session_id)
+                pipe.expire(user_sessions_key(user_id), settings.SESSION_MAX_AGE)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Could not save session", exc_info=True)
+
+
+async def delete_session(session_id: str, user_id: str | None = None) -> None:
+    try:
+        async with get_async_redis().pipeline(transaction=True) as pipe:
+            pipe.delete(session_key(session_id))
+            if user_id:
+                pipe.srem(user_sessions_key(user_id), session_id)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Could not delete session", exc_info=True)
+
+
+async def revoke_user_sessions(user_id: UUID) -> None:
+    """Sign the user out of every web session."""
+    redis = get_async_redis()
+    try:
+        session_ids = await redis.smembers(user_sessions_key(user_id))
+        await redis.delete(user_sessions_key(user_id), *(session_key(sid) for sid in session_ids))
+    except RedisError:
+        logger.error("Could not revoke sessions of user %s", user_id, exc_info=True)
+
+
+async def forget_principal(user_id: UUID) -> None:
+    """Drop the cached user snapshot from the user's sessions, so the next request reloads it."""
+    redis = get_async_redis()
+    try:
+        session_ids = await redis.smembers(user_sessions_key(user_id))
+        if session_ids:
+            async with redis.pipeline(transaction=False) as pipe:
+                for sid in session_ids:
+                    pipe.hdel(session_key(sid), PRINCIPAL_FIELD)
+                await pipe.execute()
+    except RedisError:
+        logger.warning("Could not refresh sessions of user %s", user_id, exc_info=True)
@@ -0,0 +1,57 @@
+"""Revocation of access tokens issued before a user's role or status changed.
+
+With ``JWT_STATELESS_ROLES`` enabled, API role checks trust the signed
+``sub``/``role`` claims of the access token instead of loading the user.
+Changing a user's role, deactivating or deleting them stores the time under
+``fleetcore:auth:revoked:<user_id>``; tokens issued at or before it fall
+back to loading the user, which picks up the new role or rejects a
+disabled account. Entries expire with the longest-lived access token.
+"""
+
+import logging
+import time
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.utils.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_PREFIX = "fleetcore:auth:revoked"
+
+
+def revocation_key(user_id: UUID) -> str:
+    return f"{REVOCATION_PREFIX}:{user_id}"
+
+
+class TokenRevocationError(RuntimeError):
+    """The revocation could not be stored; the user's current tokens are still trusted."""
+
+
+async def revoke_tokens(user_id: UUID) -> None:
+    """Stop trusting the user's current access tokens.
+
+    Raises TokenRevocationError if Redis rejects the write. Call it before
+    committing the change, so that the change is refused rather than applied
+    while old tokens stay trusted, and again once it is committed, for tokens
+    issued in between.
+    """
+    try:
+        await get_async_redis().set(
+            revocation_key(user_id), int(time.time()), ex=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        )
+    except RedisError as e:
+        raise TokenRevocationError(f"Could not revoke access tokens of user {user_id}") from e
+
+
+async def claims_trusted(user_id: UUID, issued_at: int) -> bool:
+    """Whether a token issued at ``issued_at`` postdates any revocation. False if Redis is unavailable."""
+    try:
+        revoked_at = await get_async_redis().get(revocation_key(user_id))
+    except RedisError:
+        logger.warning("Token revocation list unavailable, loading user %s", user_id)
+        return False
+    # Same-second tokens are not trusted: the user is simply loaded once
+    return revoked_at is None or issued_at > int(revoked_at)
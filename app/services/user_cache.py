@@ -0,0 +1,120 @@
+"""Short-lived cache of authenticated users.
+
+Every web request resolves the session's user, and one dashboard view fans
+out into several HTMX requests plus the notification bell poll. Users are
+cached as JSON under ``fleetcore:user:<id>`` in Redis (``USER_CACHE_TTL``)
+and in a small per-process LRU (``USER_CACHE_LOCAL_TTL``) in front of it.
+
+Writers call ``invalidate_user()`` after committing a change to a user.
+That clears Redis, the local copy and the snapshots in the user's web
+sessions; other processes may keep serving theirs until the local TTL runs
+out. Cached users are detached: use them for ids, role checks and display,
+and load the row again before writing.
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.user import User, UserRole
+from app.repositories.user_repo import UserRepository
+from app.services.session_store import forget_principal
+from app.utils.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_PREFIX = "fleetcore:user"
+
+# user id -> (monotonic expiry, JSON); JSON rather than User objects so
+# concurrent requests never share a mutable instance
+_local: OrderedDict[UUID, tuple[float, str]] = OrderedDict()
+
+
+def user_key(user_id: UUID) -> str:
+    return f"{USER_CACHE_PREFIX}:{user_id}"
+
+
+def dump_user(user: User) -> str:
+    return json.dumps(
+        {
+            "id": str(user.id),
+            "email": user.email,
+            "username": user.username,
+            "full_name": user.full_name,
+            "role": user.role.value,
+            "is_active": user.is_active,
+            "language": user.language,
+            "department": user.department,
+        }
+    )
+
+
+def load_user(data: str) -> User:
+    """Rebuild a detached (read-only) User from its cached form."""
+    row = json.loads(data)
+    return User(
+        id=UUID(row["id"]),
+        email=row["email"],
+        username=row["username"],
+        full_name=row["full_name"],
+        role=UserRole(row["role"]),
+        is_active=row["is_active"],
+        language=row["language"],
+        department=row.get("department"),
+    )
+
+
+def _local_get(user_id: UUID) -> str | None:
+    entry = _local.get(user_id)
+    if entry is None:
+        return None
+    expires, data = entry
+    if expires < time.monotonic():
+        _local.pop(user_id, None)
+        return None
+    _local.move_to_end(user_id)
+    return data
+
+
+def _local_set(user_id: UUID, data: str) -> None:
+    _local[user_id] = (time.monotonic() + settings.USER_CACHE_LOCAL_TTL, data)
+    _local.move_to_end(user_id)
+    while len(_local) > settings.USER_CACHE_SIZE:
+        _local.popitem(last=False)
+
+
+async def get_user(db: AsyncSession, user_id: UUID) -> User | None:
+    """Return the user, hitting the database only on a cache miss. Unknown ids are not cached."""
+    data = _local_get(user_id)
+    if data is None:
+        try:
+            data = await get_async_redis().get(user_key(user_id))
+        except RedisError:
+            logger.warning("User cache unavailable, reading user %s from the database", user_id)
+        if data is None:
+            user = await UserRepository(db).get_by_id(user_id)
+            if user is None:
+                return None
+            data = dump_user(user)
+            try:
+                await get_async_redis().set(user_key(user_id), data, ex=settings.USER_CACHE_TTL)
+            except RedisError:
+                pass
+        _local_set(user_id, data)
+    return load_user(data)
+
+
+async def invalidate_user(user_id: UUID) -> None:
+    """Drop a user from the caches. Call after the change is committed."""
+    _local.pop(user_id, None)
+    try:
+        await get_async_redis().delete(user_key(user_id))
+    except RedisError:
+        logger.warning("Could not invalidate cached user %s", user_id, exc_info=True)
+    await forget_principal(user_id)
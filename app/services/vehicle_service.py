@@ -8,18 +8,26 @@ from app.schemas.vehicle import VehicleCreate, VehicleUpdate
 
 
 class VehicleService:
-    def __init__(self, session: AsyncSession):
-        self.repo = VehicleRepository(session)
+    def __init__(self, session: AsyncSession, department: str | None = None):
+        """``department`` limits the service to that department's vehicles (see app/permissions.py)."""
+        self.repo = VehicleRepository(session, department)
         self.session = session
+        self.department = department
+
+    def _check_department(self, department: str | None) -> None:
+        if self.department is not None and department != self.department:
+            raise ValueError(f"Vehicles must belong to department {self.department}")
 
     async def create(self, data: VehicleCreate) -> Vehicle:
         """Create a new vehicle with uniqueness checks."""
-        existing = await self.repo.get_by_plate(data.license_plate)
-        if existing:
+        if self.department is not None and data.department is None:
+            data.department = self.department
+        self._check_department(data.department)
+        # Plates and VINs are unique across departments, not just within the scope
+        if await self.repo.is_taken(Vehicle.license_plate, data.license_plate):
             raise ValueError(f"Vehicle with plate {data.license_plate} already exists")
 
-        existing = await self.repo.get_by_vin(data.vin)
-        if existing:
+        if await self.repo.is_taken(Vehicle.vin, data.vin):
             raise ValueError(f"Vehicle with VIN {data.vin} already exists")
 
         return await self.repo.create(**data.model_dump())
@@ -31,15 +39,15 @@ class VehicleService:
             raise ValueError("Vehicle not found")
 
         update_data = data.model_dump(exclude_unset=True)
+        if "department" in update_data:
+            self._check_department(update_data["department"])
 
         if "license_plate" in update_data and update_data["license_plate"] != vehicle.license_plate:
-            existing = await self.repo.get_by_plate(update_data["license_plate"])
-            if existing:
+            if await self.repo.is_taken(Vehicle.license_plate, update_data["license_plate"]):
                 raise ValueError("License plate already in use")
 
         if "vin" in update_data and update_data["vin"] != vehicle.vin:
-            existing = await self.repo.get_by_vin(update_data["vin"])
-            if existing:
+            if await self.repo.is_taken(Vehicle.vin, update_data["vin"]):
                 raise ValueError("VIN already in use")
 
         return await self.repo.update(vehicle, **update_data)
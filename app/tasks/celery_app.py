@@ -1,13 +1,43 @@
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Queue
 
 from app.config import settings
 
+
+class _BrokerConfig:
+    """Broker settings, read when Celery first needs its configuration rather than at import."""
+
+    @property
+    def broker_url(self) -> str:
+        return settings.REDIS_URL
+
+    @property
+    def result_backend(self) -> str:
+        return settings.REDIS_URL
+
+
 celery_app = Celery(
     "fleetcore",
-    broker=settings.REDIS_URL,
-    backend=settings.REDIS_URL,
+    include=[
+        "app.tasks.notifications",
+        "app.tasks.reminders",
+        "app.tasks.retention",
+        "app.tasks.ingestion",
+        "app.tasks.storage",
+    ],
 )
+celery_app.config_from_object(_BrokerConfig())
+
+# Queues, highest urgency first. Each queue gets its own worker in
+# docker-compose.yml with concurrency/prefetch tuned to its workload:
+#   notifications — short, latency-sensitive sends (high concurrency, prefetch 4)
+#   reminders     — scheduled sweeps and housekeeping (prefetch 1)
+#   ingestion     — document processing after upload (prefetch 1, acks late)
+# Reports and exports are generated in the request, so they have no queue.
+# Only the idempotent ingestion tasks set acks_late: a send redelivered
+# after a worker crash would reach the user twice.
+TASK_QUEUES = ("notifications", "reminders", "ingestion")
 
 celery_app.conf.update(
     task_serializer="json",
@@ -15,6 +45,19 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_default_queue="default",
+    task_queues=[Queue(name) for name in ("default", *TASK_QUEUES)],
+    task_routes={
+        "app.tasks.notifications.send_*": {"queue": "notifications"},
+        "app.tasks.notifications.flush_notification_digests": {"queue": "reminders"},
+        "app.tasks.reminders.*": {"queue": "reminders"},
+        "app.tasks.retention.*": {"queue": "reminders"},
+        "app.tasks.storage.*": {"queue": "reminders"},
+        "app.tasks.ingestion.*": {"queue": "ingestion"},
+    },
+    # Long tasks must not sit reserved behind each other on one process;
+    # the notifications worker raises this on its command line.
+    worker_prefetch_multiplier=1,
     beat_schedule={
         "check-maintenance-reminders": {
             "task": "app.tasks.reminders.check_maintenance_reminders",
@@ -32,5 +75,20 @@ celery_app.conf.update(
             "task": "app.tasks.reminders.expire_overdue_contracts",
             "schedule": crontab(hour=0, minute=5),
         },
+        "flush-notification-digests": {
+            "task": "app.tasks.notifications.flush_notification_digests",
+            "schedule": crontab(minute="*/5"),
+        },
+        "archive-read-notifications": {
+            "task": "app.tasks.retention.archive_read_notifications",
+            "schedule": crontab(hour=2, minute=30),
+        },
+        "reconcile-document-storage": {
+            "task": "app.tasks.storage.reconcile_document_storage",
+            "schedule": crontab(hour=3, minute=30),
+        },
     },
 )
+
+# Connect queue latency signal handlers in every process that publishes or consumes
+from app.tasks import metrics  # noqa: E402, F401
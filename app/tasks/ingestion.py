@@ -0,0 +1,156 @@
+"""Celery tasks that post-process documents after upload."""
+
+import logging
+from uuid import UUID
+
+from botocore.exceptions import BotoCoreError, ClientError
+from redis.exceptions import RedisError
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document import Document, DocumentType, EntityType
+from app.services.document_cache import queue_invalidation
+from app.tasks.celery_app import celery_app
+from app.tasks.runtime import run_async
+from app.utils.images import IMAGE_MIME_TYPES, derived_key, render_derivatives
+from app.utils.redis_client import get_redis
+from app.utils.s3 import get_s3_client
+from app.utils.text_extraction import can_extract, extract_text
+
+logger = logging.getLogger(__name__)
+
+# Document types whose content is indexed for search
+SEARCHABLE_TYPES = {DocumentType.INVOICE, DocumentType.ACT, DocumentType.CONTRACT}
+TEXT_MIME_TYPES = IMAGE_MIME_TYPES | {"application/pdf"}
+
+
+def schedule_derivatives(doc: Document) -> None:
+    """Queue thumbnail/preview generation for an image. Call after the upload is committed."""
+    if doc.mime_type in IMAGE_MIME_TYPES and not doc.thumbnail_key:
+        generate_document_derivatives.delay(str(doc.id))
+
+
+def schedule_text_extraction(doc: Document) -> None:
+    """Queue text extraction for a searchable document. Call after the upload is committed."""
+    if doc.type in SEARCHABLE_TYPES and doc.mime_type in TEXT_MIME_TYPES:
+        extract_document_text.delay(str(doc.id))
+
+
+async def _load_source(db: AsyncSession, document_id: UUID) -> tuple[str, str] | None:
+    doc = await db.get(Document, document_id)
+    if doc is None or doc.thumbnail_key or doc.mime_type not in IMAGE_MIME_TYPES:
+        return None
+    return doc.s3_key, doc.mime_type
+
+
+async def _record_derivatives(db: AsyncSession, s3_key: str, keys: dict[str, str]) -> set[tuple[EntityType, UUID]]:
+    """Store derivative keys; returns the entities whose documents were updated."""
+    # Storage is content-addressed: every document sharing the original gets the derivatives
+    result = await db.execute(
+        update(Document)
+        .where(Document.s3_key == s3_key)
+        .values(thumbnail_key=keys["thumbnail"], preview_key=keys["preview"])
+        .returning(Document.entity_type, Document.entity_id)
+    )
+    return set(result.tuples().all())
+
+
+@celery_app.task(
+    acks_late=True,
+    autoretry_for=(BotoCoreError, ClientError),
+    retry_backoff=True,
+    max_retries=3,
+)
+def generate_document_derivatives(document_id: str):
+    """Render WebP thumbnail and preview for an uploaded image and record their keys."""
+    doc_id = UUID(document_id)
+    # Keep DB sessions short: no connection is held while downloading or resizing
+    source = run_async(_load_source, doc_id)
+    if source is None:
+        return {"document_id": document_id, "skipped": True}
+    s3_key, _ = source
+
+    s3 = get_s3_client()
+    data = s3.download_bytes(s3_key)
+    try:
+        rendered = render_derivatives(data)
+    except OSError as e:  # includes PIL.UnidentifiedImageError
+        logger.warning("Cannot render derivatives for document %s: %s", document_id, e)
+        return {"document_id": document_id, "skipped": True}
+
+    keys = {}
+    for variant, data in rendered.items():
+        keys[variant] = derived_key(s3_key, variant)
+        s3.put_bytes(keys[variant], data, "image/webp")
+
+    entities = run_async(_record_derivatives, s3_key, keys)
+    if not entities:
+        # Deleted while we were rendering
+        s3.delete_files(list(keys.values()))
+        return {"document_id": document_id, "skipped": True}
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        queue_invalidation(pipe, entities)
+        pipe.execute()
+    except RedisError:
+        logger.warning("Could not invalidate document listings for %s", document_id, exc_info=True)
+    return {"document_id": document_id, **keys}
+
+
+async def _load_text_source(db: AsyncSession, document_id: UUID) -> tuple[str, str] | None:
+    """Return (s3_key, mime_type) if the document still needs extraction.
+
+    Documents sharing content with an already extracted one just copy its text.
+    """
+    doc = await db.get(Document, document_id)
+    if doc is None or doc.text_extracted_at is not None or doc.type not in SEARCHABLE_TYPES:
+        return None
+    extracted = (
+        await db.execute(
+            select(Document.content_text, Document.text_extracted_at)
+            .where(Document.s3_key == doc.s3_key, Document.text_extracted_at.is_not(None))
+            .limit(1)
+        )
+    ).first()
+    if extracted:
+        doc.content_text, doc.text_extracted_at = extracted
+        return None
+    return doc.s3_key, doc.mime_type
+
+
+async def _record_text(db: AsyncSession, s3_key: str, text: str) -> int:
+    result = await db.execute(
+        update(Document)
+        .where(Document.s3_key == s3_key, Document.text_extracted_at.is_(None))
+        .values(content_text=text, text_extracted_at=func.now())
+    )
+    return result.rowcount
+
+
+@celery_app.task(
+    acks_late=True,
+    autoretry_for=(BotoCoreError, ClientError),
+    retry_backoff=True,
+    max_retries=3,
+)
+def extract_document_text(document_id: str):
+    """Extract searchable text from a PDF or (with OCR available) an image. Idempotent per document."""
+    doc_id = UUID(document_id)
+    source = run_async(_load_text_source, doc_id)
+    if source is None:
+        return {"document_id": document_id, "skipped": True}
+    s3_key, mime_type = source
+    if not can_extract(mime_type):
+        # Left unmarked so a later run on a worker with OCR picks it up
+        return {"document_id": document_id, "skipped": True}
+
+    data = get_s3_client().download_bytes(s3_key)
+    try:
+        text = extract_text(data, mime_type)
+    except ValueError as e:
+        # Marked as extracted (empty) so a broken file is not retried forever
+        logger.warning("Cannot extract text from document %s: %s", document_id, e)
+        text = ""
+
+    updated = run_async(_record_text, s3_key, text)
+    return {"document_id": document_id, "chars": len(text), "documents": updated}
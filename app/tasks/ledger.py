@@ -0,0 +1,122 @@
+"""Exactly-once execution for scheduled Celery tasks.
+
+Beat may fire the same schedule entry twice (restarts, several beat instances
+for HA). ``exactly_once`` guards a task in two layers:
+
+1. A Redis lock per (task, schedule slot) so concurrent duplicates skip
+   immediately without touching the database.
+2. A ``task_runs`` ledger row per (task, slot), claimed with
+   ``INSERT ... ON CONFLICT``, so a slot that already succeeded is never
+   re-run even after the lock has expired. Failed runs, and runs whose
+   worker died mid-way, may be reclaimed.
+"""
+
+import functools
+import logging
+from datetime import UTC, datetime, timedelta
+
+from redis.exceptions import LockError
+from sqlalchemy import func, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task_run import TaskRun, TaskRunStatus
+from app.tasks.runtime import run_async
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "fleetcore:task-lock"
+
+
+def run_key_for(now: datetime, slot: timedelta) -> str:
+    """Identify the schedule slot ``now`` falls into, e.g. the UTC day for daily jobs."""
+    seconds = int(slot.total_seconds())
+    start = int(now.timestamp()) // seconds * seconds
+    return datetime.fromtimestamp(start, UTC).isoformat()
+
+
+async def _claim(db: AsyncSession, task_name: str, run_key: str, stale_after: timedelta) -> bool:
+    """Insert or reclaim the ledger row for this slot. Returns False if the slot is taken."""
+    stale_before = datetime.now(UTC) - stale_after
+    stmt = (
+        insert(TaskRun)
+        .values(task_name=task_name, run_key=run_key, status=TaskRunStatus.RUNNING, attempts=1)
+        .on_conflict_do_update(
+            constraint="uq_task_runs_task_name_run_key",
+            set_={
+                "status": TaskRunStatus.RUNNING,
+                "attempts": TaskRun.attempts + 1,
+                "error": None,
+                "started_at": func.now(),
+                "finished_at": None,
+            },
+            where=or_(
+                TaskRun.status == TaskRunStatus.FAILED,
+                (TaskRun.status == TaskRunStatus.RUNNING) & (TaskRun.started_at < stale_before),
+            ),
+        )
+        .returning(TaskRun.id)
+    )
+    return (await db.execute(stmt)).first() is not None
+
+
+async def _finish(
+    db: AsyncSession, task_name: str, run_key: str, status: TaskRunStatus, result=None, error: str | None = None
+) -> None:
+    await db.execute(
+        update(TaskRun)
+        .where(TaskRun.task_name == task_name, TaskRun.run_key == run_key)
+        .values(
+            status=status,
+            result=result if isinstance(result, dict) else None,
+            error=error,
+            finished_at=func.now(),
+        )
+    )
+
+
+def exactly_once(slot: timedelta, lock_timeout: timedelta = timedelta(hours=1)):
+    """Run the decorated task at most once per ``slot`` across all workers.
+
+    ``lock_timeout`` should exceed the task's worst-case runtime; a RUNNING
+    ledger row older than that is treated as abandoned and may be reclaimed.
+    Apply below ``@celery_app.task`` so the task keeps its registered name.
+    """
+
+    def decorator(func):
+        task_name = f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            run_key = run_key_for(datetime.now(UTC), slot)
+            lock = get_redis().lock(
+                f"{LOCK_PREFIX}:{task_name}:{run_key}",
+                timeout=int(lock_timeout.total_seconds()),
+                blocking=False,
+            )
+            if not lock.acquire():
+                logger.info("Skipping %s [%s]: another worker holds the lock", task_name, run_key)
+                return {"skipped": "locked", "run_key": run_key}
+
+            try:
+                if not run_async(_claim, task_name, run_key, lock_timeout):
+                    logger.info("Skipping %s [%s]: already ran", task_name, run_key)
+                    return {"skipped": "already_ran", "run_key": run_key}
+
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    run_async(_finish, task_name, run_key, TaskRunStatus.FAILED, error=repr(e))
+                    raise
+                run_async(_finish, task_name, run_key, TaskRunStatus.SUCCEEDED, result=result)
+                return result
+            finally:
+                try:
+                    lock.release()
+                except LockError:
+                    logger.warning("Lock for %s [%s] expired before the run finished", task_name, run_key)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,67 @@
+"""Per-queue depth and wait-time metrics for Celery.
+
+Publishers stamp each message with its enqueue time; workers record how long
+it waited before starting into a capped Redis list per queue. ``queue_stats``
+reads both alongside the broker queue length.
+"""
+
+import logging
+import time
+
+from celery.signals import before_task_publish, task_prerun
+
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+LATENCY_KEY = "fleetcore:queue-latency:{queue}"
+LATENCY_SAMPLES = 1000
+
+
+@before_task_publish.connect
+def _stamp_enqueue_time(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault("enqueued_at", time.time())
+
+
+@task_prerun.connect
+def _record_wait_time(task=None, **kwargs):
+    request = task.request
+    enqueued_at = getattr(request, "enqueued_at", None) or (request.headers or {}).get("enqueued_at")
+    queue = (request.delivery_info or {}).get("routing_key")
+    if not enqueued_at or not queue:
+        return
+    wait_ms = max(0, int((time.time() - float(enqueued_at)) * 1000))
+    try:
+        key = LATENCY_KEY.format(queue=queue)
+        pipe = get_redis().pipeline()
+        pipe.lpush(key, wait_ms)
+        pipe.ltrim(key, 0, LATENCY_SAMPLES - 1)
+        pipe.execute()
+    except Exception:
+        logger.warning("Failed to record wait time for queue %s", queue, exc_info=True)
+
+
+def _percentile(sorted_values: list[int], pct: float) -> int:
+    index = min(len(sorted_values) - 1, int(round(pct * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def queue_stats() -> dict[str, dict]:
+    """Depth and recent wait times (ms) for every configured queue."""
+    from app.tasks.celery_app import TASK_QUEUES
+
+    client = get_redis()
+    stats = {}
+    for queue in ("default", *TASK_QUEUES):
+        samples = sorted(int(v) for v in client.lrange(LATENCY_KEY.format(queue=queue), 0, -1))
+        stats[queue] = {
+            "depth": client.llen(queue),
+            "wait_ms": {
+                "samples": len(samples),
+                "p50": _percentile(samples, 0.50) if samples else None,
+                "p95": _percentile(samples, 0.95) if samples else None,
+                "max": samples[-1] if samples else None,
+            },
+        }
+    return stats
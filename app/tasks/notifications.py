@@ -1,9 +1,28 @@
 """Celery tasks for sending email and Telegram notifications."""
 
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.notification import (
+    DeliveryChannel,
+    DeliveryStatus,
+    NotificationDelivery,
+    NotificationPreference,
+)
+from app.models.user import User
+from app.services.digest_service import digest_window, group_deliveries, render_digest
 from app.tasks.celery_app import celery_app
+from app.tasks.ledger import exactly_once
+from app.tasks.runtime import run_async
 from app.utils.email import email_sender
 from app.utils.telegram import telegram_bot
 
+logger = logging.getLogger(__name__)
+
 
 @celery_app.task
 def send_email_notification(to: str, subject: str, body_html: str):
@@ -15,3 +34,82 @@ def send_email_notification(to: str, subject: str, body_html: str):
 def send_telegram_notification(chat_id: str, text: str):
     """Send a Telegram notification asynchronously."""
     return telegram_bot.send_message(chat_id, text)
+
+
+def _recipient(channel: DeliveryChannel, user: User | None, pref: NotificationPreference | None) -> str | None:
+    """Resolve the address for a channel, or None if the user no longer receives it."""
+    if user is None or not user.is_active:
+        return None
+    if channel == DeliveryChannel.EMAIL:
+        if pref is not None and not pref.email_enabled:
+            return None
+        return user.email
+    if pref is not None and pref.telegram_enabled and pref.telegram_chat_id:
+        return pref.telegram_chat_id
+    return None
+
+
+async def _flush_digests(db: AsyncSession) -> dict:
+    now = datetime.now(UTC)
+    result = await db.execute(
+        select(NotificationDelivery)
+        .options(joinedload(NotificationDelivery.notification))
+        .where(NotificationDelivery.status == DeliveryStatus.PENDING)
+        .order_by(NotificationDelivery.created_at)
+    )
+    pending = list(result.scalars().all())
+    if not pending:
+        return {"digests": 0, "deliveries": 0, "skipped": 0}
+
+    user_ids = {d.user_id for d in pending}
+    users = {u.id: u for u in (await db.execute(select(User).where(User.id.in_(user_ids)))).scalars()}
+    prefs = {
+        p.user_id: p
+        for p in (
+            await db.execute(select(NotificationPreference).where(NotificationPreference.user_id.in_(user_ids)))
+        ).scalars()
+    }
+
+    digests = delivered = skipped = 0
+    for group in group_deliveries(pending):
+        pref = prefs.get(group.user_id)
+        if not group.is_due(digest_window(pref.preferences if pref else None, group.channel), now):
+            continue
+
+        recipient = _recipient(group.channel, users.get(group.user_id), pref)
+        status = DeliveryStatus.SKIPPED if recipient is None else DeliveryStatus.SENT
+        for delivery in group.deliveries:
+            delivery.status = status
+            delivery.sent_at = now
+        # Commit before enqueueing: a crash in between drops this digest
+        # instead of sending it again on the next run
+        await db.commit()
+        if recipient is None:
+            skipped += len(group.deliveries)
+            continue
+
+        subject, body = render_digest(group, users[group.user_id].language)
+        try:
+            if group.channel == DeliveryChannel.EMAIL:
+                send_email_notification.delay(recipient, subject, body)
+            else:
+                send_telegram_notification.delay(recipient, body)
+        except Exception:
+            # Not published, so the next run may safely retry the group
+            logger.exception("Failed to enqueue %s digest for user %s", group.channel.value, group.user_id)
+            for delivery in group.deliveries:
+                delivery.status = DeliveryStatus.PENDING
+                delivery.sent_at = None
+            await db.commit()
+            continue
+        digests += 1
+        delivered += len(group.deliveries)
+
+    return {"digests": digests, "deliveries": delivered, "skipped": skipped}
+
+
+@celery_app.task
+@exactly_once(timedelta(minutes=5), lock_timeout=timedelta(minutes=5))
+def flush_notification_digests():
+    """Coalesce pending deliveries into one digest per user, channel and type."""
+    return run_async(_flush_digests)
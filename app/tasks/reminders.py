@@ -1,89 +1,95 @@
 from datetime import date, timedelta
 
-from app.database import get_sync_db
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audit_log import AuditAction, AuditLog
 from app.models.contract import Contract, ContractStatus
-from app.models.driver import Driver, DriverStatus
-from app.models.maintenance import MaintenanceRecord, MaintenanceStatus
+from app.services.reminder_service import ReminderService
 from app.tasks.celery_app import celery_app
+from app.tasks.ledger import exactly_once
+from app.tasks.runtime import run_async
+
+DAILY = timedelta(days=1)
+
+# Contracts flipped per transaction by expire_overdue_contracts
+EXPIRE_BATCH_SIZE = 500
+
+
+async def _reminder_counts(db: AsyncSession, *names: str) -> dict[str, int]:
+    return await ReminderService(db).counts(*names)
 
 
 @celery_app.task
+@exactly_once(DAILY)
 def check_maintenance_reminders():
     """Check for upcoming/overdue maintenance and notify fleet managers."""
-    db = get_sync_db()
-    try:
-        today = date.today()
-        upcoming = db.query(MaintenanceRecord).filter(
-            MaintenanceRecord.status == MaintenanceStatus.SCHEDULED,
-            MaintenanceRecord.scheduled_date <= today + timedelta(days=14),
-            MaintenanceRecord.scheduled_date >= today,
-        ).all()
-
-        overdue = db.query(MaintenanceRecord).filter(
-            MaintenanceRecord.status == MaintenanceStatus.SCHEDULED,
-            MaintenanceRecord.scheduled_date < today,
-        ).all()
-
-        # TODO: Send notifications for upcoming/overdue maintenance
-        return {"upcoming": len(upcoming), "overdue": len(overdue)}
-    finally:
-        db.close()
+    counts = run_async(_reminder_counts, "upcoming_maintenance", "overdue_maintenance")
+    # TODO: Send notifications for upcoming/overdue maintenance
+    return {"upcoming": counts["upcoming_maintenance"], "overdue": counts["overdue_maintenance"]}
 
 
 @celery_app.task
+@exactly_once(DAILY)
 def check_contract_expiry():
     """Check for expiring contracts."""
-    db = get_sync_db()
-    try:
-        today = date.today()
-        expiring = db.query(Contract).filter(
-            Contract.status == ContractStatus.ACTIVE,
-            Contract.end_date <= today + timedelta(days=30),
-            Contract.end_date >= today,
-        ).all()
-        return {"expiring_contracts": len(expiring)}
-    finally:
-        db.close()
+    counts = run_async(_reminder_counts, "expiring_contracts")
+    return {"expiring_contracts": counts["expiring_contracts"]}
 
 
 @celery_app.task
+@exactly_once(DAILY)
 def check_driver_document_expiry():
     """Check for expiring driver licenses and medical certificates."""
-    db = get_sync_db()
-    try:
-        today = date.today()
-        deadline = today + timedelta(days=30)
-
-        expiring_licenses = db.query(Driver).filter(
-            Driver.status == DriverStatus.ACTIVE,
-            Driver.license_expiry <= deadline,
-            Driver.license_expiry >= today,
-        ).all()
+    counts = run_async(_reminder_counts, "expiring_licenses", "expiring_medical")
+    return {"expiring_licenses": counts["expiring_licenses"], "expiring_medicals": counts["expiring_medical"]}
 
-        expiring_medicals = db.query(Driver).filter(
-            Driver.status == DriverStatus.ACTIVE,
-            Driver.medical_expiry <= deadline,
-            Driver.medical_expiry >= today,
-        ).all()
 
-        return {"expiring_licenses": len(expiring_licenses), "expiring_medicals": len(expiring_medicals)}
-    finally:
-        db.close()
+async def _expire_overdue_contracts(db: AsyncSession) -> dict:
+    today = date.today()
+    expired = 0
+    while True:
+        batch = (
+            select(Contract.id)
+            .where(Contract.status == ContractStatus.ACTIVE, Contract.end_date < today)
+            .limit(EXPIRE_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        rows = (
+            await db.execute(
+                update(Contract)
+                .where(Contract.id.in_(batch))
+                .values(status=ContractStatus.EXPIRED)
+                .returning(Contract.id)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        if rows:
+            await db.execute(
+                insert(AuditLog),
+                [
+                    {
+                        "user_id": None,
+                        "action": AuditAction.UPDATE,
+                        "entity_type": "contract",
+                        "entity_id": row.id,
+                        "changes": {
+                            "status": {"old": ContractStatus.ACTIVE.value, "new": ContractStatus.EXPIRED.value}
+                        },
+                    }
+                    for row in rows
+                ],
+            )
+        await db.commit()
+        expired += len(rows)
+        if len(rows) < EXPIRE_BATCH_SIZE:
+            break
+    return {"expired": expired}
 
 
 @celery_app.task
+@exactly_once(DAILY)
 def expire_overdue_contracts():
-    """Auto-expire contracts past their end date."""
-    db = get_sync_db()
-    try:
-        today = date.today()
-        overdue = db.query(Contract).filter(
-            Contract.status == ContractStatus.ACTIVE,
-            Contract.end_date < today,
-        ).all()
-        for contract in overdue:
-            contract.status = ContractStatus.EXPIRED
-        db.commit()
-        return {"expired": len(overdue)}
-    finally:
-        db.close()
+    """Auto-expire contracts past their end date, in chunks, with an audit entry per contract."""
+    return run_async(_expire_overdue_contracts)
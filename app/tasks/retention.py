@@ -0,0 +1,115 @@
+"""Retention for the notifications and task_runs tables.
+
+Read notifications older than ``NOTIFICATION_RETENTION_DAYS`` are moved to
+``notifications_archive`` and archived rows are purged after
+``NOTIFICATION_ARCHIVE_RETENTION_DAYS``. ``task_runs`` ledger rows started more
+than ``TASK_RUN_RETENTION_DAYS`` ago are deleted; their schedule slots are long
+past, so ``exactly_once`` never looks them up again. Every step runs in small
+batches, each in its own short transaction with a pause in between, so the job
+never holds long locks on the hot table.
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.notification import Notification, NotificationArchive
+from app.models.task_run import TaskRun
+from app.tasks.celery_app import celery_app
+from app.tasks.ledger import exactly_once
+from app.tasks.runtime import run_async
+
+ARCHIVED_COLUMNS = ("id", "user_id", "title", "message", "type", "entity_type", "entity_id", "created_at")
+
+
+def _archive_batch_stmt(cutoff: datetime, batch_size: int):
+    """DELETE ... RETURNING a batch of read notifications and INSERT them into the archive."""
+    batch = (
+        select(Notification.id)
+        .where(Notification.is_read, Notification.created_at < cutoff)
+        .order_by(Notification.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("batch")
+    )
+    moved = (
+        delete(Notification)
+        .where(Notification.id.in_(select(batch.c.id)))
+        .returning(*(getattr(Notification, c) for c in ARCHIVED_COLUMNS))
+        .cte("moved")
+    )
+    return (
+        insert(NotificationArchive)
+        .from_select(list(ARCHIVED_COLUMNS), select(*(moved.c[c] for c in ARCHIVED_COLUMNS)))
+        .returning(NotificationArchive.id)
+    )
+
+
+def _purge_batch_stmt(cutoff: datetime, batch_size: int):
+    batch = (
+        select(NotificationArchive.id)
+        .where(NotificationArchive.archived_at < cutoff)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return delete(NotificationArchive).where(NotificationArchive.id.in_(batch))
+
+
+def _task_run_batch_stmt(cutoff: datetime, batch_size: int):
+    batch = (
+        select(TaskRun.id)
+        .where(TaskRun.started_at < cutoff)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return delete(TaskRun).where(TaskRun.id.in_(batch))
+
+
+async def _run_batches(db: AsyncSession, make_stmt, count_rows) -> int:
+    total = 0
+    for _ in range(settings.NOTIFICATION_RETENTION_MAX_BATCHES):
+        result = await db.execute(make_stmt())
+        affected = count_rows(result)
+        await db.commit()
+        total += affected
+        if affected < settings.NOTIFICATION_RETENTION_BATCH_SIZE:
+            break
+        await asyncio.sleep(settings.NOTIFICATION_RETENTION_PAUSE_SECONDS)
+    return total
+
+
+async def _apply_retention(db: AsyncSession) -> dict:
+    now = datetime.now(UTC)
+    batch_size = settings.NOTIFICATION_RETENTION_BATCH_SIZE
+    archive_cutoff = now - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    purge_cutoff = now - timedelta(days=settings.NOTIFICATION_ARCHIVE_RETENTION_DAYS)
+    task_run_cutoff = now - timedelta(days=settings.TASK_RUN_RETENTION_DAYS)
+
+    archived = await _run_batches(
+        db,
+        lambda: _archive_batch_stmt(archive_cutoff, batch_size),
+        lambda result: len(result.all()),
+    )
+    purged = await _run_batches(
+        db,
+        lambda: _purge_batch_stmt(purge_cutoff, batch_size),
+        lambda result: result.rowcount,
+    )
+    task_runs = await _run_batches(
+        db,
+        lambda: _task_run_batch_stmt(task_run_cutoff, batch_size),
+        lambda result: result.rowcount,
+    )
+    return {"archived": archived, "purged": purged, "task_runs_purged": task_runs}
+
+
+@celery_app.task
+@exactly_once(timedelta(days=1), lock_timeout=timedelta(hours=3))
+def archive_read_notifications():
+    """Move old read notifications to the archive, age out the archive and old task_runs rows."""
+    return run_async(_apply_retention)
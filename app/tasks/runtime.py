@@ -0,0 +1,64 @@
+"""Worker-local asyncio runtime for Celery tasks.
+
+asyncpg connections are bound to the event loop that opened them, so each
+worker process gets its own loop and async engine, created lazily on first
+use (after the prefork fork) and disposed when the process shuts down. Tasks
+call ``run_async(fn, *args)`` where ``fn`` is ``async def fn(db, *args)``,
+which lets them reuse the same services and repositories as the web app.
+
+Requires the prefork or solo worker pool; thread-based pools would share one
+loop between threads.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from celery.signals import worker_process_shutdown
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import engine_options
+
+_loop: asyncio.AbstractEventLoop | None = None
+_engine: AsyncEngine | None = None
+_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def _runtime() -> tuple[asyncio.AbstractEventLoop, async_sessionmaker[AsyncSession]]:
+    global _loop, _engine, _sessionmaker
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        _engine = create_async_engine(
+            settings.DATABASE_URL,
+            **engine_options(settings.CELERY_DB_POOL_SIZE, max_overflow=0),
+        )
+        _sessionmaker = async_sessionmaker(_engine, class_=AsyncSession, expire_on_commit=False)
+    return _loop, _sessionmaker
+
+
+def run_async[T](fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(db, *args, **kwargs)`` on the worker loop; commit on success, roll back on error."""
+    loop, sessionmaker = _runtime()
+
+    async def call() -> T:
+        async with sessionmaker() as session:
+            try:
+                result = await fn(session, *args, **kwargs)
+                await session.commit()
+                return result
+            except Exception:
+                await session.rollback()
+                raise
+
+    return loop.run_until_complete(call())
+
+
+@worker_process_shutdown.connect
+def _dispose_runtime(**kwargs):
+    global _loop, _engine
+    if _loop is not None and not _loop.is_closed():
+        if _engine is not None:
+            _loop.run_until_complete(_engine.dispose())
+        _loop.close()
+    _loop = _engine = None
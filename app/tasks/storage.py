@@ -0,0 +1,167 @@
+"""Reconciliation of the document bucket against the database.
+
+Objects can outlive their rows (S3 deletes are not transactional, entities are
+deleted without their documents) and rows can outlive their objects. The
+nightly ``reconcile_document_storage`` job:
+
+1. Deletes documents whose vehicle/driver/... no longer exists and resyncs
+   blob reference counts for them.
+2. Streams the bucket listing and every key referenced by ``documents`` /
+   ``document_blobs``, both in byte order, and merge-joins them. Neither side
+   is ever loaded fully into memory.
+3. Deletes unreferenced objects older than ``STORAGE_GC_GRACE_HOURS`` and
+   reports referenced keys whose object is missing (dangling rows).
+"""
+
+import logging
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, exists, func, select, union, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.contract import Contract
+from app.models.document import Document, DocumentBlob, EntityType
+from app.models.driver import Driver
+from app.models.expense import Expense
+from app.models.maintenance import MaintenanceRecord
+from app.models.vehicle import Vehicle
+from app.tasks.celery_app import celery_app
+from app.tasks.ledger import exactly_once
+from app.tasks.runtime import run_async
+from app.utils.s3 import get_s3_client
+
+logger = logging.getLogger(__name__)
+
+ENTITY_MODELS = {
+    EntityType.VEHICLE: Vehicle,
+    EntityType.DRIVER: Driver,
+    EntityType.MAINTENANCE: MaintenanceRecord,
+    EntityType.CONTRACT: Contract,
+    EntityType.EXPENSE: Expense,
+}
+
+GC_CHUNK_SIZE = 1000
+DANGLING_SAMPLE_SIZE = 100
+
+ORPHAN = "orphan"
+DANGLING = "dangling"
+
+
+async def merge_diff(
+    objects: AsyncIterator[tuple[str, datetime]], referenced: AsyncIterator[str]
+) -> AsyncIterator[tuple[str, str, datetime | None]]:
+    """Merge-join two key-sorted streams.
+
+    Yields (ORPHAN, key, last_modified) for objects nobody references and
+    (DANGLING, key, None) for references without an object.
+    """
+    obj = await anext(objects, None)
+    ref = await anext(referenced, None)
+    while obj is not None or ref is not None:
+        if ref is None or (obj is not None and obj[0] < ref):
+            yield ORPHAN, obj[0], obj[1]
+            obj = await anext(objects, None)
+        elif obj is None or ref < obj[0]:
+            yield DANGLING, ref, None
+            ref = await anext(referenced, None)
+        else:
+            obj = await anext(objects, None)
+            ref = await anext(referenced, None)
+
+
+async def _referenced_keys(db: AsyncSession) -> AsyncIterator[str]:
+    """Every key the database points at, deduplicated, in byte order (COLLATE "C" matches S3 listing order)."""
+    keys = union(
+        select(Document.s3_key.label("key")),
+        select(Document.thumbnail_key).where(Document.thumbnail_key.is_not(None)),
+        select(Document.preview_key).where(Document.preview_key.is_not(None)),
+        select(DocumentBlob.s3_key),
+    ).subquery()
+    stmt = select(keys.c.key).order_by(keys.c.key.collate("C")).execution_options(yield_per=GC_CHUNK_SIZE)
+    async for key in await db.stream_scalars(stmt):
+        yield key
+
+
+async def _purge_detached_documents(db: AsyncSession) -> int:
+    """Delete documents whose entity was deleted and resync reference counts of their blobs."""
+    keys: list[str] = []
+    for entity_type, model in ENTITY_MODELS.items():
+        result = await db.execute(
+            delete(Document)
+            .where(Document.entity_type == entity_type, ~exists().where(model.id == Document.entity_id))
+            .returning(Document.s3_key)
+        )
+        keys.extend(result.scalars())
+
+    for start in range(0, len(keys), GC_CHUNK_SIZE):
+        chunk = list(set(keys[start:start + GC_CHUNK_SIZE]))
+        await db.execute(
+            update(DocumentBlob)
+            .where(DocumentBlob.s3_key.in_(chunk))
+            .values(
+                ref_count=select(func.count())
+                .where(Document.s3_key == DocumentBlob.s3_key)
+                .scalar_subquery()
+            )
+        )
+        await db.execute(delete(DocumentBlob).where(DocumentBlob.s3_key.in_(chunk), DocumentBlob.ref_count == 0))
+    return len(keys)
+
+
+async def _reconcile(db: AsyncSession, grace: timedelta, dry_run: bool) -> dict:
+    if not dry_run and not await db.scalar(select(exists().where(Document.id.is_not(None)))):
+        # An empty (or wrongly configured) database would make every object look orphaned
+        logger.warning("No documents in the database; running storage reconciliation as a dry run")
+        dry_run = True
+
+    s3 = get_s3_client()
+    cutoff = datetime.now(UTC) - grace
+    stats = {"dry_run": dry_run, "orphans_deleted": 0, "orphans_in_grace": 0, "dangling": 0, "dangling_sample": []}
+    pending: list[str] = []
+
+    async for kind, key, last_modified in merge_diff(s3.iter_objects_async(), _referenced_keys(db)):
+        if kind == DANGLING:
+            stats["dangling"] += 1
+            if len(stats["dangling_sample"]) < DANGLING_SAMPLE_SIZE:
+                stats["dangling_sample"].append(key)
+        elif last_modified >= cutoff:
+            stats["orphans_in_grace"] += 1
+        else:
+            pending.append(key)
+            if len(pending) >= GC_CHUNK_SIZE:
+                if not dry_run:
+                    await s3.delete_files_async(pending)
+                stats["orphans_deleted"] += len(pending)
+                pending = []
+    if pending:
+        if not dry_run:
+            await s3.delete_files_async(pending)
+        stats["orphans_deleted"] += len(pending)
+
+    if stats["dangling"]:
+        logger.warning(
+            "%d document keys have no S3 object, e.g. %s", stats["dangling"], stats["dangling_sample"][:5]
+        )
+    return stats
+
+
+def _run(dry_run: bool) -> dict:
+    detached = 0 if dry_run else run_async(_purge_detached_documents)
+    stats = run_async(_reconcile, timedelta(hours=settings.STORAGE_GC_GRACE_HOURS), dry_run)
+    logger.info("Storage reconciliation: %d detached documents, %s", detached, stats)
+    return {"detached_documents": detached, **stats}
+
+
+@celery_app.task
+@exactly_once(timedelta(days=1), lock_timeout=timedelta(hours=6))
+def reconcile_document_storage():
+    """Purge detached documents, delete orphaned objects and report dangling rows."""
+    return _run(dry_run=False)
+
+
+@celery_app.task
+def report_document_storage():
+    """Same diff as the nightly job, without deleting anything (does not use the run ledger)."""
+    return _run(dry_run=True)
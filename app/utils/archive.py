@@ -0,0 +1,73 @@
+"""Zip archives streamed chunk by chunk, without temp files."""
+
+import io
+import zipfile
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
+from typing import NamedTuple
+
+
+class ZipEntry(NamedTuple):
+    name: str
+    chunks: AsyncIterator[bytes]
+    modified: datetime | None = None
+    compress: bool = True
+
+
+class _Sink(io.RawIOBase):
+    """Write-only, non-seekable buffer that zipfile writes into and we drain after each chunk.
+
+    Being non-seekable makes zipfile write sizes and CRCs in data descriptors
+    after each member instead of seeking back to patch the local header.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _unique_name(name: str, seen: set[str]) -> str:
+    """Rename duplicates ``a.pdf`` -> ``a (2).pdf`` so no member is shadowed."""
+    candidate, n = name, 1
+    stem, dot, ext = name.rpartition(".")
+    if not dot:
+        stem, ext = name, ""
+    while candidate in seen:
+        n += 1
+        candidate = f"{stem} ({n}).{ext}" if ext else f"{stem} ({n})"
+    seen.add(candidate)
+    return candidate
+
+
+async def stream_zip(entries: Iterable[ZipEntry]) -> AsyncIterator[bytes]:
+    """Yield a zip archive of ``entries``; memory use is bounded by one source chunk."""
+    sink = _Sink()
+    seen: set[str] = set()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for entry in entries:
+            info = zipfile.ZipInfo(_unique_name(entry.name.replace("/", "_"), seen))
+            if entry.modified is not None:
+                info.date_time = entry.modified.timetuple()[:6]
+            info.compress_type = zipfile.ZIP_DEFLATED if entry.compress else zipfile.ZIP_STORED
+            with archive.open(info, mode="w") as member:
+                async for chunk in entry.chunks:
+                    member.write(chunk)
+                    if data := sink.drain():
+                        yield data
+            if data := sink.drain():
+                yield data
+    # Central directory, written when the archive is closed
+    if data := sink.drain():
+        yield data
@@ -11,14 +11,27 @@ logger = logging.getLogger(__name__)
 
 
 class EmailSender:
-    """SMTP email sender."""
-
-    def __init__(self):
-        self.host = settings.SMTP_HOST
-        self.port = settings.SMTP_PORT
-        self.username = settings.SMTP_USER
-        self.password = settings.SMTP_PASSWORD
-        self.from_email = settings.SMTP_FROM or settings.SMTP_USER
+    """SMTP email sender. Settings are read on each send, so rotated credentials apply."""
+
+    @property
+    def host(self) -> str:
+        return settings.SMTP_HOST
+
+    @property
+    def port(self) -> int:
+        return settings.SMTP_PORT
+
+    @property
+    def username(self) -> str:
+        return settings.SMTP_USER
+
+    @property
+    def password(self) -> str:
+        return settings.SMTP_PASSWORD
+
+    @property
+    def from_email(self) -> str:
+        return settings.SMTP_FROM or settings.SMTP_USER
 
     def send(self, to: str, subject: str, body_html: str) -> bool:
         """Send an email. Returns True on success."""
@@ -3,15 +3,15 @@
 import io
 from datetime import date, datetime
 
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill
-from openpyxl.utils import get_column_letter
-
 
 class ExcelExporter:
     """Generate Excel (.xlsx) files from tabular data."""
 
     def __init__(self, title: str = "Report"):
+        # openpyxl takes ~150 ms to import; load it with the first export, not at startup
+        from openpyxl import Workbook
+        from openpyxl.styles import Alignment, Font, PatternFill
+
         self.wb = Workbook()
         self.ws = self.wb.active
         self.ws.title = title
@@ -19,13 +19,16 @@ class ExcelExporter:
         self._header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
         self._header_font = Font(bold=True, color="FFFFFF", size=11)
         self._title_font = Font(bold=True, size=14)
+        self._subtitle_font = Font(italic=True, color="666666")
+        self._bold_font = Font(bold=True)
+        self._centered = Alignment(horizontal="center")
 
     def add_title(self, title: str, subtitle: str | None = None):
         """Add a title row at the top."""
         self.ws.cell(row=self._row, column=1, value=title).font = self._title_font
         self._row += 1
         if subtitle:
-            self.ws.cell(row=self._row, column=1, value=subtitle).font = Font(italic=True, color="666666")
+            self.ws.cell(row=self._row, column=1, value=subtitle).font = self._subtitle_font
             self._row += 1
         self._row += 1
 
@@ -35,7 +38,7 @@ class ExcelExporter:
             cell = self.ws.cell(row=self._row, column=col, value=header)
             cell.fill = self._header_fill
             cell.font = self._header_font
-            cell.alignment = Alignment(horizontal="center")
+            cell.alignment = self._centered
         self._row += 1
 
     def add_row(self, values: list):
@@ -57,13 +60,15 @@ class ExcelExporter:
         """Add a bold summary row."""
         for col, value in enumerate(values, 1):
             cell = self.ws.cell(row=self._row, column=col, value=value)
-            cell.font = Font(bold=True)
+            cell.font = self._bold_font
             if isinstance(value, (int, float)):
                 cell.number_format = "#,##0.00"
         self._row += 1
 
     def auto_width(self):
         """Auto-adjust column widths."""
+        from openpyxl.utils import get_column_letter
+
         for col in range(1, self.ws.max_column + 1):
             max_length = 0
             column_letter = get_column_letter(col)
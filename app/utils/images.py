@@ -0,0 +1,47 @@
+"""WebP thumbnails and previews for uploaded images."""
+
+from io import BytesIO
+
+IMAGE_MIME_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+
+# Variant name -> longest edge in pixels
+DERIVATIVE_SIZES = {
+    "thumbnail": 320,
+    "preview": 1280,
+}
+WEBP_QUALITY = 80
+
+# Refuse to decode anything larger (decompression bombs); ~100 MP covers any phone camera
+MAX_IMAGE_PIXELS = 100_000_000
+
+
+def derived_key(s3_key: str, variant: str) -> str:
+    """``vehicle/<id>/<hex>.jpg`` -> ``derived/<variant>/vehicle/<id>/<hex>.webp``."""
+    stem = s3_key.rsplit(".", 1)[0] if "." in s3_key.rsplit("/", 1)[-1] else s3_key
+    return f"derived/{variant}/{stem}.webp"
+
+
+def render_derivatives(data: bytes) -> dict[str, bytes]:
+    """Decode an image once and render every variant in ``DERIVATIVE_SIZES`` as WebP.
+
+    Raises ``PIL.UnidentifiedImageError`` / ``OSError`` for unreadable files.
+    """
+    # Pillow is imported on first use so processes that never render don't load it
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    largest = max(DERIVATIVE_SIZES.values())
+    with Image.open(BytesIO(data)) as image:
+        # JPEG can decode at 1/2, 1/4 or 1/8 scale, which is much faster for phone photos
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+        rendered = {}
+        for variant, size in sorted(DERIVATIVE_SIZES.items(), key=lambda item: -item[1]):
+            # Downscale from the previous (larger) variant instead of the original
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            out = BytesIO()
+            image.save(out, "WEBP", quality=WEBP_QUALITY, method=4)
+            rendered[variant] = out.getvalue()
+    return rendered
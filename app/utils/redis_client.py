@@ -0,0 +1,20 @@
+"""Shared Redis connections (one pool per process)."""
+
+from functools import lru_cache
+
+import redis
+import redis.asyncio
+
+from app.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> redis.Redis:
+    """Return the process-wide synchronous Redis client."""
+    return redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+
+@lru_cache(maxsize=1)
+def get_async_redis() -> redis.asyncio.Redis:
+    """Return the process-wide asyncio Redis client, for use on the web app's event loop."""
+    return redis.asyncio.Redis.from_url(settings.REDIS_URL, decode_responses=True)
@@ -1,8 +1,14 @@
-import uuid
-from io import BytesIO
-
-import boto3
-from botocore.client import Config
+import asyncio
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import BinaryIO
 
 from app.config import settings
 
@@ -14,18 +20,124 @@ ALLOWED_MIME_TYPES = {
     "application/msword",
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
 }
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+_READ_CHUNK = 1024 * 1024
+
+
+# Read from settings on each call, not at import, so importing this module does not load Settings
+def max_file_size() -> int:
+    return settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+
+
+def multipart_part_size() -> int:
+    # S3 requires multipart parts of at least 5 MB (except the last one)
+    return max(5, settings.S3_MULTIPART_PART_SIZE_MB) * 1024 * 1024
+
+
+def _read_up_to(fileobj: BinaryIO, limit: int) -> bytes:
+    """Read at most ``limit`` bytes, in 1 MB reads, stopping early only at EOF."""
+    buffer = bytearray()
+    while len(buffer) < limit:
+        chunk = fileobj.read(min(_READ_CHUNK, limit - len(buffer)))
+        if not chunk:
+            break
+        buffer += chunk
+    return bytes(buffer)
+
+
+def file_too_large_error(max_size: int) -> ValueError:
+    return ValueError(f"File too large (max {max_size // (1024 * 1024)} MB)")
+
+
+def hash_stream(fileobj: BinaryIO, max_size: int | None = None) -> tuple[str, int]:
+    """Return (sha256 hex digest, size) of a seekable file object and rewind it.
+
+    Reads in 1 MB chunks and stops as soon as ``max_size`` (default: the
+    upload limit) is exceeded.
+    """
+    if max_size is None:
+        max_size = max_file_size()
+    digest = hashlib.sha256()
+    size = 0
+    fileobj.seek(0)
+    while chunk := fileobj.read(_READ_CHUNK):
+        size += len(chunk)
+        if size > max_size:
+            raise file_too_large_error(max_size)
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
+def content_key(sha256: str, filename: str) -> str:
+    """Content-addressed key: ``blobs/<2 hex>/<sha256>.<ext>``."""
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return f"blobs/{sha256[:2]}/{sha256}.{ext}" if ext else f"blobs/{sha256[:2]}/{sha256}"
+
+
+class PresignedURLCache:
+    """Thread-safe LRU of presigned URLs, reused for most of their lifetime.
+
+    Presigning is a local HMAC, but a gallery signs dozens of keys per view;
+    caching also keeps URLs stable so browsers can reuse cached images.
+    """
+
+    def __init__(self, maxsize: int = 10_000, reuse_fraction: float = 0.8):
+        self.maxsize = maxsize
+        self.reuse_fraction = reuse_fraction
+        self._entries: OrderedDict[tuple[str, int], tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, s3_key: str, expires: int) -> str | None:
+        with self._lock:
+            entry = self._entries.get((s3_key, expires))
+            if entry is None:
+                return None
+            valid_until, url = entry
+            if valid_until <= time.monotonic():
+                del self._entries[(s3_key, expires)]
+                return None
+            self._entries.move_to_end((s3_key, expires))
+            return url
+
+    def put(self, s3_key: str, expires: int, url: str) -> None:
+        with self._lock:
+            self._entries[(s3_key, expires)] = (time.monotonic() + expires * self.reuse_fraction, url)
+            self._entries.move_to_end((s3_key, expires))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, s3_key: str) -> None:
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == s3_key]:
+                del self._entries[cache_key]
+
+
+presigned_url_cache = PresignedURLCache()
 
 
 class S3Client:
     def __init__(self):
+        # boto3 is imported with the first client so processes that never touch S3 skip it
+        import boto3
+        from botocore.client import Config
+
         scheme = "https" if settings.MINIO_USE_SSL else "http"
-        self.client = boto3.client(
+        # boto3 clients are thread-safe, the default session is not:
+        # build both clients from a private session.
+        session = boto3.session.Session()
+        self.client = session.client(
             "s3",
             endpoint_url=f"{scheme}://{settings.MINIO_ENDPOINT}",
             aws_access_key_id=settings.MINIO_ACCESS_KEY,
             aws_secret_access_key=settings.MINIO_SECRET_KEY,
-            config=Config(signature_version="s3v4"),
+            config=Config(
+                signature_version="s3v4",
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                connect_timeout=settings.S3_CONNECT_TIMEOUT,
+                read_timeout=settings.S3_READ_TIMEOUT,
+                retries={"max_attempts": 3, "mode": "standard"},
+                tcp_keepalive=True,
+            ),
             region_name="us-east-1",
         )
         self.bucket = settings.MINIO_BUCKET
@@ -34,7 +146,7 @@ class S3Client:
         # Uses external endpoint (e.g. localhost:9000) so URLs are
         # accessible from outside Docker.
         ext = settings.MINIO_EXTERNAL_ENDPOINT or settings.MINIO_ENDPOINT
-        self._presign_client = boto3.client(
+        self._presign_client = session.client(
             "s3",
             endpoint_url=f"{scheme}://{ext}",
             aws_access_key_id=settings.MINIO_ACCESS_KEY,
@@ -49,29 +161,176 @@ class S3Client:
         except Exception:
             self.client.create_bucket(Bucket=self.bucket)
 
-    def upload_file(self, file_data: bytes, filename: str, mime_type: str, folder: str = "uploads") -> str:
-        ext = filename.rsplit(".", 1)[-1] if "." in filename else ""
-        s3_key = f"{folder}/{uuid.uuid4().hex}.{ext}" if ext else f"{folder}/{uuid.uuid4().hex}"
-        self.client.upload_fileobj(
-            BytesIO(file_data),
-            self.bucket,
-            s3_key,
-            ExtraArgs={"ContentType": mime_type},
-        )
-        return s3_key
+    def upload_stream(
+        self,
+        fileobj: BinaryIO,
+        s3_key: str,
+        mime_type: str,
+        max_size: int | None = None,
+    ) -> int:
+        """Stream a file object to ``s3_key`` and return its size.
+
+        At most one part is buffered at a time. Files smaller than a part go
+        up as a single PUT, larger ones as a multipart upload. The size is
+        checked while reading: exceeding ``max_size`` (default: the upload
+        limit) aborts the upload and raises ValueError.
+        """
+        if max_size is None:
+            max_size = max_file_size()
+        part_size = multipart_part_size()
+        part = _read_up_to(fileobj, min(part_size, max_size + 1))
+        if len(part) > max_size:
+            raise file_too_large_error(max_size)
+        if len(part) < part_size:
+            self.client.put_object(Bucket=self.bucket, Key=s3_key, Body=part, ContentType=mime_type)
+            return len(part)
+
+        upload_id = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=s3_key, ContentType=mime_type
+        )["UploadId"]
+        parts = []
+        size = 0
+        try:
+            while part:
+                size += len(part)
+                if size > max_size:
+                    raise file_too_large_error(max_size)
+                response = self.client.upload_part(
+                    Bucket=self.bucket,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    PartNumber=len(parts) + 1,
+                    Body=part,
+                )
+                parts.append({"ETag": response["ETag"], "PartNumber": len(parts) + 1})
+                part = _read_up_to(fileobj, min(part_size, max_size - size + 1))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=s3_key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except Exception:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=s3_key, UploadId=upload_id)
+            raise
+        return size
+
+    def put_bytes(self, s3_key: str, data: bytes, mime_type: str) -> None:
+        """Write a small object at a known key (e.g. a derived thumbnail)."""
+        self.client.put_object(Bucket=self.bucket, Key=s3_key, Body=data, ContentType=mime_type)
+
+    def download_bytes(self, s3_key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=s3_key)["Body"].read()
 
     def get_presigned_url(self, s3_key: str, expires: int = 3600) -> str:
-        return self._presign_client.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": self.bucket, "Key": s3_key},
-            ExpiresIn=expires,
-        )
+        url = presigned_url_cache.get(s3_key, expires)
+        if url is None:
+            url = self._presign_client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": self.bucket, "Key": s3_key},
+                ExpiresIn=expires,
+            )
+            presigned_url_cache.put(s3_key, expires, url)
+        return url
+
+    def get_presigned_urls(self, s3_keys: list[str], expires: int = 3600) -> dict[str, str]:
+        """Presign many keys in one pass (no network I/O)."""
+        return {key: self.get_presigned_url(key, expires) for key in dict.fromkeys(s3_keys)}
 
     def delete_file(self, s3_key: str):
         self.client.delete_object(Bucket=self.bucket, Key=s3_key)
+        presigned_url_cache.discard(s3_key)
+
+    def delete_files(self, s3_keys: list[str]):
+        """Delete several keys with one DeleteObjects request per 1000 keys."""
+        for start in range(0, len(s3_keys), 1000):
+            batch = s3_keys[start:start + 1000]
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+        for key in s3_keys:
+            presigned_url_cache.discard(key)
+
+    # Async variants: run the blocking boto3 call on the bounded S3 executor
+    # so transfers never stall the event loop.
+
+    async def upload_stream_async(
+        self, fileobj: BinaryIO, s3_key: str, mime_type: str, max_size: int | None = None
+    ) -> int:
+        return await run_s3(self.upload_stream, fileobj, s3_key, mime_type, max_size=max_size)
+
+    async def iter_objects_async(self, page_size: int = 1000) -> AsyncIterator[tuple[str, datetime]]:
+        """Yield (key, last_modified) for every object in the bucket, in key (UTF-8 byte) order, a page at a time."""
+        kwargs = {"Bucket": self.bucket, "MaxKeys": page_size}
+        while True:
+            page = await run_s3(self.client.list_objects_v2, **kwargs)
+            for obj in page.get("Contents", []):
+                yield obj["Key"], obj["LastModified"]
+            if not page.get("IsTruncated"):
+                return
+            kwargs["ContinuationToken"] = page["NextContinuationToken"]
+
+    async def iter_object_async(self, s3_key: str, chunk_size: int = _READ_CHUNK) -> AsyncIterator[bytes]:
+        """Stream an object's body in chunks, each read on the S3 executor."""
+        body = (await run_s3(self.client.get_object, Bucket=self.bucket, Key=s3_key))["Body"]
+        try:
+            while chunk := await run_s3(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def delete_files_async(self, s3_keys: list[str]):
+        await run_s3(self.delete_files, s3_keys)
+
+
+_client: S3Client | None = None
+_client_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Bounds concurrent S3 transfers per process; excess calls queue here
+                # instead of exhausting the connection pool or Starlette's threadpool.
+                _executor = ThreadPoolExecutor(max_workers=settings.S3_MAX_CONCURRENCY, thread_name_prefix="s3")
+    return _executor
+
+
+async def run_s3(fn, *args, **kwargs):
+    """Run a blocking S3 call on the S3 executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
 
 
 def get_s3_client() -> S3Client:
-    client = S3Client()
-    client.ensure_bucket()
-    return client
+    """Return the process-wide S3 client, creating it and checking the bucket on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                client = S3Client()
+                client.ensure_bucket()
+                _client = client
+    return _client
+
+
+async def get_s3_client_async() -> S3Client:
+    """Async-safe ``get_s3_client``: the first-use bucket check runs off the event loop."""
+    if _client is not None:
+        return _client
+    return await run_s3(get_s3_client)
+
+
+def _reset_after_fork() -> None:
+    # Pooled connections and executor threads must not be shared with a
+    # forked child (Celery prefork)
+    global _client, _client_lock, _executor, _executor_lock
+    _client = None
+    _client_lock = threading.Lock()
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
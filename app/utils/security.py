@@ -1,3 +1,7 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
@@ -17,13 +21,53 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_access_token(user_id: UUID, role: str) -> str:
-    expire = datetime.now(UTC) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+# bcrypt releases the GIL, so a few threads keep hashing (~250 ms of CPU each)
+# off the event loop; a burst of logins queues here instead of stalling requests.
+_hash_executor: ThreadPoolExecutor | None = None
+_hash_executor_lock = threading.Lock()
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_CONCURRENCY, thread_name_prefix="bcrypt"
+                )
+    return _hash_executor
+
+
+async def hash_password_async(password: str) -> str:
+    """``hash_password`` on the bounded hashing pool, for async code."""
+    return await asyncio.get_running_loop().run_in_executor(_get_hash_executor(), hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """``verify_password`` on the bounded hashing pool, for async code."""
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_hash_executor(), verify_password, plain_password, hashed_password
+    )
+
+
+def _reset_after_fork() -> None:
+    global _hash_executor, _hash_executor_lock
+    _hash_executor = None
+    _hash_executor_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def create_access_token(user_id: UUID, role: str, department: str | None = None) -> str:
+    now = datetime.now(UTC)
     payload = {
         "sub": str(user_id),
         "role": role,
+        "dept": department,
         "type": "access",
-        "exp": expire,
+        "iat": now,
+        "exp": now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     }
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
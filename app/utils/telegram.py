@@ -10,11 +10,12 @@ logger = logging.getLogger(__name__)
 
 
 class TelegramBot:
-    """Send messages via Telegram Bot API."""
+    """Send messages via Telegram Bot API. The token is read on each send, so a rotated token applies."""
 
-    def __init__(self):
-        self.token = settings.TELEGRAM_BOT_TOKEN
-        self.base_url = f"https://api.telegram.org/bot{self.token}" if self.token else None
+    @property
+    def base_url(self) -> str | None:
+        token = settings.TELEGRAM_BOT_TOKEN
+        return f"https://api.telegram.org/bot{token}" if token else None
 
     def send_message(self, chat_id: str, text: str, parse_mode: str = "HTML") -> bool:
         """Send a message to a chat. Returns True on success."""
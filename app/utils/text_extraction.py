@@ -0,0 +1,89 @@
+"""Plain-text extraction from uploaded documents for full-text search.
+
+PDFs are read with pypdf (text layer only). Images are OCR'd with Tesseract
+when both ``pytesseract`` (``pip install .[ocr]``) and the ``tesseract``
+binary are installed; otherwise images are left for a later run.
+"""
+
+import logging
+import shutil
+from functools import lru_cache
+from io import BytesIO
+
+from app.utils.images import IMAGE_MIME_TYPES, MAX_IMAGE_PIXELS
+
+logger = logging.getLogger(__name__)
+
+# Bound work per document; a tsvector is limited to 1 MB anyway
+MAX_PDF_PAGES = 200
+# What pypdf lets escape on malformed files besides its own PyPdfError
+_PDF_PARSE_ERRORS = (KeyError, IndexError, TypeError, AttributeError, AssertionError, ValueError, RecursionError)
+MAX_TEXT_CHARS = 200_000
+OCR_LANGUAGES = "eng+rus"
+
+
+@lru_cache(maxsize=1)
+def ocr_available() -> bool:
+    try:
+        import pytesseract  # noqa: F401
+    except ImportError:
+        logger.info("pytesseract not installed, image OCR disabled")
+        return False
+    if shutil.which("tesseract") is None:
+        logger.info("tesseract binary not found, image OCR disabled")
+        return False
+    return True
+
+
+def can_extract(mime_type: str) -> bool:
+    """Whether ``extract_text`` can currently handle this type."""
+    return mime_type == "application/pdf" or (mime_type in IMAGE_MIME_TYPES and ocr_available())
+
+
+def _pdf_text(data: bytes) -> str:
+    from pypdf import PdfReader
+    from pypdf.errors import PyPdfError
+
+    parts: list[str] = []
+    length = 0
+    try:
+        reader = PdfReader(BytesIO(data))
+        if reader.is_encrypted:
+            # Many PDFs only restrict editing: the user password is empty
+            reader.decrypt("")
+        for page in reader.pages[:MAX_PDF_PAGES]:
+            text = page.extract_text() or ""
+            parts.append(text)
+            length += len(text)
+            if length >= MAX_TEXT_CHARS:
+                break
+    except (PyPdfError, *_PDF_PARSE_ERRORS) as e:
+        raise ValueError(f"Cannot read application/pdf: {e!r}") from e
+    return "\n".join(parts)
+
+
+def _image_text(data: bytes) -> str:
+    import pytesseract
+    from PIL import Image
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    try:
+        with Image.open(BytesIO(data)) as image:
+            return pytesseract.image_to_string(image, lang=OCR_LANGUAGES)
+    except Image.DecompressionBombError as e:
+        raise ValueError(f"Cannot read image: {e}") from e
+
+
+def extract_text(data: bytes, mime_type: str) -> str:
+    """Return the document's text (possibly empty). Raises ValueError if the file cannot be parsed."""
+    try:
+        if mime_type == "application/pdf":
+            text = _pdf_text(data)
+        elif mime_type in IMAGE_MIME_TYPES and ocr_available():
+            text = _image_text(data)
+        else:
+            raise ValueError(f"No text extractor for {mime_type}")
+    except (OSError, RuntimeError) as e:  # RuntimeError: TesseractError
+        raise ValueError(f"Cannot read {mime_type}: {e}") from e
+    # NUL bytes are not allowed in Postgres text
+    return " ".join(text.replace("\x00", " ").split())[:MAX_TEXT_CHARS]
@@ -1,79 +1,304 @@
-"""HashiCorp Vault client wrapper for secrets management."""
+"""HashiCorp Vault secrets provider.
 
+``VaultSecretsProvider`` reads the app's KV v2 secret once per process and
+keeps it in memory. A daemon thread re-reads it every ``VAULT_CACHE_TTL``
+seconds, or after two thirds of the secret's lease when that is sooner,
+and calls its subscribers when values change (app/config.py rebuilds
+Settings). Failed reads are retried with backoff while the last known
+values stay in use.
+
+The latest values are also cached in a local file (``VAULT_CACHE_FILE``,
+by default in a 0700 directory on tmpfs), so processes starting on one
+host within the TTL skip Vault, and a process starting while Vault is down
+still gets the last known secrets. A cache file is only trusted when it is
+owned by the current user and not accessible to anyone else.
+
+Configured from environment variables only, since it runs before Settings
+exist: ``VAULT_ADDR``, ``VAULT_TOKEN``, ``VAULT_CACHE_TTL`` (default 300,
+``0`` disables caching and refresh), ``VAULT_CACHE_FILE``,
+``VAULT_MAX_STALE`` (oldest cache accepted while Vault is down, default
+one day) and ``VAULT_TIMEOUT``.
+"""
+
+import functools
+import hashlib
+import json
 import logging
 import os
+import stat
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_TTL = 300
+DEFAULT_TIMEOUT = 5.0
+STARTUP_ATTEMPTS = 3
+RETRY_BASE_SECONDS = 0.5
+MAX_RETRY_SECONDS = 60.0
+DEFAULT_MAX_STALE = 24 * 3600
+# Re-read leased secrets this far into the lease
+LEASE_REFRESH_FRACTION = 2 / 3
 
-def get_vault_client():
-    """Get configured Vault client, or None if not available."""
-    try:
-        import hvac
-    except ImportError:
-        logger.info("hvac not installed, Vault integration disabled")
-        return None
 
-    vault_addr = os.getenv("VAULT_ADDR", "")
-    vault_token = os.getenv("VAULT_TOKEN", "")
+@dataclass(frozen=True)
+class SecretsSnapshot:
+    secrets: dict[str, Any]
+    fetched_at: float  # wall clock, comparable across processes
+    lease_duration: int = 0  # seconds; 0 for unleased KV secrets
 
-    if not vault_addr or not vault_token:
-        logger.info("VAULT_ADDR/VAULT_TOKEN not set, Vault integration disabled")
-        return None
 
-    client = hvac.Client(url=vault_addr, token=vault_token)
+class VaultSecretsProvider:
+    def __init__(
+        self,
+        addr: str,
+        token: str,
+        path: str = "fleetcore",
+        mount_point: str = "secret",
+        ttl: float = DEFAULT_CACHE_TTL,
+        cache_file: str | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_stale: float = DEFAULT_MAX_STALE,
+    ):
+        self.addr = addr
+        self.token = token
+        self.path = path
+        self.mount_point = mount_point
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self.timeout = timeout
+        self.max_stale = max_stale
+        self._snapshot: SecretsSnapshot | None = None
+        self._subscribers: list[Callable[[dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._client = None
 
-    try:
-        if not client.is_authenticated():
-            logger.warning("Vault authentication failed")
+    @classmethod
+    def from_env(cls) -> "VaultSecretsProvider | None":
+        """Provider configured from ``VAULT_*`` variables, or None when Vault is not configured."""
+        addr = os.getenv("VAULT_ADDR", "")
+        token = os.getenv("VAULT_TOKEN", "")
+        if not addr or not token:
+            logger.info("VAULT_ADDR/VAULT_TOKEN not set, Vault integration disabled")
+            return None
+        ttl = float(os.getenv("VAULT_CACHE_TTL", DEFAULT_CACHE_TTL))
+        provider = cls(
+            addr,
+            token,
+            ttl=ttl,
+            timeout=float(os.getenv("VAULT_TIMEOUT", DEFAULT_TIMEOUT)),
+            max_stale=float(os.getenv("VAULT_MAX_STALE", DEFAULT_MAX_STALE)),
+        )
+        if ttl > 0:
+            provider.cache_file = os.getenv("VAULT_CACHE_FILE") or provider.default_cache_file()
+        return provider
+
+    def default_cache_file(self) -> str | None:
+        """Cache path in a per-user 0700 directory, or None when that directory is not safe to use."""
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        directory = os.path.join(base, f"fleetcore-vault-{os.getuid()}")
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            logger.warning("Vault cache disabled, cannot create %s: %s", directory, e)
+            return None
+        if not _is_private(os.lstat(directory), stat.S_ISDIR):
+            logger.warning("Vault cache disabled, %s is not a private directory of this user", directory)
             return None
-    except Exception as e:
-        logger.warning("Vault connection failed: %s", e)
-        return None
+        digest = hashlib.sha256(self.source.encode()).hexdigest()[:12]
+        return os.path.join(directory, f"{digest}.json")
 
-    return client
+    @property
+    def source(self) -> str:
+        return f"{self.addr}|{self.mount_point}/{self.path}"
 
+    def get(self) -> dict[str, Any]:
+        """Current secrets. The first call loads them and starts the background refresh."""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._initial_load()
+            self.start()
+        return self._snapshot.secrets
 
-def read_vault_secrets(
-    path: str = "fleetcore",
-    mount_point: str = "secret",
-) -> dict[str, Any]:
-    """Read secrets from Vault KV v2 engine.
+    def subscribe(self, callback: Callable[[dict[str, Any]], None]) -> None:
+        """Call ``callback(secrets)`` from the refresh thread whenever the values change."""
+        self._subscribers.append(callback)
 
-    Returns dict of key-value secrets, or empty dict on failure.
-    """
-    client = get_vault_client()
-    if not client:
-        return {}
+    def start(self) -> None:
+        if self.ttl <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vault-refresh", daemon=True)
+        self._thread.start()
 
-    try:
-        response = client.secrets.kv.v2.read_secret_version(
-            path=path,
-            mount_point=mount_point,
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def after_fork(self) -> None:
+        """Reset per-process state in a forked child; the refresh thread did not survive the fork."""
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._client = None  # its connection pool belongs to the parent
+        if self._snapshot is not None:
+            self.start()
+
+    # --- Loading ---
+
+    def _vault(self):
+        if self._client is None:
+            import hvac
+
+            self._client = hvac.Client(url=self.addr, token=self.token, timeout=self.timeout)
+        return self._client
+
+    def _fetch(self) -> SecretsSnapshot:
+        response = self._vault().secrets.kv.v2.read_secret_version(
+            path=self.path,
+            mount_point=self.mount_point,
+            raise_on_deleted_version=True,
+        )
+        snapshot = SecretsSnapshot(
+            secrets=response["data"]["data"],
+            fetched_at=time.time(),
+            lease_duration=int(response.get("lease_duration") or 0),
         )
-        secrets = response["data"]["data"]
-        logger.info("Loaded %d secrets from Vault (%s/%s)", len(secrets), mount_point, path)
-        return secrets
-    except Exception as e:
-        logger.warning("Failed to read Vault secrets: %s", e)
-        return {}
-
-
-def inject_vault_secrets_to_env() -> int:
-    """Load secrets from Vault and inject into environment variables.
-
-    Only sets env vars that are not already defined, preserving
-    explicit environment variable overrides.
-
-    Returns the number of secrets injected.
-    """
-    secrets = read_vault_secrets()
-    injected = 0
-    for key, value in secrets.items():
-        if key not in os.environ:
-            os.environ[key] = str(value)
-            injected += 1
-    if injected:
-        logger.info("Injected %d Vault secrets into environment", injected)
-    return injected
+        logger.info("Loaded %d secrets from Vault (%s/%s)", len(snapshot.secrets), self.mount_point, self.path)
+        self._write_cache(snapshot)
+        return snapshot
+
+    def _initial_load(self) -> SecretsSnapshot:
+        cached = self._read_cache()
+        if cached is not None and self.refresh_in(cached) > 0:
+            return cached
+        for attempt in range(STARTUP_ATTEMPTS):
+            try:
+                return self._fetch()
+            except Exception as e:
+                logger.warning("Failed to read Vault secrets (attempt %d/%d): %s", attempt + 1, STARTUP_ATTEMPTS, e)
+                if attempt + 1 < STARTUP_ATTEMPTS:
+                    time.sleep(RETRY_BASE_SECONDS * 2**attempt)
+        if cached is not None:
+            age = time.time() - cached.fetched_at
+            if age <= self.max_stale:
+                logger.error("Vault unavailable, using cached secrets from %.0f s ago", age)
+                return cached
+            logger.error("Vault unavailable, ignoring cached secrets %.0f s old (limit %.0f s)", age, self.max_stale)
+        logger.error("Vault unavailable and no usable cached secrets; starting without them, retrying in the background")
+        return SecretsSnapshot(secrets={}, fetched_at=0.0)
+
+    def refresh_in(self, snapshot: SecretsSnapshot) -> float:
+        """Seconds until ``snapshot`` should be re-read."""
+        interval = self.ttl
+        if snapshot.lease_duration > 0:
+            interval = min(interval, snapshot.lease_duration * LEASE_REFRESH_FRACTION)
+        now = time.time()
+        return min(snapshot.fetched_at, now) + interval - now
+
+    def _run(self) -> None:
+        failures = 0
+        while True:
+            if failures:
+                delay = min(MAX_RETRY_SECONDS, RETRY_BASE_SECONDS * 2**failures)
+            else:
+                delay = max(0.0, self.refresh_in(self._snapshot))
+            if self._stop.wait(delay):
+                return
+            # Another process on this host may have refreshed already
+            cached = self._read_cache()
+            try:
+                if cached is not None and cached.fetched_at > self._snapshot.fetched_at and self.refresh_in(cached) > 0:
+                    snapshot = cached
+                else:
+                    snapshot = self._fetch()
+            except Exception as e:
+                failures += 1
+                logger.warning("Vault refresh failed (%d in a row): %s", failures, e)
+                continue
+            failures = 0
+            self._update(snapshot)
+
+    def _update(self, snapshot: SecretsSnapshot) -> None:
+        previous = self._snapshot.secrets
+        self._snapshot = snapshot
+        if snapshot.secrets == previous:
+            return
+        keys = previous.keys() | snapshot.secrets.keys()
+        changed = sorted(k for k in keys if previous.get(k) != snapshot.secrets.get(k))
+        logger.info("Vault secrets changed: %s", ", ".join(changed))
+        for callback in self._subscribers:
+            try:
+                callback(snapshot.secrets)
+            except Exception:
+                logger.exception("Vault secrets subscriber %r failed", callback)
+
+    # --- File cache ---
+
+    def _read_cache(self) -> SecretsSnapshot | None:
+        if not self.cache_file:
+            return None
+        try:
+            fd = os.open(self.cache_file, os.O_RDONLY | os.O_NOFOLLOW)
+        except OSError:
+            return None
+        try:
+            with os.fdopen(fd) as f:
+                if not _is_private(os.fstat(f.fileno()), stat.S_ISREG):
+                    logger.warning("Ignoring Vault cache %s: not a private file of this user", self.cache_file)
+                    return None
+                cached = json.load(f)
+            snapshot = SecretsSnapshot(
+                secrets=dict(cached["secrets"]),
+                fetched_at=float(cached["fetched_at"]),
+                lease_duration=int(cached.get("lease_duration", 0)),
+            )
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        if cached.get("source") != self.source or snapshot.fetched_at > time.time():
+            return None
+        return snapshot
+
+    def _write_cache(self, snapshot: SecretsSnapshot) -> None:
+        if not self.cache_file:
+            return
+        data = {
+            "source": self.source,
+            "fetched_at": snapshot.fetched_at,
+            "lease_duration": snapshot.lease_duration,
+            "secrets": snapshot.secrets,
+        }
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.cache_file) or ".", suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            logger.warning("Could not write Vault cache %s: %s", self.cache_file, e)
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+
+
+def _is_private(st: os.stat_result, is_type: Callable[[int], bool]) -> bool:
+    """True for an inode of the expected type owned by this user with no group/other permissions."""
+    return is_type(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+@functools.cache
+def get_vault_provider() -> VaultSecretsProvider | None:
+    """The process-wide provider, or None when Vault is not configured."""
+    provider = VaultSecretsProvider.from_env()
+    if provider is not None:
+        os.register_at_fork(after_in_child=provider.after_fork)
+    return provider
@@ -5,6 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.repositories.user_repo import UserRepository
 from app.services.auth_service import AuthService
+from app.services.login_throttle import LoginThrottledError
+from app.services.user_cache import invalidate_user
 from app.web.deps import get_web_user
 
 router = APIRouter(tags=["web-auth"])
@@ -30,10 +32,23 @@ async def login_submit(
 ):
     service = AuthService(db)
     try:
-        user, _, _ = await service.authenticate(username, password)
+        user, _, _ = await service.authenticate(
+            username, password, ip=request.client.host if request.client else None
+        )
         request.session["user_id"] = str(user.id)
         request.session["lang"] = user.language
         return RedirectResponse(url="/", status_code=302)
+    except LoginThrottledError as e:
+        return request.app.state.templates.TemplateResponse(
+            "auth/login.html",
+            {
+                "request": request,
+                "error": request.app.state.get_translation("auth.too_many_attempts", request),
+                **request.app.state.template_globals(request),
+            },
+            status_code=429,
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except ValueError:
         return request.app.state.templates.TemplateResponse(
             "auth/login.html",
@@ -77,7 +92,10 @@ async def profile_submit(request: Request, db: AsyncSession = Depends(get_db)):
     if action == "update_profile":
         language = form.get("language", "ru")
         repo = UserRepository(db)
-        await repo.update(user, language=language)
+        # The session user is a detached cached copy; update the row itself
+        user = await repo.update(await repo.get_by_id(user.id), language=language)
+        await db.commit()
+        await invalidate_user(user.id)
         request.session["lang"] = language
         success = request.app.state.get_translation("toast.saved", request)
     elif action == "change_password":
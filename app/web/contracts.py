@@ -4,11 +4,14 @@ from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.contract import ContractStatus, ContractType, PaymentFrequency
+from app.models.document import EntityType
+from app.permissions import Permission, department_scope, has_permission
 from app.repositories.base import BaseRepository
 from app.schemas.contract import ContractCreate
 from app.services.contract_service import ContractService
+from app.services.document_service import DocumentService
 from app.web.deps import get_web_user
 
 router = APIRouter(prefix="/contracts", tags=["web-contracts"])
@@ -20,19 +23,20 @@ async def contract_list(
     status: str | None = None,
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
     status_enum = ContractStatus(status) if status else None
-    service = ContractService(db)
+    service = ContractService(db, department_scope(user))
     items, total = await service.list_all(status=status_enum, page=page, size=size)
     pages = BaseRepository.calc_pages(total, size)
+    doc_counts = await DocumentService(db).count_for_entities(EntityType.CONTRACT, [c.id for c in items])
     return request.app.state.templates.TemplateResponse(
         "contracts/list.html",
         {"request": request, "user": user, "active_page": "contracts",
-         "contracts": items, "total": total, "page": page, "size": size, "pages": pages,
+         "contracts": items, "doc_counts": doc_counts, "total": total, "page": page, "size": size, "pages": pages,
          "status_filter": status_enum, "statuses": ContractStatus,
          **request.app.state.template_globals(request)},
     )
@@ -43,6 +47,8 @@ async def contract_form_new(request: Request, db: AsyncSession = Depends(get_db)
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
     return request.app.state.templates.TemplateResponse(
         "contracts/form.html",
         {"request": request, "user": user, "active_page": "contracts", "contract": None,
@@ -56,6 +62,8 @@ async def contract_create(request: Request, db: AsyncSession = Depends(get_db)):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
     form = await request.form()
     try:
         data = ContractCreate(
@@ -70,7 +78,7 @@ async def contract_create(request: Request, db: AsyncSession = Depends(get_db)):
             auto_renew=form.get("auto_renew") == "on",
             notes=form.get("notes") or None,
         )
-        service = ContractService(db)
+        service = ContractService(db, department_scope(user))
         contract = await service.create(data, user.id)
         return RedirectResponse(url="/contracts", status_code=302)
     except (ValueError, Exception) as e:
@@ -87,7 +95,7 @@ async def contract_detail(request: Request, contract_id: UUID, db: AsyncSession
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
-    service = ContractService(db)
+    service = ContractService(db, department_scope(user))
     contract = await service.get_by_id(contract_id)
     if not contract:
         return RedirectResponse(url="/contracts", status_code=302)
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
+from app.permissions import department_scope
 from app.services.dashboard_service import DashboardService
 from app.web.deps import get_web_user
 
@@ -10,7 +11,7 @@ router = APIRouter(tags=["web-dashboard"])
 
 
 @router.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request, db: AsyncSession = Depends(get_db)):
+async def dashboard(request: Request, db: AsyncSession = Depends(get_read_db)):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
@@ -27,11 +28,11 @@ async def dashboard(request: Request, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/widgets/fleet-overview", response_class=HTMLResponse)
-async def widget_fleet_overview(request: Request, db: AsyncSession = Depends(get_db)):
+async def widget_fleet_overview(request: Request, db: AsyncSession = Depends(get_read_db)):
     user = await get_web_user(request, db)
     if not user:
         return HTMLResponse("")
-    svc = DashboardService(db)
+    svc = DashboardService(db, department_scope(user))
     data = await svc.fleet_overview()
     return request.app.state.templates.TemplateResponse(
         "dashboard/partials/fleet_overview.html",
@@ -40,11 +41,11 @@ async def widget_fleet_overview(request: Request, db: AsyncSession = Depends(get
 
 
 @router.get("/widgets/attention-needed", response_class=HTMLResponse)
-async def widget_attention_needed(request: Request, db: AsyncSession = Depends(get_db)):
+async def widget_attention_needed(request: Request, db: AsyncSession = Depends(get_read_db)):
     user = await get_web_user(request, db)
     if not user:
         return HTMLResponse("")
-    svc = DashboardService(db)
+    svc = DashboardService(db, department_scope(user))
     data = await svc.attention_needed()
     return request.app.state.templates.TemplateResponse(
         "dashboard/partials/attention_needed.html",
@@ -53,11 +54,11 @@ async def widget_attention_needed(request: Request, db: AsyncSession = Depends(g
 
 
 @router.get("/widgets/expense-chart", response_class=HTMLResponse)
-async def widget_expense_chart(request: Request, db: AsyncSession = Depends(get_db)):
+async def widget_expense_chart(request: Request, db: AsyncSession = Depends(get_read_db)):
     user = await get_web_user(request, db)
     if not user:
         return HTMLResponse("")
-    svc = DashboardService(db)
+    svc = DashboardService(db, department_scope(user))
     data = await svc.expense_summary()
     return request.app.state.templates.TemplateResponse(
         "dashboard/partials/expense_chart.html",
@@ -66,11 +67,11 @@ async def widget_expense_chart(request: Request, db: AsyncSession = Depends(get_
 
 
 @router.get("/widgets/maintenance-stats", response_class=HTMLResponse)
-async def widget_maintenance_stats(request: Request, db: AsyncSession = Depends(get_db)):
+async def widget_maintenance_stats(request: Request, db: AsyncSession = Depends(get_read_db)):
     user = await get_web_user(request, db)
     if not user:
         return HTMLResponse("")
-    svc = DashboardService(db)
+    svc = DashboardService(db, department_scope(user))
     stats = await svc.maintenance_stats()
     recent = await svc.recent_maintenance()
     return request.app.state.templates.TemplateResponse(
@@ -85,11 +86,11 @@ async def widget_maintenance_stats(request: Request, db: AsyncSession = Depends(
 
 
 @router.get("/widgets/top-vehicles", response_class=HTMLResponse)
-async def widget_top_vehicles(request: Request, db: AsyncSession = Depends(get_db)):
+async def widget_top_vehicles(request: Request, db: AsyncSession = Depends(get_read_db)):
     user = await get_web_user(request, db)
     if not user:
         return HTMLResponse("")
-    svc = DashboardService(db)
+    svc = DashboardService(db, department_scope(user))
     vehicles = await svc.top_expensive_vehicles()
     return request.app.state.templates.TemplateResponse(
         "dashboard/partials/top_vehicles.html",
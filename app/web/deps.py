@@ -1,3 +1,4 @@
+import time
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, Request
@@ -5,8 +6,11 @@ from starlette.status import HTTP_303_SEE_OTHER
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models.user import User, UserRole
-from app.repositories.user_repo import UserRepository
+from app.models.user import User
+from app.permissions import Permission, has_permission
+from app.config import settings
+from app.services.session_store import PRINCIPAL_FIELD
+from app.services.user_cache import dump_user, get_user, load_user
 
 
 class WebRedirectException(HTTPException):
@@ -17,15 +21,28 @@ class WebRedirectException(HTTPException):
 
 
 async def get_web_user(request: Request, db: AsyncSession = Depends(get_db)) -> User | None:
-    """Get current user from session cookie. Returns None if not authenticated."""
+    """Get current user from session cookie. Returns None if not authenticated.
+
+    The user is detached and read-only. Sessions carry a snapshot of it for
+    up to ``USER_CACHE_TTL`` (dropped early when the user changes); past
+    that it comes from the user cache. Resolved once per request.
+    """
     user_id = request.session.get("user_id")
     if not user_id:
         return None
-    repo = UserRepository(db)
-    user = await repo.get_by_id(UUID(user_id))
+    if hasattr(request.state, "user"):
+        return request.state.user
+    principal = request.session.get(PRINCIPAL_FIELD)
+    if principal and principal[0] > time.time():
+        user = load_user(principal[1])
+    else:
+        user = await get_user(db, UUID(user_id))
+        if user and user.is_active:
+            request.session[PRINCIPAL_FIELD] = [time.time() + settings.USER_CACHE_TTL, dump_user(user)]
     if not user or not user.is_active:
         request.session.clear()
-        return None
+        user = None
+    request.state.user = user
     return user
 
 
@@ -37,15 +54,15 @@ async def require_web_user(request: Request, db: AsyncSession = Depends(get_db))
     return user
 
 
-def web_require_roles(*roles: UserRole):
-    """Dependency factory for web routes requiring specific roles."""
+def web_require_permission(permission: Permission):
+    """Dependency factory for web routes requiring a permission."""
 
-    async def check_role(request: Request, db: AsyncSession = Depends(get_db)) -> User:
+    async def check_permission(request: Request, db: AsyncSession = Depends(get_db)) -> User:
         user = await get_web_user(request, db)
         if not user:
             raise WebRedirectException("/login")
-        if user.role not in roles:
+        if not has_permission(user, permission):
             raise WebRedirectException("/")
         return user
 
-    return check_role
+    return check_permission
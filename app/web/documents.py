@@ -3,12 +3,13 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Request, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models.document import DocumentType, EntityType
-from app.services.document_service import DocumentService
+from app.models.document import Document, DocumentType, EntityType
+from app.permissions import Permission, department_scope, has_permission
+from app.services.document_service import DocumentService, UploadedFile
 from app.web.deps import get_web_user
 
 router = APIRouter(prefix="/documents", tags=["web-documents"])
@@ -23,19 +24,37 @@ ENTITY_RETURN_URLS = {
 }
 
 
+async def _attach_urls(service: DocumentService, documents: list[Document]) -> None:
+    """Presign thumbnail/download URLs for the gallery in one pass.
+
+    Images are previewed through their WebP thumbnail; the original is only
+    used until the ingestion worker has generated one.
+    """
+    urls = await service.get_download_urls(documents)
+    thumbnails = await service.get_thumbnail_urls(documents)
+    for doc in documents:
+        doc._download_url = urls[doc.id]
+        if doc.mime_type and doc.mime_type.startswith("image/"):
+            doc._thumbnail_url = thumbnails.get(doc.id, urls[doc.id])
+        else:
+            doc._thumbnail_url = None
+
+
 @router.post("/upload", response_class=HTMLResponse)
 async def upload_document(
     request: Request,
-    file: UploadFile = File(...),
+    files: list[UploadFile] = File(...),
     entity_type: str = Form(...),
     entity_id: str = Form(...),
     doc_type: str = Form("other"),
     db: AsyncSession = Depends(get_db),
 ):
-    """Upload a document and return updated gallery partial via HTMX."""
+    """Upload one or more documents and return updated gallery partial via HTMX."""
     user = await get_web_user(request, db)
     if not user:
         return HTMLResponse('<div class="text-red-500 text-sm">Unauthorized</div>', status_code=401)
+    if not has_permission(user, Permission.MANAGE_DOCUMENTS):
+        return HTMLResponse('<div class="text-red-500 text-sm">Forbidden</div>', status_code=403)
 
     try:
         etype = EntityType(entity_type)
@@ -44,24 +63,26 @@ async def upload_document(
     except (ValueError, KeyError) as e:
         return HTMLResponse(f'<div class="text-red-500 text-sm">Invalid parameters: {e}</div>', status_code=400)
 
-    file_data = await file.read()
-    service = DocumentService(db)
+    service = DocumentService(db, department_scope(user))
     try:
-        await service.upload(
-            file_data=file_data,
-            filename=file.filename or "upload",
-            mime_type=file.content_type or "application/octet-stream",
+        await service.upload_many(
+            [
+                UploadedFile(f.file, f.filename or "upload", f.content_type or "application/octet-stream")
+                for f in files
+            ],
             entity_type=etype,
             entity_id=eid,
             doc_type=dtype,
             uploaded_by=user.id,
         )
         await db.commit()
+        await service.after_commit()
     except ValueError as e:
         return HTMLResponse(f'<div class="text-red-500 text-sm p-2">{e}</div>', status_code=400)
 
     # Return updated document gallery via HTMX
     documents = await service.list_for_entity(etype, eid)
+    await _attach_urls(service, documents)
     templates = request.app.state.templates
     ctx = request.app.state.template_globals(request)
     return templates.TemplateResponse(
@@ -71,7 +92,7 @@ async def upload_document(
             "documents": documents,
             "entity_type": entity_type,
             "entity_id": str(eid),
-            "can_edit": user.role.value in ("admin", "fleet_manager"),
+            "can_edit": has_permission(user, Permission.MANAGE_DOCUMENTS),
             **ctx,
         },
     )
@@ -94,16 +115,10 @@ async def document_gallery(
     except ValueError:
         return HTMLResponse("", status_code=400)
 
-    service = DocumentService(db)
+    service = DocumentService(db, department_scope(user))
     documents = await service.list_for_entity(etype, entity_id)
 
-    # Generate presigned URLs for images
-    for doc in documents:
-        if doc.mime_type and doc.mime_type.startswith("image/"):
-            doc._preview_url = await service.get_download_url(doc.id)
-        else:
-            doc._preview_url = None
-        doc._download_url = await service.get_download_url(doc.id)
+    await _attach_urls(service, documents)
 
     templates = request.app.state.templates
     ctx = request.app.state.template_globals(request)
@@ -114,7 +129,7 @@ async def document_gallery(
             "documents": documents,
             "entity_type": entity_type,
             "entity_id": str(entity_id),
-            "can_edit": user.role.value in ("admin", "fleet_manager"),
+            "can_edit": has_permission(user, Permission.MANAGE_DOCUMENTS),
             **ctx,
         },
     )
@@ -131,13 +146,41 @@ async def download_document(
     if not user:
         return RedirectResponse(url="/login", status_code=302)
 
-    service = DocumentService(db)
+    service = DocumentService(db, department_scope(user))
     url = await service.get_download_url(doc_id)
     if not url:
         return RedirectResponse(url="/", status_code=302)
     return RedirectResponse(url=url, status_code=302)
 
 
+@router.get("/zip/{entity_type}/{entity_id}")
+async def download_entity_documents(
+    request: Request,
+    entity_type: str,
+    entity_id: UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream all documents of an entity as one zip archive."""
+    user = await get_web_user(request, db)
+    if not user:
+        return RedirectResponse(url="/login", status_code=302)
+
+    try:
+        etype = EntityType(entity_type)
+    except ValueError:
+        return HTMLResponse("", status_code=400)
+
+    service = DocumentService(db, department_scope(user))
+    documents = await service.list_for_entity(etype, entity_id)
+    if not documents:
+        return HTMLResponse("", status_code=404)
+    return StreamingResponse(
+        service.iter_zip(documents),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{etype.value}-{entity_id}.zip"'},
+    )
+
+
 @router.delete("/{doc_id}", response_class=HTMLResponse)
 async def delete_document(
     request: Request,
@@ -146,13 +189,14 @@ async def delete_document(
 ):
     """Delete a document and return empty response for HTMX swap."""
     user = await get_web_user(request, db)
-    if not user or user.role.value not in ("admin", "fleet_manager"):
+    if not user or not has_permission(user, Permission.MANAGE_DOCUMENTS):
         return HTMLResponse("", status_code=403)
 
-    service = DocumentService(db)
+    service = DocumentService(db, department_scope(user))
     try:
         await service.delete(doc_id)
         await db.commit()
+        await service.after_commit()
     except ValueError:
         pass
 
@@ -4,10 +4,13 @@ from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.models.document import EntityType
 from app.models.driver import DriverStatus
+from app.permissions import Permission, department_scope, has_permission
 from app.repositories.base import BaseRepository
 from app.schemas.driver import DriverCreate, DriverUpdate
+from app.services.document_service import DocumentService
 from app.services.driver_service import DriverService
 from app.web.deps import get_web_user
 
@@ -21,22 +24,23 @@ async def driver_list(
     status: str | None = None,
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
 
     status_enum = DriverStatus(status) if status else None
-    service = DriverService(db)
+    service = DriverService(db, department_scope(user))
     drivers, total = await service.list_drivers(q=q, status=status_enum, page=page, size=size)
     pages = BaseRepository.calc_pages(total, size)
+    doc_counts = await DocumentService(db).count_for_entities(EntityType.DRIVER, [d.id for d in drivers])
 
     return request.app.state.templates.TemplateResponse(
         "drivers/list.html",
         {
             "request": request, "user": user, "active_page": "drivers",
-            "drivers": drivers, "total": total, "page": page, "size": size,
+            "drivers": drivers, "doc_counts": doc_counts, "total": total, "page": page, "size": size,
             "pages": pages, "q": q, "status_filter": status_enum,
             "statuses": DriverStatus,
             **request.app.state.template_globals(request),
@@ -49,6 +53,8 @@ async def driver_form_new(request: Request, db: AsyncSession = Depends(get_db)):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
     return request.app.state.templates.TemplateResponse(
         "drivers/form.html",
         {"request": request, "user": user, "active_page": "drivers", "driver": None,
@@ -61,6 +67,8 @@ async def driver_create(request: Request, db: AsyncSession = Depends(get_db)):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
     form = await request.form()
     try:
         data = DriverCreate(
@@ -73,7 +81,7 @@ async def driver_create(request: Request, db: AsyncSession = Depends(get_db)):
             department=form.get("department") or None,
             notes=form.get("notes") or None,
         )
-        service = DriverService(db)
+        service = DriverService(db, department_scope(user))
         driver = await service.create(data)
         return RedirectResponse(url=f"/drivers/{driver.id}", status_code=302)
     except (ValueError, Exception) as e:
@@ -89,7 +97,7 @@ async def driver_detail(request: Request, driver_id: UUID, db: AsyncSession = De
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
-    service = DriverService(db)
+    service = DriverService(db, department_scope(user))
     driver = await service.get_by_id(driver_id)
     if not driver:
         return RedirectResponse(url="/drivers", status_code=302)
@@ -105,7 +113,9 @@ async def driver_form_edit(request: Request, driver_id: UUID, db: AsyncSession =
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
-    service = DriverService(db)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
+    service = DriverService(db, department_scope(user))
     driver = await service.get_by_id(driver_id)
     if not driver:
         return RedirectResponse(url="/drivers", status_code=302)
@@ -121,6 +131,8 @@ async def driver_update(request: Request, driver_id: UUID, db: AsyncSession = De
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
     form = await request.form()
     update_data = {}
     for field in ["full_name", "employee_id", "phone", "email", "license_number", "license_category", "department", "notes", "status"]:
@@ -129,11 +141,11 @@ async def driver_update(request: Request, driver_id: UUID, db: AsyncSession = De
             update_data[field] = val
     try:
         data = DriverUpdate(**update_data)
-        service = DriverService(db)
+        service = DriverService(db, department_scope(user))
         await service.update(driver_id, data)
         return RedirectResponse(url=f"/drivers/{driver_id}", status_code=302)
     except (ValueError, Exception) as e:
-        service = DriverService(db)
+        service = DriverService(db, department_scope(user))
         driver = await service.get_by_id(driver_id)
         return request.app.state.templates.TemplateResponse(
             "drivers/form.html",
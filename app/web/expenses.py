@@ -4,8 +4,9 @@ from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.expense import Currency, ExpenseCategory
+from app.permissions import Permission, department_scope, has_permission
 from app.repositories.base import BaseRepository
 from app.schemas.expense import ExpenseCreate, ExpenseUpdate
 from app.services.expense_service import ExpenseService
@@ -20,13 +21,13 @@ async def expense_list(
     category: str | None = None,
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
     category_enum = ExpenseCategory(category) if category else None
-    service = ExpenseService(db)
+    service = ExpenseService(db, department_scope(user))
     items, total = await service.list_all(category=category_enum, page=page, size=size)
     pages = BaseRepository.calc_pages(total, size)
     return request.app.state.templates.TemplateResponse(
@@ -43,6 +44,8 @@ async def expense_form_new(request: Request, db: AsyncSession = Depends(get_db))
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
     return request.app.state.templates.TemplateResponse(
         "expenses/form.html",
         {"request": request, "user": user, "active_page": "expenses", "expense": None,
@@ -56,6 +59,8 @@ async def expense_create(request: Request, db: AsyncSession = Depends(get_db)):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
     form = await request.form()
     try:
         data = ExpenseCreate(
@@ -69,7 +74,7 @@ async def expense_create(request: Request, db: AsyncSession = Depends(get_db)):
             fuel_liters=float(form.get("fuel_liters")) if form.get("fuel_liters") else None,
             fuel_price_per_liter=form.get("fuel_price_per_liter") or None,
         )
-        service = ExpenseService(db)
+        service = ExpenseService(db, department_scope(user))
         expense = await service.create(data, user.id)
         return RedirectResponse(url=f"/expenses", status_code=302)
     except (ValueError, Exception) as e:
@@ -4,8 +4,9 @@ from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.maintenance import MaintenanceStatus, MaintenanceType
+from app.permissions import Permission, department_scope, has_permission
 from app.repositories.base import BaseRepository
 from app.schemas.maintenance import MaintenanceCreate, MaintenanceUpdate
 from app.services.maintenance_service import MaintenanceService
@@ -20,13 +21,13 @@ async def maintenance_list(
     status: str | None = None,
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
     status_enum = MaintenanceStatus(status) if status else None
-    service = MaintenanceService(db)
+    service = MaintenanceService(db, department_scope(user))
     items, total = await service.list_all(status=status_enum, page=page, size=size)
     pages = BaseRepository.calc_pages(total, size)
     return request.app.state.templates.TemplateResponse(
@@ -43,6 +44,8 @@ async def maintenance_form_new(request: Request, db: AsyncSession = Depends(get_
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
     return request.app.state.templates.TemplateResponse(
         "maintenance/form.html",
         {"request": request, "user": user, "active_page": "maintenance", "record": None,
@@ -56,6 +59,8 @@ async def maintenance_create(request: Request, db: AsyncSession = Depends(get_db
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
     form = await request.form()
     try:
         data = MaintenanceCreate(
@@ -67,7 +72,7 @@ async def maintenance_create(request: Request, db: AsyncSession = Depends(get_db
             cost=form.get("cost") or None,
             service_provider=form.get("service_provider") or None,
         )
-        service = MaintenanceService(db)
+        service = MaintenanceService(db, department_scope(user))
         record = await service.create(data, user.id)
         return RedirectResponse(url=f"/maintenance/{record.id}", status_code=302)
     except (ValueError, Exception) as e:
@@ -84,7 +89,7 @@ async def maintenance_detail(request: Request, record_id: UUID, db: AsyncSession
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
-    service = MaintenanceService(db)
+    service = MaintenanceService(db, department_scope(user))
     record = await service.get_by_id(record_id)
     if not record:
         return RedirectResponse(url="/maintenance", status_code=302)
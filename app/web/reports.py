@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
+from app.permissions import department_scope
 from app.services.report_service import ReportService
 from app.web.deps import get_web_user
 
@@ -18,7 +19,7 @@ def _parse_date(value: str | None) -> dt.date | None:
 
 
 @router.get("", response_class=HTMLResponse)
-async def reports_index(request: Request, db: AsyncSession = Depends(get_db)):
+async def reports_index(request: Request, db: AsyncSession = Depends(get_read_db)):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
@@ -39,7 +40,7 @@ async def report_tco(
     request: Request,
     start_date: str | None = None,
     end_date: str | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
@@ -47,7 +48,7 @@ async def report_tco(
 
     sd = _parse_date(start_date)
     ed = _parse_date(end_date)
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     data = await svc.tco_report(sd, ed)
     return request.app.state.templates.TemplateResponse(
         "reports/tco.html",
@@ -68,7 +69,7 @@ async def report_fuel(
     request: Request,
     start_date: str | None = None,
     end_date: str | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
@@ -76,7 +77,7 @@ async def report_fuel(
 
     sd = _parse_date(start_date)
     ed = _parse_date(end_date)
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     data = await svc.fuel_consumption(sd, ed)
     return request.app.state.templates.TemplateResponse(
         "reports/fuel.html",
@@ -97,7 +98,7 @@ async def report_expenses(
     request: Request,
     start_date: str | None = None,
     end_date: str | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
@@ -105,7 +106,7 @@ async def report_expenses(
 
     sd = _parse_date(start_date)
     ed = _parse_date(end_date)
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     data = await svc.expense_analysis(sd, ed)
     return request.app.state.templates.TemplateResponse(
         "reports/expenses.html",
@@ -128,12 +129,12 @@ async def web_export_tco(
     start_date: str | None = None,
     end_date: str | None = None,
     request: Request = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     content = await svc.export_tco_excel(_parse_date(start_date), _parse_date(end_date))
     return Response(
         content=content,
@@ -147,12 +148,12 @@ async def web_export_fuel(
     start_date: str | None = None,
     end_date: str | None = None,
     request: Request = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     content = await svc.export_fuel_excel(_parse_date(start_date), _parse_date(end_date))
     return Response(
         content=content,
@@ -166,12 +167,12 @@ async def web_export_expenses(
     start_date: str | None = None,
     end_date: str | None = None,
     request: Request = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
-    svc = ReportService(db)
+    svc = ReportService(db, department_scope(user))
     content = await svc.export_expense_csv(_parse_date(start_date), _parse_date(end_date))
     return Response(
         content=content,
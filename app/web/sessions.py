@@ -0,0 +1,70 @@
+"""Session middleware backed by the Redis session store.
+
+A drop-in replacement for Starlette's SessionMiddleware: ``request.session``
+works the same, but the cookie carries only an opaque session id and the
+data lives in Redis (app/services/session_store.py).
+"""
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.session_store import delete_session, load_session, new_session_id, save_session
+
+
+class RedisSessionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        session_cookie: str,
+        max_age: int,
+        https_only: bool = False,
+        exclude_paths: tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.security_flags = "httponly; samesite=lax" + ("; secure" if https_only else "")
+        self.exclude_paths = exclude_paths
+
+    def _cookie(self, value: str, max_age: int) -> str:
+        return f"{self.session_cookie}={value}; path=/; Max-Age={max_age}; {self.security_flags}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or scope["path"].startswith(self.exclude_paths):
+            if scope["type"] in ("http", "websocket"):
+                scope["session"] = {}
+            await self.app(scope, receive, send)
+            return
+
+        session_id = HTTPConnection(scope).cookies.get(self.session_cookie)
+        initial = await load_session(session_id) if session_id else {}
+        # Store down: serve the request signed out but leave the cookie alone,
+        # so the session is still there once Redis is back
+        store_down = initial is None
+        had_cookie = session_id is not None
+        if not initial:
+            # Unknown, expired or revoked: never reuse a client-chosen id
+            session_id, initial = None, {}
+        scope["session"] = dict(initial)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal session_id, initial
+            if message["type"] == "http.response.start" and not store_down:
+                session = scope["session"]
+                headers = MutableHeaders(scope=message)
+                if session:
+                    if session_id is None or session.get("user_id") != initial.get("user_id"):
+                        # New session, or signed in/out as someone else: issue a fresh id
+                        if session_id is not None:
+                            await delete_session(session_id, initial.get("user_id"))
+                        session_id, initial = new_session_id(), {}
+                    await save_session(session_id, initial, session)
+                    headers.append("Set-Cookie", self._cookie(session_id, self.max_age))
+                elif had_cookie:
+                    if session_id is not None:
+                        await delete_session(session_id, initial.get("user_id"))
+                    headers.append("Set-Cookie", self._cookie("null", 0))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
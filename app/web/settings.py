@@ -7,13 +7,15 @@ from sqlalchemy.orm import selectinload
 
 from app.database import get_db
 from app.models.audit_log import AuditLog
-from app.models.user import User, UserRole
+from app.models.user import User
+from app.permissions import Permission
 from app.repositories.user_repo import UserRepository
-from app.web.deps import web_require_roles
+from app.web.deps import web_require_permission
 
 router = APIRouter()
 
-require_admin = web_require_roles(UserRole.ADMIN)
+require_user_admin = web_require_permission(Permission.MANAGE_USERS)
+require_audit_viewer = web_require_permission(Permission.VIEW_AUDIT_LOG)
 
 
 @router.get("/settings/users")
@@ -22,7 +24,7 @@ async def users_page(
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(require_admin),
+    user: User = Depends(require_user_admin),
 ):
     templates = request.app.state.templates
     ctx = request.app.state.template_globals(request)
@@ -55,7 +57,7 @@ async def audit_log_page(
     action: str | None = Query(None),
     entity_type: str | None = Query(None),
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(require_admin),
+    user: User = Depends(require_audit_viewer),
 ):
     templates = request.app.state.templates
     ctx = request.app.state.template_globals(request)
@@ -4,10 +4,13 @@ from fastapi import APIRouter, Depends, Form, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.models.document import EntityType
 from app.models.vehicle import BodyType, FuelType, TransmissionType, VehicleStatus
+from app.permissions import Permission, department_scope, has_permission
 from app.schemas.vehicle import VehicleCreate, VehicleUpdate
 from app.services.contract_service import ContractService
+from app.services.document_service import DocumentService
 from app.services.expense_service import ExpenseService
 from app.services.maintenance_service import MaintenanceService
 from app.services.mileage_service import MileageService
@@ -26,16 +29,17 @@ async def vehicle_list(
     brand: str | None = None,
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
 
     status_enum = VehicleStatus(status) if status else None
-    service = VehicleService(db)
+    service = VehicleService(db, department_scope(user))
     vehicles, total = await service.list_vehicles(q=q, status=status_enum, brand=brand, page=page, size=size)
     pages = BaseRepository.calc_pages(total, size)
+    doc_counts = await DocumentService(db).count_for_entities(EntityType.VEHICLE, [v.id for v in vehicles])
 
     return request.app.state.templates.TemplateResponse(
         "vehicles/list.html",
@@ -44,6 +48,7 @@ async def vehicle_list(
             "user": user,
             "active_page": "vehicles",
             "vehicles": vehicles,
+            "doc_counts": doc_counts,
             "total": total,
             "page": page,
             "size": size,
@@ -62,6 +67,8 @@ async def vehicle_form_new(request: Request, db: AsyncSession = Depends(get_db))
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
 
     return request.app.state.templates.TemplateResponse(
         "vehicles/form.html",
@@ -85,6 +92,8 @@ async def vehicle_create(request: Request, db: AsyncSession = Depends(get_db)):
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
 
     form = await request.form()
     try:
@@ -104,7 +113,7 @@ async def vehicle_create(request: Request, db: AsyncSession = Depends(get_db)):
             department=form.get("department") or None,
             notes=form.get("notes") or None,
         )
-        service = VehicleService(db)
+        service = VehicleService(db, department_scope(user))
         vehicle = await service.create(data)
         return RedirectResponse(url=f"/vehicles/{vehicle.id}", status_code=302)
     except (ValueError, Exception) as e:
@@ -131,7 +140,7 @@ async def vehicle_detail(request: Request, vehicle_id: UUID, db: AsyncSession =
     if not user:
         return RedirectResponse(url="/login", status_code=302)
 
-    service = VehicleService(db)
+    service = VehicleService(db, department_scope(user))
     vehicle = await service.get_by_id(vehicle_id)
     if not vehicle:
         return RedirectResponse(url="/vehicles", status_code=302)
@@ -153,8 +162,10 @@ async def vehicle_form_edit(request: Request, vehicle_id: UUID, db: AsyncSession
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
 
-    service = VehicleService(db)
+    service = VehicleService(db, department_scope(user))
     vehicle = await service.get_by_id(vehicle_id)
     if not vehicle:
         return RedirectResponse(url="/vehicles", status_code=302)
@@ -181,6 +192,8 @@ async def vehicle_update(request: Request, vehicle_id: UUID, db: AsyncSession =
     user = await get_web_user(request, db)
     if not user:
         return RedirectResponse(url="/login", status_code=302)
+    if not has_permission(user, Permission.MANAGE_FLEET):
+        return RedirectResponse(url="/", status_code=302)
 
     form = await request.form()
     update_data = {}
@@ -199,11 +212,11 @@ async def vehicle_update(request: Request, vehicle_id: UUID, db: AsyncSession =
 
     try:
         data = VehicleUpdate(**update_data)
-        service = VehicleService(db)
+        service = VehicleService(db, department_scope(user))
         await service.update(vehicle_id, data)
         return RedirectResponse(url=f"/vehicles/{vehicle_id}", status_code=302)
     except (ValueError, Exception) as e:
-        service = VehicleService(db)
+        service = VehicleService(db, department_scope(user))
         vehicle = await service.get_by_id(vehicle_id)
         return request.app.state.templates.TemplateResponse(
             "vehicles/form.html",
@@ -232,7 +245,7 @@ async def vehicle_tab_mileage(
     user = await get_web_user(request, db)
     if not user:
         return HTMLResponse("", status_code=401)
-    service = MileageService(db)
+    service = MileageService(db, department_scope(user))
     logs = await service.get_history(vehicle_id, limit=50)
     templates = request.app.state.templates
     ctx = request.app.state.template_globals(request)
@@ -249,7 +262,7 @@ async def vehicle_tab_maintenance(
     user = await get_web_user(request, db)
     if not user:
         return HTMLResponse("", status_code=401)
-    service = MaintenanceService(db)
+    service = MaintenanceService(db, department_scope(user))
     records, total = await service.list_for_vehicle(vehicle_id, limit=30)
     templates = request.app.state.templates
     ctx = request.app.state.template_globals(request)
@@ -267,7 +280,7 @@ async def vehicle_tab_expenses(
     user = await get_web_user(request, db)
     if not user:
         return HTMLResponse("", status_code=401)
-    service = ExpenseService(db)
+    service = ExpenseService(db, department_scope(user))
     records, total = await service.list_for_vehicle(vehicle_id, limit=30)
     templates = request.app.state.templates
     ctx = request.app.state.template_globals(request)
@@ -285,7 +298,7 @@ async def vehicle_tab_contracts(
     user = await get_web_user(request, db)
     if not user:
         return HTMLResponse("", status_code=401)
-    service = ContractService(db)
+    service = ContractService(db, department_scope(user))
     records, total = await service.list_for_vehicle(vehicle_id, limit=30)
     templates = request.app.state.templates
     ctx = request.app.state.template_globals(request)
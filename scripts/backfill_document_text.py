@@ -0,0 +1,65 @@
+"""Queue text extraction for invoices, acts and contracts uploaded before search existed.
+
+Walks searchable documents whose text has not been extracted in id order and
+enqueues one ingestion task per document. Safe to re-run: the task skips
+documents that already have text.
+
+    python -m scripts.backfill_document_text --batch-size 500
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.database import get_sessionmaker
+from app.models.document import Document
+from app.tasks.ingestion import SEARCHABLE_TYPES, TEXT_MIME_TYPES, extract_document_text
+
+
+async def backfill(batch_size: int, limit: int | None, dry_run: bool) -> int:
+    queued = 0
+    last_id = None
+    async with get_sessionmaker()() as session:
+        while limit is None or queued < limit:
+            stmt = (
+                select(Document.id)
+                .where(
+                    Document.type.in_(SEARCHABLE_TYPES),
+                    Document.mime_type.in_(TEXT_MIME_TYPES),
+                    Document.text_extracted_at.is_(None),
+                )
+                .order_by(Document.id)
+                .limit(batch_size if limit is None else min(batch_size, limit - queued))
+            )
+            if last_id is not None:
+                stmt = stmt.where(Document.id > last_id)
+            ids = list((await session.execute(stmt)).scalars())
+            if not ids:
+                break
+            for doc_id in ids:
+                if not dry_run:
+                    extract_document_text.delay(str(doc_id))
+            queued += len(ids)
+            last_id = ids[-1]
+            print(f"  {'Found' if dry_run else 'Queued'} {queued} documents...")
+    return queued
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many documents")
+    parser.add_argument("--dry-run", action="store_true", help="count documents without queueing tasks")
+    args = parser.parse_args()
+
+    queued = asyncio.run(backfill(args.batch_size, args.limit, args.dry_run))
+    print(f"\nDone! {queued} documents {'need text extraction' if args.dry_run else 'queued'}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark request latency during a login storm: bcrypt on the event loop vs the hashing pool.
+
+Runs in-process against a minimal ASGI app, so no database is needed. Each
+round fires ``--logins`` concurrent password checks (as AuthService does on
+login) while an unrelated endpoint is polled, and reports that endpoint's
+latency percentiles.
+
+    python -m scripts.bench_login_storm --logins 40 --polls 200 --interval-ms 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.utils.security import hash_password, verify_password, verify_password_async
+
+PASSWORD = "SeedPass!2024"
+
+
+def build_app(hashed: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login/blocking")
+    async def login_blocking():
+        # Old behaviour: bcrypt runs on the event loop thread
+        return {"ok": verify_password(PASSWORD, hashed)}
+
+    @app.post("/login/pooled")
+    async def login_pooled():
+        return {"ok": await verify_password_async(PASSWORD, hashed)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def storm(client: AsyncClient, mode: str, logins: int, polls: int, interval: float) -> list[float]:
+    latencies = []
+
+    async def poll():
+        # Latency is measured from each poll's scheduled time, so a stalled
+        # loop counts against the requests it delayed
+        scheduled = time.perf_counter()
+        for _ in range(polls):
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            await client.get("/ping")
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+            scheduled += interval
+
+    await asyncio.gather(poll(), *(client.post(f"/login/{mode}") for _ in range(logins)))
+    return latencies
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+async def run(logins: int, polls: int, interval: float) -> None:
+    hashed = hash_password(PASSWORD)
+    transport = ASGITransport(app=build_app(hashed))
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode in ("blocking", "pooled"):
+            start = time.perf_counter()
+            latencies = await storm(client, mode, logins, polls, interval)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{mode:>8}: /ping p50 {percentile(latencies, 50):8.1f} ms  p99 {percentile(latencies, 99):8.1f} ms  "
+                f"max {max(latencies):8.1f} ms  ({logins} logins in {elapsed:.1f} s)"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--polls", type=int, default=200)
+    parser.add_argument("--interval-ms", type=float, default=20, help="time between /ping requests")
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.polls, args.interval_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
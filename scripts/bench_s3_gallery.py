@@ -0,0 +1,80 @@
+"""Benchmark document gallery S3 overhead: per-call clients vs the shared client.
+
+Simulates one gallery page view (two presigned URLs per document, as
+app/web/documents.py does) against the configured MinIO endpoint, or against a
+local moto server stand-in with ``--stand-in`` (requires ``moto[server]``).
+
+    python -m scripts.bench_s3_gallery --docs 50 --rounds 5 --stand-in
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.utils import s3
+
+
+def per_call_view(keys: list[str]) -> None:
+    """Old behaviour: a new client pair and head_bucket for every URL."""
+    for key in keys:
+        for _ in range(2):
+            client = s3.S3Client()
+            client.ensure_bucket()
+            client.get_presigned_url(key)
+
+
+def shared_view(keys: list[str]) -> None:
+    for key in keys:
+        for _ in range(2):
+            s3.get_s3_client().get_presigned_url(key)
+
+
+def measure(view, keys: list[str], rounds: int) -> list[float]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        view(keys)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--stand-in", action="store_true", help="run against a local moto S3 server")
+    args = parser.parse_args()
+
+    server = None
+    if args.stand_in:
+        from moto.server import ThreadedMotoServer
+
+        server = ThreadedMotoServer(port=0, verbose=False)
+        server.start()
+        host, port = server.get_host_and_port()
+        settings.MINIO_ENDPOINT = f"{host}:{port}"
+        settings.MINIO_EXTERNAL_ENDPOINT = ""
+        settings.MINIO_USE_SSL = False
+        settings.MINIO_ACCESS_KEY = settings.MINIO_ACCESS_KEY or "bench"
+        settings.MINIO_SECRET_KEY = settings.MINIO_SECRET_KEY or "bench"
+
+    keys = [f"vehicle/bench/{i}.jpg" for i in range(args.docs)]
+    try:
+        for name, view in (("per-call clients", per_call_view), ("shared client", shared_view)):
+            timings = measure(view, keys, args.rounds)
+            print(
+                f"{name:>16}: median {statistics.median(timings):8.1f} ms  "
+                f"min {min(timings):8.1f} ms  ({args.docs} docs, {args.rounds} rounds)"
+            )
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@
 import asyncio
 import sys
 
-from app.database import AsyncSessionLocal
+from app.database import get_sessionmaker
 from app.models.user import UserRole
 from app.services.auth_service import AuthService
 
@@ -20,7 +20,7 @@ async def main():
         print("Error: password must be at least 8 characters", file=sys.stderr)
         sys.exit(1)
 
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         service = AuthService(session)
         try:
             user = await service.register(
@@ -0,0 +1,6 @@
+#!/bin/sh
+# Runs once when the primary's data directory is created (docker-entrypoint-initdb.d).
+# DEV ONLY: lets the db-replica service stream WAL without a password.
+set -e
+
+echo "host replication all all trust" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,16 @@
+#!/bin/sh
+# Entrypoint for the db-replica Compose service: clone the primary on first
+# start, then run as a hot standby streaming from it.
+set -e
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    echo "Cloning primary into $PGDATA..."
+    until pg_basebackup -h db -U fleetcore -D "$PGDATA" -X stream -R; do
+        echo "Waiting for the primary to accept replication connections..."
+        rm -rf "${PGDATA:?}"/*
+        sleep 2
+    done
+    chmod 700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on
@@ -18,7 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import select
 
-from app.database import AsyncSessionLocal
+from app.database import get_sessionmaker
 from app.models.audit_log import AuditAction, AuditLog
 from app.models.contract import Contract, ContractStatus, ContractType, PaymentFrequency
 from app.models.document import Document, DocumentType, EntityType
@@ -259,7 +259,7 @@ async def seed():
     used_plates = set()
     used_vins = set()
 
-    async with AsyncSessionLocal() as db:
+    async with get_sessionmaker()() as db:
         # Clean existing seed data (keep admin user)
         print("Cleaning existing data...")
         from sqlalchemy import delete
@@ -15,7 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from PIL import Image, ImageDraw, ImageFont
 from sqlalchemy import select
 
-from app.database import AsyncSessionLocal
+from app.database import get_sessionmaker
 from app.models.document import Document, DocumentType, EntityType
 from app.models.vehicle import Vehicle
 from app.models.driver import Driver
@@ -241,7 +241,7 @@ async def seed_files():
     print("Generating and uploading real files to MinIO...")
     s3 = get_s3_client()
 
-    async with AsyncSessionLocal() as db:
+    async with get_sessionmaker()() as db:
         # Load all documents
         result = await db.execute(select(Document).order_by(Document.uploaded_at))
         documents = result.scalars().all()
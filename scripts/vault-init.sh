@@ -26,7 +26,6 @@ SECRET_KEY=$(cat /dev/urandom | tr -dc 'a-f0-9' | head -c 64)
 
 vault kv put secret/fleetcore \
     DATABASE_URL="postgresql+asyncpg://fleetcore@db:5432/fleetcore" \
-    DATABASE_URL_SYNC="postgresql+psycopg2://fleetcore@db:5432/fleetcore" \
     REDIS_URL="redis://redis:6379/0" \
     SECRET_KEY="${SECRET_KEY}" \
     MINIO_ENDPOINT="minio:9000" \
@@ -8,7 +8,7 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from app.config import settings
-from app.database import get_db
+from app.database import engine_options, get_db, get_read_db
 from app.main import create_app
 from app.models.user import User, UserRole
 from app.utils.security import create_access_token, hash_password
@@ -19,7 +19,7 @@ TEST_DATABASE_URL = settings.DATABASE_URL
 @pytest_asyncio.fixture
 async def db_session():
     """Create a test DB session with transaction rollback."""
-    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    engine = create_async_engine(TEST_DATABASE_URL, **engine_options(pool_size=1, max_overflow=0))
     connection = await engine.connect()
     transaction = await connection.begin()
     session = AsyncSession(bind=connection, expire_on_commit=False)
@@ -41,6 +41,7 @@ async def app(db_session):
         yield db_session
 
     application.dependency_overrides[get_db] = override_get_db
+    application.dependency_overrides[get_read_db] = override_get_db
     return application
 
 
@@ -3,7 +3,10 @@
 import pytest
 from httpx import AsyncClient
 
+from app.config import settings
+from app.services import login_throttle
 from tests.conftest import auth_header
+from tests.test_services.test_login_throttle import FakeRedis
 
 
 @pytest.mark.asyncio
@@ -30,6 +33,20 @@ async def test_login_invalid_credentials(client: AsyncClient, admin_user):
     assert response.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_login_throttled_after_too_many_failures(client: AsyncClient, admin_user, monkeypatch):
+    """POST /api/v1/auth/login returns 429 with Retry-After once the username's limit is reached."""
+    redis = FakeRedis()
+    monkeypatch.setattr(login_throttle, "get_async_redis", lambda: redis)
+    for _ in range(settings.LOGIN_MAX_FAILURES_PER_USERNAME):
+        response = await client.post("/api/v1/auth/login", json={"username": "testadmin", "password": "wrong"})
+        assert response.status_code == 401
+
+    response = await client.post("/api/v1/auth/login", json={"username": "testadmin", "password": "testpass123"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(settings.LOGIN_RATE_WINDOW_SECONDS)
+
+
 @pytest.mark.asyncio
 async def test_get_me_authenticated(client: AsyncClient, admin_user, admin_token: str):
     """GET /api/v1/auth/me with valid token returns 200 and user info."""
@@ -0,0 +1,136 @@
+"""Department scoping of vehicle-owned records and reports (needs the test database)."""
+
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.contract import Contract, ContractType
+from app.models.expense import Expense, ExpenseCategory
+from app.models.maintenance import MaintenanceRecord, MaintenanceType
+from app.models.mileage import MileageLog
+from app.models.user import User, UserRole
+from app.models.vehicle import Vehicle
+from app.schemas.vehicle import VehicleCreate
+from app.services.dashboard_service import DashboardService
+from app.utils.security import create_access_token, hash_password
+from tests.conftest import auth_header
+from tests.test_api.test_vehicles import VEHICLE_DATA
+
+NORTH = "Scope test north"
+
+
+async def add_vehicle(db: AsyncSession, department: str, plate: str, vin: str) -> dict:
+    """A vehicle with one maintenance record, expense, contract and mileage log; returns their ids."""
+    data = VehicleCreate(**{**VEHICLE_DATA, "license_plate": plate, "vin": vin, "department": department})
+    vehicle = Vehicle(**data.model_dump())
+    db.add(vehicle)
+    await db.flush()
+    rows = {
+        "maintenance": MaintenanceRecord(
+            vehicle_id=vehicle.id, type=MaintenanceType.INSPECTION, title="Inspection", scheduled_date=date.today()
+        ),
+        "expenses": Expense(
+            vehicle_id=vehicle.id, category=ExpenseCategory.FUEL, amount=Decimal("100"), date=date.today(), fuel_liters=10
+        ),
+        "contracts": Contract(
+            vehicle_id=vehicle.id,
+            type=ContractType.INSURANCE_OSAGO,
+            contractor="Insurer",
+            start_date=date.today(),
+            end_date=date.today(),
+        ),
+    }
+    db.add_all([*rows.values(), MileageLog(vehicle_id=vehicle.id, value=1000)])
+    await db.flush()
+    return {"vehicle": vehicle, **{name: row.id for name, row in rows.items()}}
+
+
+@pytest_asyncio.fixture
+async def north(db_session: AsyncSession) -> dict:
+    return await add_vehicle(db_session, NORTH, "100 NRT 01", "NORTH000000000001")
+
+
+@pytest_asyncio.fixture
+async def south(db_session: AsyncSession) -> dict:
+    return await add_vehicle(db_session, "Scope test south", "200 STH 02", "SOUTH000000000002")
+
+
+@pytest_asyncio.fixture
+async def north_token(db_session: AsyncSession) -> str:
+    user = User(
+        id=uuid4(),
+        email="north@test.com",
+        username="northmanager",
+        full_name="North Manager",
+        hashed_password=hash_password("testpass123"),
+        role=UserRole.FLEET_MANAGER,
+        department=NORTH,
+        is_active=True,
+        language="en",
+    )
+    db_session.add(user)
+    await db_session.flush()
+    return create_access_token(user.id, user.role.value)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resource", ["maintenance", "expenses", "contracts"])
+async def test_other_departments_records_are_not_found(client: AsyncClient, north, south, north_token, resource):
+    """A scoped user gets 404 for another department's rows and never sees them in lists."""
+    headers = auth_header(north_token)
+
+    assert (await client.get(f"/api/v1/{resource}/{south[resource]}", headers=headers)).status_code == 404
+    assert (await client.get(f"/api/v1/{resource}/{north[resource]}", headers=headers)).status_code == 200
+    assert (await client.delete(f"/api/v1/{resource}/{south[resource]}", headers=headers)).status_code == 404
+
+    response = await client.get(f"/api/v1/{resource}", params={"size": 200}, headers=headers)
+    ids = {item["id"] for item in response.json()["items"]}
+    assert str(north[resource]) in ids and str(south[resource]) not in ids
+
+
+@pytest.mark.asyncio
+async def test_records_cannot_be_added_to_other_departments_vehicles(client: AsyncClient, south, north_token):
+    headers = auth_header(north_token)
+    vehicle_id = str(south["vehicle"].id)
+
+    response = await client.post(
+        "/api/v1/maintenance",
+        json={"vehicle_id": vehicle_id, "type": "inspection", "title": "Inspection"},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    response = await client.post("/api/v1/mileage", json={"vehicle_id": vehicle_id, "value": 2000}, headers=headers)
+    assert response.status_code == 400
+    assert (await client.get(f"/api/v1/mileage/vehicle/{vehicle_id}", headers=headers)).json() == []
+
+
+@pytest.mark.asyncio
+async def test_reports_only_cover_the_department(client: AsyncClient, north, south, north_token):
+    headers = auth_header(north_token)
+
+    tco = (await client.get("/api/v1/reports/tco", headers=headers)).json()
+    assert [row["license_plate"] for row in tco] == ["100 NRT 01"]
+    fuel = (await client.get("/api/v1/reports/fuel-consumption", headers=headers)).json()
+    assert [row["license_plate"] for row in fuel] == ["100 NRT 01"]
+    history = (await client.get("/api/v1/reports/maintenance-history", headers=headers)).json()
+    assert [row["id"] for row in history] == [str(north["maintenance"])]
+    expenses = (await client.get("/api/v1/reports/expense-analysis", headers=headers)).json()
+    assert (expenses["grand_total"], expenses["total_count"]) == (100, 1)
+    assert (await client.get("/api/v1/reports/fleet-utilization", headers=headers)).json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_dashboard_counts_only_cover_the_department(db_session: AsyncSession, north, south):
+    dashboard = DashboardService(db_session, NORTH)
+
+    assert (await dashboard.fleet_overview())["total"] == 1
+    assert (await dashboard.maintenance_stats())["scheduled"] == 1
+    assert [r["id"] for r in await dashboard.recent_maintenance()] == [str(north["maintenance"])]
+    assert (await dashboard.expense_summary())["total"] == 100
+    assert [v["license_plate"] for v in await dashboard.top_expensive_vehicles()] == ["100 NRT 01"]
+    assert (await dashboard.driver_stats())["total"] == 0
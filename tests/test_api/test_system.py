@@ -0,0 +1,25 @@
+"""Tests for system metrics API endpoints."""
+
+import pytest
+from httpx import AsyncClient
+
+from app.tasks import metrics
+from tests.conftest import auth_header
+
+
+@pytest.mark.asyncio
+async def test_queue_metrics(client: AsyncClient, admin_token: str, monkeypatch):
+    """GET /api/v1/system/queues returns per-queue depth and wait times."""
+    stats = {"ingestion": {"depth": 3, "wait_ms": {"samples": 1, "p50": 12, "p95": 12, "max": 12}}}
+    monkeypatch.setattr(metrics, "queue_stats", lambda: stats)
+
+    response = await client.get("/api/v1/system/queues", headers=auth_header(admin_token))
+    assert response.status_code == 200
+    assert response.json() == stats
+
+
+@pytest.mark.asyncio
+async def test_queue_metrics_require_view_system(client: AsyncClient, viewer_token: str):
+    """GET /api/v1/system/queues is for admins only."""
+    response = await client.get("/api/v1/system/queues", headers=auth_header(viewer_token))
+    assert response.status_code == 403
@@ -0,0 +1,177 @@
+"""Tests for the document listing cache serialization."""
+
+import uuid
+from datetime import UTC, datetime
+
+from app.models.document import Document, DocumentType, EntityType
+from app.services import document_service
+from app.services.document_cache import FILL_LISTING, dump_listing, listing_key, load_listing
+from app.services.document_service import DocumentService
+
+
+def test_listing_roundtrip():
+    """Cached listings rebuild the attributes the gallery and API read."""
+    entity_id = uuid.uuid4()
+    doc = Document(
+        id=uuid.uuid4(),
+        entity_type=EntityType.VEHICLE,
+        entity_id=entity_id,
+        type=DocumentType.PHOTO,
+        filename="front.jpg",
+        s3_key="blobs/ab/abc.jpg",
+        mime_type="image/jpeg",
+        size_bytes=1234,
+        uploaded_by=None,
+        uploaded_at=datetime(2026, 1, 5, 10, 30, tzinfo=UTC),
+        thumbnail_key="derived/thumbnail/blobs/ab/abc.webp",
+        preview_key="derived/preview/blobs/ab/abc.webp",
+    )
+
+    [loaded] = load_listing(dump_listing([doc]), EntityType.VEHICLE, entity_id)
+
+    for attr in ("id", "entity_type", "entity_id", "type", "filename", "s3_key", "mime_type",
+                 "size_bytes", "uploaded_by", "uploaded_at", "thumbnail_key", "preview_key"):
+        assert getattr(loaded, attr) == getattr(doc, attr)
+    assert listing_key(EntityType.VEHICLE, entity_id) == f"fleetcore:documents:vehicle:{entity_id}"
+
+
+class FakeRedis:
+    """Strings, pipelines and the FILL_LISTING script (evaluated in Python)."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    async def eval(self, script, numkeys, gen_key, key, seen, value, ttl):
+        assert script == FILL_LISTING
+        if self.data.get(gen_key, "") == seen:
+            self.data[key] = value
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def execute(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+async def test_listing_read_before_a_commit_is_not_cached(monkeypatch):
+    """A reader that queried before a writer's commit must not re-fill the cache after its invalidation."""
+    redis = FakeRedis()
+    monkeypatch.setattr(document_service, "get_async_redis", lambda: redis)
+    entity_id = uuid.uuid4()
+    reader, writer = DocumentService(session=None), DocumentService(session=None)
+
+    async def stale_query(entity_type, eid):
+        # The writer commits and invalidates while the reader's query is in flight
+        writer._changed_entities.add((entity_type, eid))
+        await writer._invalidate_listings(writer._changed_entities)
+        return []
+
+    monkeypatch.setattr(reader, "_query_listing", stale_query)
+    assert await reader.list_for_entity(EntityType.VEHICLE, entity_id) == []
+    assert listing_key(EntityType.VEHICLE, entity_id) not in redis.data
+
+    async def fresh_query(entity_type, eid):
+        return []
+
+    monkeypatch.setattr(reader, "_query_listing", fresh_query)
+    await reader.list_for_entity(EntityType.VEHICLE, entity_id)
+    assert redis.data[listing_key(EntityType.VEHICLE, entity_id)] == "[]"
+
+
+async def test_after_commit_survives_a_broker_outage(monkeypatch):
+    """The upload is already committed, so failing to queue ingestion must not fail the request."""
+    from app.tasks import ingestion
+
+    def broker_down(doc):
+        raise ConnectionError("broker unavailable")
+
+    monkeypatch.setattr(ingestion, "schedule_derivatives", broker_down)
+    monkeypatch.setattr(document_service, "get_async_redis", FakeRedis)
+    service = DocumentService(session=None)
+    service._uploaded.append(Document(id=uuid.uuid4()))
+    service._changed_entities.add((EntityType.VEHICLE, uuid.uuid4()))
+
+    await service.after_commit()
+    assert not service._uploaded and not service._changed_entities
+
+
+class DeleteSession:
+    """Records deletes; ``referenced`` are the keys rows still point at after the commit."""
+
+    def __init__(self, referenced=()):
+        self.referenced = list(referenced)
+        self.deleted = []
+
+    async def delete(self, instance):
+        self.deleted.append(instance)
+
+    async def flush(self):
+        pass
+
+    async def execute(self, stmt):
+        return self
+
+    def scalars(self):
+        return iter(self.referenced)
+
+
+class RecordingS3:
+    def __init__(self):
+        self.deleted = []
+
+    async def delete_files_async(self, keys):
+        self.deleted.extend(keys)
+
+
+async def test_released_objects_are_deleted_only_after_commit(monkeypatch):
+    """delete() leaves S3 alone; after_commit() deletes the objects no row references again."""
+    s3 = RecordingS3()
+
+    async def get_s3():
+        return s3
+
+    async def released(s3_key):
+        return True
+
+    monkeypatch.setattr(document_service, "get_s3_client_async", get_s3)
+    monkeypatch.setattr(document_service, "get_async_redis", FakeRedis)
+    doc = Document(
+        id=uuid.uuid4(),
+        entity_type=EntityType.VEHICLE,
+        entity_id=uuid.uuid4(),
+        s3_key="blobs/ab/abc.jpg",
+        thumbnail_key="derived/thumbnail/blobs/ab/abc.webp",
+    )
+    # A concurrent upload of the same content re-created the blob before after_commit()
+    session = DeleteSession(referenced=["blobs/ab/abc.jpg"])
+    service = DocumentService(session)
+
+    async def get(doc_id):
+        return doc
+
+    monkeypatch.setattr(service, "get", get)
+    monkeypatch.setattr(service, "_release_blob", released)
+
+    await service.delete(doc.id)
+    assert session.deleted == [doc]
+    assert s3.deleted == []
+
+    await service.after_commit()
+    assert s3.deleted == ["derived/thumbnail/blobs/ab/abc.webp"]
+    assert not service._released_keys
@@ -0,0 +1,131 @@
+"""Tests for failed-login throttling."""
+
+import uuid
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.config import settings
+from app.models.user import User, UserRole
+from app.services import login_throttle
+from app.services.auth_service import AuthService
+from app.services.login_throttle import LoginThrottledError
+from app.utils.security import hash_password
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None, nx=False):
+        self.ops.append(("set", key, value, ex, nx))
+
+    def incr(self, key):
+        self.ops.append(("incr", key))
+
+    async def execute(self):
+        for op in self.ops:
+            if op[0] == "set":
+                _, key, value, ex, nx = op
+                if not (nx and key in self.redis.data):
+                    self.redis.data[key] = str(value)
+                    self.redis.ttls[key] = ex
+            else:
+                self.redis.data[op[1]] = str(int(self.redis.data.get(op[1], 0)) + 1)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def ttl(self, key):
+        return self.ttls.get(key, -1)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class DownRedis:
+    def __getattr__(self, name):
+        raise RedisConnectionError("Redis is down")
+
+
+class UserRepo:
+    def __init__(self, user):
+        self.user = user
+
+    async def get_by_username(self, username):
+        return self.user if username == self.user.username else None
+
+
+@pytest.fixture
+def service():
+    user = User(
+        id=uuid.uuid4(),
+        username="driver1",
+        hashed_password=hash_password("right-password"),
+        role=UserRole.VIEWER,
+        is_active=True,
+    )
+    service = AuthService(None)
+    service.repo = UserRepo(user)
+    return service
+
+
+async def fail(service, times, ip="10.0.0.1"):
+    for _ in range(times):
+        with pytest.raises(ValueError) as exc_info:
+            await service.authenticate("driver1", "wrong", ip=ip)
+        assert not isinstance(exc_info.value, LoginThrottledError)
+
+
+@pytest.mark.asyncio
+async def test_limit_reached_refuses_even_the_right_password(service, monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(login_throttle, "get_async_redis", lambda: redis)
+
+    await fail(service, settings.LOGIN_MAX_FAILURES_PER_USERNAME)
+    with pytest.raises(LoginThrottledError) as exc_info:
+        await service.authenticate("driver1", "right-password", ip="10.0.0.2")
+    assert exc_info.value.retry_after == settings.LOGIN_RATE_WINDOW_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_successful_login_clears_the_username_count(service, monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(login_throttle, "get_async_redis", lambda: redis)
+
+    await fail(service, settings.LOGIN_MAX_FAILURES_PER_USERNAME - 1)
+    user, _, _ = await service.authenticate("driver1", "right-password", ip="10.0.0.1")
+    assert user.username == "driver1"
+
+    # A full set of fresh failures is needed before the username is throttled again
+    await fail(service, settings.LOGIN_MAX_FAILURES_PER_USERNAME - 1)
+    await service.authenticate("driver1", "right-password", ip="10.0.0.1")
+    # The IP count is not cleared by a successful login
+    assert redis.data[f"{login_throttle.THROTTLE_PREFIX}:ip:10.0.0.1"] == str(
+        2 * (settings.LOGIN_MAX_FAILURES_PER_USERNAME - 1)
+    )
+
+
+@pytest.mark.asyncio
+async def test_redis_down_does_not_throttle(service, monkeypatch):
+    monkeypatch.setattr(login_throttle, "get_async_redis", lambda: DownRedis())
+
+    await fail(service, settings.LOGIN_MAX_FAILURES_PER_USERNAME + 1)
+    user, _, _ = await service.authenticate("driver1", "right-password", ip="10.0.0.1")
+    assert user.username == "driver1"
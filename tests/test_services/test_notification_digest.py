@@ -0,0 +1,150 @@
+"""Tests for notification digest coalescing."""
+
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.models.notification import (
+    DeliveryChannel,
+    DeliveryStatus,
+    Notification,
+    NotificationDelivery,
+    NotificationType,
+)
+from app.models.user import User
+from app.services.digest_service import DIGEST_MAX_ITEMS, digest_window, group_deliveries, render_digest
+from app.tasks import notifications
+
+NOW = datetime(2026, 3, 1, 8, 0, tzinfo=UTC)
+
+
+def make_delivery(user_id, channel=DeliveryChannel.EMAIL, ntype=NotificationType.MAINTENANCE_REMINDER, age_minutes=0, title="Oil change"):
+    notification = Notification(user_id=user_id, title=title, message="Due <today>", type=ntype)
+    return NotificationDelivery(
+        notification=notification,
+        user_id=user_id,
+        channel=channel,
+        type=ntype,
+        created_at=NOW - timedelta(minutes=age_minutes),
+    )
+
+
+def test_groups_per_user_channel_and_type():
+    """Deliveries are coalesced per (user, channel, type)."""
+    alice, bob = uuid4(), uuid4()
+    deliveries = [make_delivery(alice) for _ in range(40)]
+    deliveries += [make_delivery(alice, channel=DeliveryChannel.TELEGRAM)]
+    deliveries += [make_delivery(alice, ntype=NotificationType.CONTRACT_EXPIRY)]
+    deliveries += [make_delivery(bob) for _ in range(3)]
+
+    groups = group_deliveries(deliveries)
+
+    assert len(groups) == 4
+    assert len(groups[0].deliveries) == 40
+    assert {g.user_id for g in groups} == {alice, bob}
+
+
+def test_digest_window_from_preferences():
+    """Digest frequency may be global or per channel; unknown values use the default."""
+    assert digest_window({"digest_frequency": "hourly"}, DeliveryChannel.EMAIL) == timedelta(hours=1)
+    per_channel = {"digest_frequency": {"email": "daily", "telegram": "immediate"}}
+    assert digest_window(per_channel, DeliveryChannel.EMAIL) == timedelta(days=1)
+    assert digest_window(per_channel, DeliveryChannel.TELEGRAM) == timedelta(0)
+    assert digest_window({"digest_frequency": 30}, DeliveryChannel.EMAIL) == timedelta(minutes=30)
+    assert digest_window(None, DeliveryChannel.EMAIL) == digest_window({"digest_frequency": "bogus"}, DeliveryChannel.EMAIL)
+
+
+def test_group_due_after_window_from_oldest():
+    """A group is flushed once its oldest delivery has waited a full window."""
+    uid = uuid4()
+    group = group_deliveries([make_delivery(uid, age_minutes=10), make_delivery(uid, age_minutes=2)])[0]
+
+    assert group.is_due(timedelta(minutes=5), NOW)
+    assert not group.is_due(timedelta(minutes=15), NOW)
+
+
+def test_render_digest_escapes_and_truncates():
+    """Digest bodies escape user content and cap the number of listed items."""
+    uid = uuid4()
+    count = DIGEST_MAX_ITEMS + 5
+    group = group_deliveries([make_delivery(uid, channel=DeliveryChannel.TELEGRAM) for _ in range(count)])[0]
+
+    subject, body = render_digest(group, "en")
+
+    assert subject == f"Maintenance reminders: {count} new"
+    assert "&lt;today&gt;" in body
+    assert body.count("•") == DIGEST_MAX_ITEMS
+    assert "and 5 more" in body
+
+
+def test_render_digest_in_the_recipients_language():
+    """Digest wording follows the recipient's language, Russian by default."""
+    uid = uuid4()
+    count = DIGEST_MAX_ITEMS + 2
+    group = group_deliveries([make_delivery(uid) for _ in range(count)])[0]
+
+    subject, body = render_digest(group)
+    assert subject == f"Напоминания о техобслуживании: новых — {count}"
+    assert "и ещё 2" in body
+
+    subject, _ = render_digest(group, "tr")
+    assert subject == f"Bakım hatırlatmaları: {count} yeni"
+
+
+def test_render_single_notification_keeps_title():
+    """A group with one notification is sent as-is, not as a digest."""
+    group = group_deliveries([make_delivery(uuid4(), title="Brake check")])[0]
+
+    subject, body = render_digest(group, "en")
+
+    assert subject == "Brake check"
+    assert "<li>" in body
+
+
+class FakeResult(list):
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self)
+
+
+class FakeSession:
+    """Answers the three selects in ``_flush_digests`` in order and logs commits."""
+
+    def __init__(self, events, *results):
+        self.events = events
+        self.results = list(results)
+
+    async def execute(self, statement):
+        return FakeResult(self.results.pop(0))
+
+    async def commit(self):
+        self.events.append("commit")
+
+
+@pytest.mark.parametrize("publish_fails", [False, True])
+async def test_digest_is_committed_before_it_is_enqueued(monkeypatch, publish_fails):
+    """Deliveries are marked sent and committed first; a failed publish puts them back to pending."""
+    user = User(id=uuid4(), email="a@example.com", is_active=True)
+    deliveries = [make_delivery(user.id, age_minutes=7 * 24 * 60) for _ in range(2)]
+    for delivery in deliveries:
+        delivery.status = DeliveryStatus.PENDING
+    events = []
+
+    def delay(*args):
+        events.append(("delay", [d.status for d in deliveries]))
+        if publish_fails:
+            raise ConnectionError("broker down")
+
+    monkeypatch.setattr(notifications.send_email_notification, "delay", delay)
+    result = await notifications._flush_digests(FakeSession(events, deliveries, [user], []))
+
+    assert events[:2] == ["commit", ("delay", [DeliveryStatus.SENT, DeliveryStatus.SENT])]
+    if publish_fails:
+        assert events[2:] == ["commit"]
+        assert [d.status for d in deliveries] == [DeliveryStatus.PENDING, DeliveryStatus.PENDING]
+        assert result["digests"] == 0
+    else:
+        assert result == {"digests": 1, "deliveries": 2, "skipped": 0}
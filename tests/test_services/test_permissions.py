@@ -0,0 +1,91 @@
+"""Tests for the role permission registry and department row scopes."""
+
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.document import Document, EntityType
+from app.models.maintenance import MaintenanceRecord
+from app.models.user import User, UserRole
+from app.models.vehicle import Vehicle
+from app.permissions import Permission, can, department_filters, department_scope, has_permission
+from app.repositories.base import BaseRepository
+from app.repositories.vehicle_repo import VehicleRepository
+from app.services import document_service
+from app.services.document_service import DocumentService
+
+
+def make_user(role: UserRole, department: str | None = None) -> User:
+    return User(id=uuid.uuid4(), role=role, department=department, is_active=True)
+
+
+def test_role_matrix():
+    """Roles keep the access the README documents."""
+    viewer, driver = make_user(UserRole.VIEWER), make_user(UserRole.DRIVER)
+    manager, admin = make_user(UserRole.FLEET_MANAGER), make_user(UserRole.ADMIN)
+
+    assert has_permission(viewer, Permission.VIEW)
+    assert not has_permission(viewer, Permission.RECORD_MILEAGE)
+    assert has_permission(driver, Permission.RECORD_MILEAGE)
+    assert not has_permission(driver, Permission.MANAGE_FLEET)
+    assert has_permission(manager, Permission.MANAGE_FLEET | Permission.MANAGE_DOCUMENTS)
+    assert not has_permission(manager, Permission.MANAGE_USERS)
+    assert all(has_permission(admin, permission) for permission in Permission)
+    assert can(manager, "manage_fleet") and not can(None, "view")
+
+
+def test_department_scope_is_part_of_the_query():
+    """Scoped users' repositories filter rows in SQL; admins are never scoped."""
+    manager = make_user(UserRole.FLEET_MANAGER, department="North")
+    assert department_scope(manager) == "North"
+    assert department_scope(make_user(UserRole.ADMIN, department="North")) is None
+    assert department_scope(make_user(UserRole.FLEET_MANAGER)) is None
+
+    repo = VehicleRepository(session=None, department=department_scope(manager))
+    sql = str(
+        repo.scoped(select(Vehicle)).compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+    assert "vehicles.department = 'North'" in sql
+
+
+def test_vehicle_records_follow_the_vehicle_department():
+    """Maintenance, expenses, contracts and mileage are scoped through their vehicle."""
+    repo = BaseRepository(MaintenanceRecord, session=None, department="North")
+    sql = str(
+        repo.scoped(select(MaintenanceRecord)).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert "maintenance_records.vehicle_id IN (SELECT vehicles.id" in sql
+    assert "vehicles.department = 'North'" in sql
+    assert department_filters(MaintenanceRecord, None) == []
+
+
+class ScopeSession:
+    """Answers the entity department check; fails on anything else."""
+
+    def __init__(self, in_department: bool):
+        self.in_department = in_department
+
+    async def scalar(self, statement):
+        return self.in_department
+
+
+async def test_documents_follow_the_owning_entity_department(monkeypatch):
+    """Scoped users see no documents of other departments' entities."""
+    def no_cache():
+        raise AssertionError("listing cache must not be consulted out of scope")
+
+    monkeypatch.setattr(document_service, "get_async_redis", no_cache)
+    service = DocumentService(ScopeSession(in_department=False), department="North")
+    assert await service.list_for_entity(EntityType.VEHICLE, uuid.uuid4()) == []
+
+    sql = str(
+        select(Document).where(*service._scope()).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert "vehicles.department = 'North'" in sql and "drivers.department = 'North'" in sql
+    assert "maintenance_records.vehicle_id IN" in sql and "expenses.vehicle_id IN" in sql
+    assert DocumentService(session=None)._scope() == []
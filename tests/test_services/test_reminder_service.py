@@ -0,0 +1,75 @@
+"""Tests for ReminderService counts (needs the test database)."""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.driver import Driver, DriverStatus
+from app.models.maintenance import MaintenanceRecord, MaintenanceStatus, MaintenanceType
+from app.schemas.vehicle import VehicleCreate
+from app.services.reminder_service import EXPIRY_LOOKAHEAD_DAYS, MAINTENANCE_LOOKAHEAD_DAYS, ReminderService
+from app.services.vehicle_service import VehicleService
+from tests.test_services.test_vehicle_service import VEHICLE_CREATE_DATA
+
+TODAY = date(2090, 6, 1)
+
+
+def days(n: int) -> date:
+    return TODAY + timedelta(days=n)
+
+
+@pytest.mark.asyncio
+async def test_counts_each_category_within_its_window(db_session: AsyncSession):
+    """Each category counts only active/scheduled rows inside its look-ahead window."""
+    service = ReminderService(db_session, today=TODAY)
+    before = await service.counts()  # rows already in the database, e.g. past maintenance
+    vehicle = await VehicleService(db_session).create(VehicleCreate(**VEHICLE_CREATE_DATA))
+
+    def maintenance(when: date, status=MaintenanceStatus.SCHEDULED) -> MaintenanceRecord:
+        return MaintenanceRecord(
+            vehicle_id=vehicle.id,
+            type=MaintenanceType.INSPECTION,
+            title="Inspection",
+            status=status,
+            scheduled_date=when,
+        )
+
+    def contract(end: date, status=ContractStatus.ACTIVE) -> Contract:
+        return Contract(
+            vehicle_id=vehicle.id,
+            type=ContractType.INSURANCE_OSAGO,
+            contractor="Insurer",
+            start_date=days(-365),
+            end_date=end,
+            status=status,
+        )
+
+    db_session.add_all(
+        [
+            maintenance(days(-1)),  # overdue
+            maintenance(days(-1), MaintenanceStatus.COMPLETED),
+            maintenance(days(0)),  # upcoming
+            maintenance(days(MAINTENANCE_LOOKAHEAD_DAYS)),  # upcoming
+            maintenance(days(MAINTENANCE_LOOKAHEAD_DAYS + 1)),
+            contract(days(EXPIRY_LOOKAHEAD_DAYS)),  # expiring
+            contract(days(EXPIRY_LOOKAHEAD_DAYS + 1)),
+            contract(days(5), ContractStatus.CANCELLED),
+            Driver(full_name="A", license_expiry=days(10), medical_expiry=days(-1)),  # license
+            Driver(full_name="B", license_expiry=days(10), status=DriverStatus.TERMINATED),
+            Driver(full_name="C", medical_expiry=days(EXPIRY_LOOKAHEAD_DAYS)),  # medical
+        ]
+    )
+    await db_session.flush()
+
+    counts = await service.counts()
+
+    assert {name: counts[name] - before[name] for name in counts} == {
+        "overdue_maintenance": 1,
+        "upcoming_maintenance": 2,
+        "expiring_contracts": 1,
+        "expiring_licenses": 1,
+        "expiring_medical": 1,
+    }
+    assert await service.counts("expiring_licenses") == {"expiring_licenses": counts["expiring_licenses"]}
@@ -0,0 +1,88 @@
+"""Tests for the stateless JWT principal and token revocation."""
+
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.api import deps
+from app.api.v1 import users
+from app.config import settings
+from app.models.user import User, UserRole
+from app.schemas.user import UserUpdate
+from app.services import token_revocation
+from app.utils.security import create_access_token
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = str(value)
+
+
+class DownRedis:
+    async def set(self, key, value, ex=None):
+        raise RedisConnectionError("Redis is down")
+
+
+class UserSession:
+    """Stands in for the database; counts user loads."""
+
+    def __init__(self, user):
+        self.user = user
+        self.gets = 0
+        self.commits = 0
+
+    async def get(self, model, id):
+        self.gets += 1
+        return self.user
+
+    async def flush(self):
+        pass
+
+    async def refresh(self, instance):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.mark.asyncio
+async def test_role_claim_is_trusted_until_revoked(monkeypatch):
+    """Role checks skip the user load until the user's tokens are revoked."""
+    redis = FakeRedis()
+    monkeypatch.setattr(token_revocation, "get_async_redis", lambda: redis)
+    monkeypatch.setattr(settings, "JWT_STATELESS_ROLES", True)
+    user = User(id=uuid.uuid4(), role=UserRole.VIEWER, is_active=True)
+    db = UserSession(user)
+    token = create_access_token(user.id, UserRole.FLEET_MANAGER.value)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    principal = await deps.get_token_principal(credentials, db)
+    assert (principal.id, principal.role) == (user.id, UserRole.FLEET_MANAGER)
+    assert db.gets == 0
+
+    await token_revocation.revoke_tokens(user.id)
+    principal = await deps.get_token_principal(credentials, db)
+    assert principal is user
+    assert db.gets == 1
+
+
+@pytest.mark.asyncio
+async def test_role_change_is_refused_while_revocation_fails(monkeypatch):
+    """If Redis rejects the revocation, the API answers 503 before committing the change."""
+    monkeypatch.setattr(token_revocation, "get_async_redis", lambda: DownRedis())
+    user = User(id=uuid.uuid4(), role=UserRole.FLEET_MANAGER, is_active=True)
+    db = UserSession(user)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await users.update_user(user.id, UserUpdate(role=UserRole.VIEWER), db, None)
+    assert exc_info.value.status_code == 503
+    assert db.commits == 0
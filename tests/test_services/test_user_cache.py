@@ -0,0 +1,98 @@
+"""Tests for the authenticated user cache."""
+
+import uuid
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.models.user import User, UserRole
+from app.services import user_cache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class DownRedis:
+    async def get(self, *args, **kwargs):
+        raise ConnectionError("down")
+
+    set = delete = get
+
+
+class CountingSession:
+    def __init__(self, user):
+        self.user = user
+        self.gets = 0
+
+    async def get(self, model, id):
+        self.gets += 1
+        return self.user if self.user and self.user.id == id else None
+
+
+def make_user():
+    return User(
+        id=uuid.uuid4(),
+        email="manager@example.com",
+        username="manager",
+        full_name="Fleet Manager",
+        role=UserRole.FLEET_MANAGER,
+        is_active=True,
+        language="en",
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    user_cache._local.clear()
+    yield
+    user_cache._local.clear()
+
+
+@pytest.mark.asyncio
+async def test_user_is_loaded_once_until_invalidated(monkeypatch):
+    """Repeat lookups are served from the caches; invalidation forces a reload."""
+    redis = FakeRedis()
+    monkeypatch.setattr(user_cache, "get_async_redis", lambda: redis)
+    user = make_user()
+    db = CountingSession(user)
+
+    first = await user_cache.get_user(db, user.id)
+    second = await user_cache.get_user(db, user.id)
+    assert db.gets == 1
+    assert first is not second
+    for attr in ("id", "email", "username", "full_name", "role", "is_active", "language"):
+        assert getattr(second, attr) == getattr(user, attr)
+
+    # Another process only has the Redis copy
+    user_cache._local.clear()
+    await user_cache.get_user(db, user.id)
+    assert db.gets == 1
+
+    user.role = UserRole.VIEWER
+    await user_cache.invalidate_user(user.id)
+    assert (await user_cache.get_user(db, user.id)).role == UserRole.VIEWER
+    assert db.gets == 2
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_database_without_redis(monkeypatch):
+    """A Redis outage degrades to database reads; unknown users are not cached."""
+    monkeypatch.setattr(user_cache, "get_async_redis", lambda: DownRedis())
+    user = make_user()
+    db = CountingSession(user)
+
+    assert (await user_cache.get_user(db, user.id)).username == "manager"
+    assert await user_cache.get_user(db, uuid.uuid4()) is None
+    assert db.gets == 2
+    await user_cache.invalidate_user(user.id)
@@ -0,0 +1,101 @@
+"""Cold-start benchmarks for the web app and the Celery app.
+
+Each start runs in a fresh interpreter without Vault: the web app is built
+with ``create_app()`` and the Celery app resolves its broker. Heavy libraries
+must stay out of startup; the time budgets are generous and only catch large
+regressions. Run with ``-s`` to see the measured times.
+
+Importing the modules alone must not build Settings, so it never reads Vault.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests.test_utils.test_vault import TOKEN, FakeVault
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Imported on first use only (exports, S3, image/PDF processing, Vault)
+LAZY_MODULES = {"openpyxl", "boto3", "botocore", "PIL", "pypdf", "hvac"}
+
+# Startup code run after the import, by module
+STARTUP = {
+    "app.main": "app.main.create_app()",
+    "app.tasks.celery_app": "app.tasks.celery_app.celery_app.conf.broker_url",
+}
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+{startup}
+import app.config
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "modules": sorted(sys.modules),
+    "settings_loaded": app.config._current is not None,
+}}))
+"""
+
+
+def cold_import(module: str, startup: str = "", **vault_env: str) -> dict:
+    env = {k: v for k, v in os.environ.items() if not k.startswith("VAULT_")} | vault_env
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(module=module, startup=startup)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    ("module", "budget_seconds", "lazy"),
+    [
+        ("app.main", 4.0, LAZY_MODULES | {"celery"}),
+        ("app.tasks.celery_app", 2.0, LAZY_MODULES),
+    ],
+)
+def test_cold_import(module: str, budget_seconds: float, lazy: set[str]):
+    result = cold_import(module, STARTUP[module])
+    print(f"\n{module}: {result['seconds'] * 1000:.0f} ms")
+
+    loaded = {name.split(".")[0] for name in result["modules"]} & lazy
+    assert not loaded, f"{module} imports {sorted(loaded)} at startup"
+    assert result["seconds"] < budget_seconds
+
+
+@pytest.fixture
+def vault_env(tmp_path):
+    vault = FakeVault()
+    vault.secrets = {"TELEGRAM_BOT_TOKEN": "from-vault"}
+    yield vault, {"VAULT_ADDR": vault.url, "VAULT_TOKEN": TOKEN, "VAULT_CACHE_FILE": str(tmp_path / "vault.json")}
+    vault.server.shutdown()
+    vault.server.server_close()
+
+
+def test_cold_start_reads_vault_once_per_cache_ttl(vault_env):
+    vault, env = vault_env
+    for module in ("app.main", "app.tasks.celery_app"):
+        result = cold_import(module, STARTUP[module], **env)
+        print(f"\n{module} with Vault: {result['seconds'] * 1000:.0f} ms")
+
+    # The first start loads the secrets; the second is served from the cache file
+    assert vault.reads == 1
+
+
+@pytest.mark.parametrize("module", ["app.main", "app.tasks.celery_app", "app.database", "app.utils.s3"])
+def test_import_does_not_read_vault(module: str, vault_env):
+    vault, env = vault_env
+
+    result = cold_import(module, **env)
+
+    assert not result["settings_loaded"]
+    assert vault.reads == 0
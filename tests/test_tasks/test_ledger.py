@@ -0,0 +1,108 @@
+"""Tests for scheduled-task run keys and the exactly-once guard.
+
+The ledger SQL test needs the test database (see tests/conftest.py).
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task_run import TaskRun, TaskRunStatus
+from app.tasks import ledger
+from app.tasks.ledger import exactly_once, run_key_for
+
+
+def test_daily_run_key_is_stable_within_a_day():
+    """Beat firing twice on the same UTC day maps to the same ledger slot."""
+    day = timedelta(days=1)
+    first = run_key_for(datetime(2026, 3, 1, 8, 0, tzinfo=UTC), day)
+    again = run_key_for(datetime(2026, 3, 1, 8, 0, 40, tzinfo=UTC), day)
+    tomorrow = run_key_for(datetime(2026, 3, 2, 8, 0, tzinfo=UTC), day)
+
+    assert first == again == "2026-03-01T00:00:00+00:00"
+    assert tomorrow != first
+
+
+def test_sub_hour_slots():
+    """Five-minute jobs get one slot per five-minute window."""
+    slot = timedelta(minutes=5)
+    assert run_key_for(datetime(2026, 3, 1, 8, 4, 59, tzinfo=UTC), slot) == "2026-03-01T08:00:00+00:00"
+    assert run_key_for(datetime(2026, 3, 1, 8, 5, tzinfo=UTC), slot) == "2026-03-01T08:05:00+00:00"
+
+
+class FakeLock:
+    def acquire(self):
+        return True
+
+    def release(self):
+        pass
+
+
+class FakeRedis:
+    def lock(self, name, timeout, blocking):
+        return FakeLock()
+
+
+class FakeLedger:
+    """Stands in for run_async(_claim/_finish) with the ledger's claim rules."""
+
+    def __init__(self):
+        self.rows: dict[tuple[str, str], dict] = {}
+
+    def __call__(self, fn, task_name, run_key, *args, **kwargs):
+        key = (task_name, run_key)
+        if fn is ledger._claim:
+            row = self.rows.get(key)
+            if row is not None and row["status"] != TaskRunStatus.FAILED:
+                return False
+            row = self.rows.setdefault(key, {"attempts": 0})
+            row.update(status=TaskRunStatus.RUNNING, attempts=row["attempts"] + 1)
+            return True
+        status = args[0]
+        self.rows[key].update(status=status, result=kwargs.get("result"), error=kwargs.get("error"))
+
+
+def test_exactly_once_skips_a_finished_slot_and_records_failures(monkeypatch):
+    """A second run in the same slot is skipped; a failed run is recorded and may be retried."""
+    fake_ledger = FakeLedger()
+    monkeypatch.setattr(ledger, "run_async", fake_ledger)
+    monkeypatch.setattr(ledger, "get_redis", FakeRedis)
+    outcomes = [RuntimeError("SMTP down"), {"sent": 3}]
+
+    @exactly_once(timedelta(days=1))
+    def daily_job():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with pytest.raises(RuntimeError):
+        daily_job()
+    [row] = fake_ledger.rows.values()
+    assert row["status"] == TaskRunStatus.FAILED and "SMTP down" in row["error"]
+
+    assert daily_job() == {"sent": 3}
+    assert row["status"] == TaskRunStatus.SUCCEEDED and row["attempts"] == 2
+
+    assert daily_job()["skipped"] == "already_ran"
+    assert outcomes == []
+
+
+@pytest.mark.asyncio
+async def test_claim_rules_in_the_database(db_session: AsyncSession):
+    """A slot is claimed once; only failed or abandoned runs can be claimed again."""
+    slot = ("tests.daily_job", "2026-03-01T00:00:00+00:00")
+    hour = timedelta(hours=1)
+
+    assert await ledger._claim(db_session, *slot, hour)
+    assert not await ledger._claim(db_session, *slot, hour)
+
+    await ledger._finish(db_session, *slot, TaskRunStatus.FAILED, error="boom")
+    assert await ledger._claim(db_session, *slot, hour)
+    await ledger._finish(db_session, *slot, TaskRunStatus.SUCCEEDED, result={"ok": True})
+    assert not await ledger._claim(db_session, *slot, hour)
+
+    run = (await db_session.execute(select(TaskRun).where(TaskRun.task_name == slot[0]))).scalar_one()
+    assert (run.status, run.attempts, run.result) == (TaskRunStatus.SUCCEEDED, 2, {"ok": True})
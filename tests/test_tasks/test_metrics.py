@@ -0,0 +1,72 @@
+"""Tests for Celery queue routing and queue latency metrics."""
+
+import fnmatch
+import time
+from types import SimpleNamespace
+
+from app.tasks import metrics
+from app.tasks.celery_app import celery_app
+
+
+class FakeRedis:
+    def __init__(self, lengths=None):
+        self.lists = {}
+        self.lengths = lengths or {}
+
+    def pipeline(self):
+        return self
+
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, str(value))
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lists[key][start : end + 1]
+
+    def execute(self):
+        pass
+
+    def lrange(self, key, start, end):
+        return self.lists.get(key, [])
+
+    def llen(self, key):
+        return self.lengths.get(key, 0)
+
+
+def fake_task(enqueued_at: float, queue: str):
+    request = SimpleNamespace(headers={"enqueued_at": enqueued_at}, delivery_info={"routing_key": queue})
+    return SimpleNamespace(request=request)
+
+
+def test_wait_times_are_recorded_and_summarised(monkeypatch):
+    redis = FakeRedis(lengths={"ingestion": 7})
+    monkeypatch.setattr(metrics, "get_redis", lambda: redis)
+    monkeypatch.setattr(metrics, "LATENCY_SAMPLES", 50)
+
+    headers = {}
+    metrics._stamp_enqueue_time(headers=headers)
+    assert headers["enqueued_at"] <= time.time()
+
+    now = time.time()
+    for wait_ms in range(1, 101):
+        metrics._record_wait_time(task=fake_task(now - wait_ms / 1000, "ingestion"))
+
+    stats = metrics.queue_stats()
+    ingestion = stats["ingestion"]
+    assert ingestion["depth"] == 7
+    assert ingestion["wait_ms"]["samples"] == 50  # capped, newest kept
+    assert 50 <= ingestion["wait_ms"]["p50"] <= ingestion["wait_ms"]["p95"] <= ingestion["wait_ms"]["max"]
+    assert stats["notifications"]["wait_ms"] == {"samples": 0, "p50": None, "p95": None, "max": None}
+
+
+def test_every_route_matches_a_task_and_only_ingestion_acks_late():
+    celery_app.loader.import_default_modules()
+    names = [name for name in celery_app.tasks if name.startswith("app.tasks.")]
+
+    for pattern, route in celery_app.conf.task_routes.items():
+        assert fnmatch.filter(names, pattern), f"route {pattern} -> {route['queue']} matches no task"
+
+    acks_late = sorted(name for name in names if celery_app.tasks[name].acks_late)
+    assert acks_late == [
+        "app.tasks.ingestion.extract_document_text",
+        "app.tasks.ingestion.generate_document_derivatives",
+    ]
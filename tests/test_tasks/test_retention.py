@@ -0,0 +1,116 @@
+"""Tests for notification and task_runs retention batches.
+
+The archive/purge tests need the test database (see tests/conftest.py).
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.notification import Notification, NotificationArchive, NotificationType
+from app.models.task_run import TaskRun, TaskRunStatus
+from app.models.user import User
+from app.tasks import retention
+
+NOW = datetime.now(UTC)
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_MAX_BATCHES", 200)
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_PAUSE_SECONDS", 0)
+
+
+def make_notification(user: User, age_days: int, is_read: bool) -> Notification:
+    return Notification(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        title=f"{age_days} days old",
+        message="Oil change due",
+        type=NotificationType.MAINTENANCE_REMINDER,
+        is_read=is_read,
+        created_at=NOW - timedelta(days=age_days),
+    )
+
+
+class CountingSession:
+    """Every statement affects a full batch; records commits."""
+
+    def __init__(self):
+        self.commits = 0
+
+    async def execute(self, statement):
+        return statement
+
+    async def commit(self):
+        self.commits += 1
+
+
+async def test_batches_stop_at_the_cap(monkeypatch, small_batches):
+    """A backlog larger than MAX_BATCHES * BATCH_SIZE is left for the next run."""
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_MAX_BATCHES", 3)
+    db = CountingSession()
+
+    total = await retention._run_batches(db, lambda: "batch", lambda result: 2)
+
+    assert total == 6
+    assert db.commits == 3  # one short transaction per batch
+
+
+async def test_read_notifications_are_archived_then_purged(db_session: AsyncSession, admin_user: User, small_batches):
+    """Old read rows move to the archive in batches; unread and recent rows stay; old archive rows are purged."""
+    old_read = [make_notification(admin_user, settings.NOTIFICATION_RETENTION_DAYS + 1, True) for _ in range(5)]
+    kept = [
+        make_notification(admin_user, settings.NOTIFICATION_RETENTION_DAYS + 1, False),
+        make_notification(admin_user, 1, True),
+    ]
+    expired = NotificationArchive(
+        id=uuid.uuid4(),
+        user_id=admin_user.id,
+        title="ancient",
+        message="",
+        type=NotificationType.SYSTEM,
+        created_at=NOW - timedelta(days=800),
+        archived_at=NOW - timedelta(days=settings.NOTIFICATION_ARCHIVE_RETENTION_DAYS + 1),
+    )
+    db_session.add_all([*old_read, *kept, expired])
+    await db_session.flush()
+
+    result = await retention._apply_retention(db_session)
+
+    assert (result["archived"], result["purged"]) == (5, 1)
+    remaining = set((await db_session.execute(select(Notification.id))).scalars())
+    archived = set((await db_session.execute(select(NotificationArchive.id))).scalars())
+    assert {n.id for n in kept} <= remaining
+    assert not remaining & {n.id for n in old_read}
+    assert {n.id for n in old_read} <= archived
+    assert expired.id not in archived
+
+
+async def test_old_task_runs_are_purged(db_session: AsyncSession, small_batches):
+    """Ledger rows older than TASK_RUN_RETENTION_DAYS are deleted in batches, recent ones stay."""
+
+    def make_run(age_days: int, slot: int) -> TaskRun:
+        return TaskRun(
+            task_name="app.tasks.notifications.send_digests",
+            run_key=f"test-slot-{age_days}-{slot}",
+            status=TaskRunStatus.SUCCEEDED,
+            started_at=NOW - timedelta(days=age_days),
+        )
+
+    old = [make_run(settings.TASK_RUN_RETENTION_DAYS + 1, slot) for slot in range(5)]
+    recent = make_run(1, 0)
+    db_session.add_all([*old, recent])
+    await db_session.flush()
+
+    result = await retention._apply_retention(db_session)
+
+    assert result["task_runs_purged"] == 5
+    remaining = set((await db_session.execute(select(TaskRun.id))).scalars())
+    assert recent.id in remaining
+    assert not remaining & {run.id for run in old}
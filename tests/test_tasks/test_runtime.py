@@ -0,0 +1,67 @@
+"""Tests for the worker-local asyncio runtime."""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.tasks import runtime
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """Engines created by the runtime; nothing connects, sessions below run no SQL."""
+    created = []
+
+    def create(url, **kwargs):
+        created.append(create_async_engine("postgresql+asyncpg://fleetcore@127.0.0.1:1/fleetcore"))
+        return created[-1]
+
+    monkeypatch.setattr(runtime, "create_async_engine", create)
+    monkeypatch.setattr(runtime, "_loop", None)
+    monkeypatch.setattr(runtime, "_engine", None)
+    yield created
+    runtime._dispose_runtime()
+
+
+def test_loop_and_engine_are_reused_until_shutdown(engines, monkeypatch):
+    disposed = []
+
+    async def dispose(self, close=True):
+        disposed.append(self)
+
+    monkeypatch.setattr(AsyncEngine, "dispose", dispose)
+
+    async def current_loop(db, offset):
+        return asyncio.get_running_loop(), db.bind, offset + 1
+
+    loop, bind, result = runtime.run_async(current_loop, 1)
+    assert result == 2
+    assert runtime.run_async(current_loop, 0)[:2] == (loop, bind)
+    assert len(engines) == 1
+
+    runtime._dispose_runtime()
+    assert loop.is_closed()
+    assert disposed == engines
+
+    # The next task in the same process starts a fresh runtime
+    assert runtime.run_async(current_loop, 0)[0] is not loop
+    assert len(engines) == 2
+
+
+def test_errors_roll_back_and_propagate(engines):
+    rolled_back = []
+
+    async def failing(db):
+        original = db.rollback
+
+        async def rollback():
+            rolled_back.append(True)
+            await original()
+
+        db.rollback = rollback
+        raise LookupError("no such vehicle")
+
+    with pytest.raises(LookupError):
+        runtime.run_async(failing)
+    assert rolled_back == [True]
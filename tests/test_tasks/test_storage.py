@@ -0,0 +1,149 @@
+"""Tests for storage reconciliation.
+
+The purge and reconcile tests need the test database (see tests/conftest.py).
+"""
+
+import logging
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document import Document, DocumentBlob, EntityType
+from app.models.vehicle import BodyType, FuelType, TransmissionType, Vehicle
+from app.tasks import storage
+from app.tasks.storage import DANGLING, ORPHAN, merge_diff
+
+T = datetime(2026, 1, 1, tzinfo=UTC)
+GRACE = timedelta(hours=24)
+
+
+async def aiter_of(items):
+    for item in items:
+        yield item
+
+
+async def test_merge_diff_finds_orphans_and_dangling():
+    """Keys only in the bucket are orphans, keys only in the database are dangling."""
+    objects = [("blobs/00/a.pdf", T), ("blobs/11/b.pdf", T), ("derived/thumbnail/x.webp", T), ("z", T)]
+    referenced = ["blobs/00/a.pdf", "blobs/0f/missing.pdf", "derived/thumbnail/x.webp"]
+
+    diff = [(kind, key) async for kind, key, _ in merge_diff(aiter_of(objects), aiter_of(referenced))]
+
+    assert diff == [
+        (DANGLING, "blobs/0f/missing.pdf"),
+        (ORPHAN, "blobs/11/b.pdf"),
+        (ORPHAN, "z"),
+    ]
+
+
+async def test_merge_diff_empty_sides():
+    """Either side may be empty."""
+    assert [d async for d in merge_diff(aiter_of([]), aiter_of(["a"]))] == [(DANGLING, "a", None)]
+    assert [d async for d in merge_diff(aiter_of([("a", T)]), aiter_of([]))] == [(ORPHAN, "a", T)]
+
+
+class FakeBucket:
+    """Lists ``objects`` (key -> last modified) in key order and records deletes."""
+
+    def __init__(self, objects: dict[str, datetime]):
+        self.objects = objects
+        self.deleted: list[str] = []
+
+    async def iter_objects_async(self):
+        for key in sorted(self.objects):
+            yield key, self.objects[key]
+
+    async def delete_files_async(self, keys):
+        self.deleted.extend(keys)
+
+
+def make_vehicle() -> Vehicle:
+    suffix = uuid.uuid4().hex[:6].upper()
+    return Vehicle(
+        id=uuid.uuid4(),
+        license_plate=f"T{suffix}",
+        vin=f"TESTVIN{suffix}0000"[:17],
+        brand="Toyota",
+        model="Camry",
+        year=2023,
+        body_type=BodyType.SEDAN,
+        fuel_type=FuelType.GASOLINE,
+        transmission=TransmissionType.AUTOMATIC,
+    )
+
+
+def make_document(entity_id: uuid.UUID, s3_key: str) -> Document:
+    return Document(
+        id=uuid.uuid4(),
+        entity_type=EntityType.VEHICLE,
+        entity_id=entity_id,
+        filename="scan.pdf",
+        s3_key=s3_key,
+        mime_type="application/pdf",
+        size_bytes=10,
+    )
+
+
+def make_blob(s3_key: str, ref_count: int) -> DocumentBlob:
+    return DocumentBlob(sha256=uuid.uuid4().hex * 2, s3_key=s3_key, size_bytes=10, ref_count=ref_count)
+
+
+async def test_detached_documents_are_purged(db_session: AsyncSession):
+    """Documents of deleted entities go; shared blobs keep the remaining references, unused blobs go."""
+    vehicle = make_vehicle()
+    kept = make_document(vehicle.id, "blobs/aa/shared.pdf")
+    detached = [
+        make_document(uuid.uuid4(), "blobs/aa/shared.pdf"),
+        make_document(uuid.uuid4(), "blobs/bb/alone.pdf"),
+    ]
+    db_session.add_all([vehicle, make_blob("blobs/aa/shared.pdf", 2), make_blob("blobs/bb/alone.pdf", 1)])
+    await db_session.flush()
+    db_session.add_all([kept, *detached])
+    await db_session.flush()
+
+    assert await storage._purge_detached_documents(db_session) == 2
+
+    ids = set((await db_session.execute(select(Document.id))).scalars())
+    assert kept.id in ids and not ids & {doc.id for doc in detached}
+    blobs = dict((await db_session.execute(select(DocumentBlob.s3_key, DocumentBlob.ref_count))).tuples())
+    assert blobs.get("blobs/aa/shared.pdf") == 1
+    assert "blobs/bb/alone.pdf" not in blobs
+
+
+async def test_orphans_within_the_grace_period_are_kept(db_session: AsyncSession, monkeypatch):
+    """Only unreferenced objects older than the grace period are deleted."""
+    vehicle = make_vehicle()
+    db_session.add(vehicle)
+    await db_session.flush()
+    db_session.add(make_document(vehicle.id, "blobs/aa/referenced.pdf"))
+    await db_session.flush()
+    now = datetime.now(UTC)
+    bucket = FakeBucket(
+        {
+            "blobs/aa/referenced.pdf": now - 2 * GRACE,
+            "blobs/bb/old-orphan.pdf": now - 2 * GRACE,
+            "blobs/cc/new-orphan.pdf": now - GRACE / 2,  # e.g. an upload whose commit is in flight
+        }
+    )
+    monkeypatch.setattr(storage, "get_s3_client", lambda: bucket)
+
+    stats = await storage._reconcile(db_session, GRACE, dry_run=False)
+
+    assert bucket.deleted == ["blobs/bb/old-orphan.pdf"]
+    assert (stats["orphans_deleted"], stats["orphans_in_grace"], stats["dry_run"]) == (1, 1, False)
+
+
+async def test_empty_database_only_reports(db_session: AsyncSession, monkeypatch, caplog):
+    """With no documents at all every object looks orphaned, so nothing is deleted."""
+    await db_session.execute(delete(Document))
+    bucket = FakeBucket({"blobs/aa/a.pdf": T, "blobs/bb/b.pdf": T})
+    monkeypatch.setattr(storage, "get_s3_client", lambda: bucket)
+
+    with caplog.at_level(logging.WARNING, logger=storage.__name__):
+        stats = await storage._reconcile(db_session, GRACE, dry_run=False)
+
+    assert bucket.deleted == []
+    assert stats["dry_run"] is True and stats["orphans_deleted"] == 2
+    assert "dry run" in caplog.text
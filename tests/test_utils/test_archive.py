@@ -0,0 +1,30 @@
+"""Tests for streamed zip archives."""
+
+import io
+import zipfile
+from datetime import datetime
+
+from app.utils.archive import ZipEntry, stream_zip
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def test_stream_zip_roundtrip():
+    """The streamed archive is a valid zip; duplicate names are kept apart."""
+    entries = [
+        ZipEntry("scan.pdf", chunks(b"%PDF-", b"1.7"), datetime(2025, 3, 1, 12, 0), compress=False),
+        ZipEntry("scan.pdf", chunks(b"again " * 1000)),
+        ZipEntry("notes/a.txt", chunks()),
+    ]
+    data = b"".join([chunk async for chunk in stream_zip(entries)])
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["scan.pdf", "scan (2).pdf", "notes_a.txt"]
+        assert archive.read("scan.pdf") == b"%PDF-1.7"
+        assert archive.getinfo("scan.pdf").date_time == (2025, 3, 1, 12, 0, 0)
+        assert archive.read("scan (2).pdf") == b"again " * 1000
+        assert archive.read("notes_a.txt") == b""
@@ -0,0 +1,34 @@
+"""Tests for connection pool checkout telemetry."""
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from app.database import InstrumentedPool
+
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkout_waits_and_timeouts():
+    pool = InstrumentedPool(FakeConnection, pool_size=1, max_overflow=0, timeout=0.05)
+
+    def checkouts():
+        held = pool.connect()
+        with pytest.raises(PoolTimeoutError):
+            pool.connect()
+        held.close()
+        pool.connect().close()
+
+    await greenlet_spawn(checkouts)
+
+    assert pool.timeouts == 1
+    assert len(pool.wait_ms) == 3
+    # The checkout that found the only connection taken waited out the timeout
+    assert pool.wait_ms[1] >= 50
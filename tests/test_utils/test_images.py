@@ -0,0 +1,41 @@
+"""Tests for WebP thumbnail/preview rendering."""
+
+from io import BytesIO
+
+from PIL import Image
+
+from app.utils.images import DERIVATIVE_SIZES, derived_key, render_derivatives
+
+
+def make_jpeg(width: int, height: int, orientation: int | None = None) -> bytes:
+    out = BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    Image.new("RGB", (width, height), "red").save(out, "JPEG", exif=exif)
+    return out.getvalue()
+
+
+def test_derived_key():
+    """Derived keys live under derived/<variant>/ with a .webp extension."""
+    assert derived_key("vehicle/1/abc.jpg", "thumbnail") == "derived/thumbnail/vehicle/1/abc.webp"
+    assert derived_key("uploads/abc", "preview") == "derived/preview/uploads/abc.webp"
+
+
+def test_render_derivatives_sizes():
+    """Every variant is a WebP bounded by its size, keeping the aspect ratio."""
+    rendered = render_derivatives(make_jpeg(4000, 3000))
+
+    assert set(rendered) == set(DERIVATIVE_SIZES)
+    for variant, data in rendered.items():
+        with Image.open(BytesIO(data)) as image:
+            assert image.format == "WEBP"
+            assert image.size == (DERIVATIVE_SIZES[variant], DERIVATIVE_SIZES[variant] * 3 // 4)
+
+
+def test_render_derivatives_applies_exif_orientation():
+    """Phone photos stored sideways are rotated upright."""
+    rendered = render_derivatives(make_jpeg(400, 200, orientation=6))
+
+    with Image.open(BytesIO(rendered["thumbnail"])) as image:
+        assert image.width < image.height
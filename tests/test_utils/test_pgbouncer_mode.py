@@ -0,0 +1,81 @@
+"""Tests for PgBouncer transaction pooling support.
+
+The last test needs DATABASE_URL pointing at PgBouncer with DB_PGBOUNCER=true,
+as set up by ``make test-pgbouncer``.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import REQUEST_SESSIONS_KEY, EndTransactionsMiddleware, engine_options
+from app.models.vehicle import Vehicle
+
+
+def test_pgbouncer_mode_disables_statement_cache(monkeypatch):
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    connect_args = engine_options(pool_size=1, max_overflow=0)["connect_args"]
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name = connect_args["prepared_statement_name_func"]
+    assert name() != name()
+    assert set(connect_args["server_settings"]) == {"application_name"}
+
+
+class FakeSession:
+    def __init__(self, events: list[str]):
+        self.events = events
+
+    def in_transaction(self) -> bool:
+        return True
+
+    async def commit(self) -> None:
+        self.events.append("commit")
+
+
+@pytest.mark.asyncio
+async def test_transactions_end_before_the_response_starts():
+    events: list[str] = []
+    app = FastAPI()
+    app.add_middleware(EndTransactionsMiddleware)
+
+    @app.get("/")
+    async def endpoint(request: Request):
+        request.scope[REQUEST_SESSIONS_KEY].append(FakeSession(events))
+        return PlainTextResponse("ok")
+
+    async def recording_app(scope, receive, send):
+        async def recording_send(message):
+            events.append(message["type"])
+            await send(message)
+
+        await app(scope, receive, recording_send)
+
+    async with AsyncClient(transport=ASGITransport(app=recording_app), base_url="http://test") as client:
+        assert (await client.get("/")).status_code == 200
+    assert events[:2] == ["commit", "http.response.start"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not settings.DB_PGBOUNCER, reason="DB_PGBOUNCER not set")
+async def test_repeated_statements_through_pgbouncer():
+    """Statements re-prepared on server connections shared by several clients must not collide."""
+    engine = create_async_engine(settings.DATABASE_URL, **engine_options(pool_size=8, max_overflow=0))
+    sessionmaker = async_sessionmaker(engine)
+
+    async def worker():
+        for _ in range(5):
+            async with sessionmaker() as session, session.begin():
+                await session.execute(select(func.count()).select_from(Vehicle))
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(8)))
+    finally:
+        await engine.dispose()
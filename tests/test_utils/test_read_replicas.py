@@ -0,0 +1,74 @@
+"""Tests for read-replica routing.
+
+The last test needs a streaming replica of the test database, e.g. the
+``db-replica`` Compose service: set TEST_REPLICA_DATABASE_URL to run it.
+"""
+
+import os
+import time
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import database
+from app.database import PRIMARY_PIN_FIELD, Replica, RoutingSession, choose_replica
+from app.models.user import User
+from app.models.vehicle import Vehicle
+
+
+def make_replica(lag: float | None) -> Replica:
+    engine = create_async_engine("postgresql+asyncpg://fleetcore@replica/fleetcore")
+    return Replica(engine, lag=lag, checked_at=time.monotonic())
+
+
+def test_reads_go_to_replica_until_the_session_writes():
+    replica = make_replica(0.0)
+    web_session = {"user_id": "u"}
+    session = RoutingSession(info={"replica": replica, "web_session": web_session})
+    primary = database.get_engine().sync_engine
+    vehicle_mapper = Vehicle.__mapper__
+
+    assert session.get_bind(vehicle_mapper, clause=select(Vehicle)) is replica.engine.sync_engine
+    assert session.get_bind(User.__mapper__, clause=select(User)) is primary
+
+    assert session.get_bind(vehicle_mapper, clause=update(Vehicle).values(current_mileage=1)) is primary
+    assert session.get_bind(vehicle_mapper, clause=select(Vehicle)) is primary
+    assert web_session[PRIMARY_PIN_FIELD] > time.time()
+
+
+@pytest.mark.asyncio
+async def test_choose_replica_skips_lagging_and_unreachable(monkeypatch):
+    monkeypatch.setattr(database.settings, "DB_REPLICA_MAX_LAG_SECONDS", 5.0)
+    fresh = make_replica(0.5)
+    monkeypatch.setattr(database, "get_replicas", lambda: [make_replica(30.0), make_replica(None), fresh])
+    assert await choose_replica() is fresh
+
+    monkeypatch.setattr(database, "get_replicas", lambda: [make_replica(30.0)])
+    assert await choose_replica() is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.getenv("TEST_REPLICA_DATABASE_URL"), reason="TEST_REPLICA_DATABASE_URL not set")
+async def test_selects_run_on_a_live_replica():
+    replica = Replica(create_async_engine(os.environ["TEST_REPLICA_DATABASE_URL"]))
+    try:
+        await replica.refresh()
+        assert replica.lag is not None
+
+        async with database.get_sessionmaker()(info={"replica": replica}) as session:
+            assert (await session.execute(select(func.pg_is_in_recovery()))).scalar() is True
+    finally:
+        await replica.engine.dispose()
+
+
+def test_locking_reads_and_pgbouncer_reads():
+    replica = make_replica(0.0)
+    locking = RoutingSession(info={"replica": replica})
+    for_update = select(Vehicle).with_for_update()
+    assert locking.get_bind(Vehicle.__mapper__, clause=for_update) is database.get_engine().sync_engine
+
+    autocommit = RoutingSession(info={"replica": replica, "autocommit_reads": True})
+    bind = autocommit.get_bind(Vehicle.__mapper__, clause=select(Vehicle))
+    assert bind.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+    assert autocommit.get_bind(Vehicle.__mapper__, clause=select(Vehicle)) is bind
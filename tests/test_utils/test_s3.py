@@ -0,0 +1,168 @@
+"""Tests for the S3 client: presigned URL caching, streaming uploads and non-blocking transfers."""
+
+import asyncio
+import time
+from io import BytesIO
+
+import pytest
+
+from app.utils import s3
+from app.utils.s3 import PresignedURLCache, S3Client, content_key, hash_stream
+
+
+def test_cache_reuses_url_within_lifetime():
+    """A cached URL is returned until reuse_fraction of its lifetime has passed."""
+    cache = PresignedURLCache(reuse_fraction=0.8)
+    cache.put("a.jpg", 3600, "https://signed/a")
+
+    assert cache.get("a.jpg", 3600) == "https://signed/a"
+    assert cache.get("a.jpg", 60) is None
+
+
+def test_cache_expires(monkeypatch):
+    """Entries are dropped once they are too close to expiry to hand out."""
+    now = [1000.0]
+    monkeypatch.setattr(s3.time, "monotonic", lambda: now[0])
+    cache = PresignedURLCache(reuse_fraction=0.5)
+    cache.put("a.jpg", 100, "https://signed/a")
+
+    now[0] += 49
+    assert cache.get("a.jpg", 100) == "https://signed/a"
+    now[0] += 2
+    assert cache.get("a.jpg", 100) is None
+
+
+def test_cache_evicts_lru_and_discards():
+    """The cache is bounded and deleted keys are evicted."""
+    cache = PresignedURLCache(maxsize=2)
+    cache.put("a", 3600, "A")
+    cache.put("b", 3600, "B")
+    cache.get("a", 3600)
+    cache.put("c", 3600, "C")
+
+    assert cache.get("b", 3600) is None
+    assert cache.get("a", 3600) == "A"
+
+    cache.discard("a")
+    assert cache.get("a", 3600) is None
+
+
+class SlowS3:
+    """Stands in for boto3: blocks the calling thread like a large transfer."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def put_object(self, **kwargs):
+        time.sleep(self.seconds)
+
+
+def make_client(seconds: float) -> S3Client:
+    client = S3Client.__new__(S3Client)
+    client.client = SlowS3(seconds)
+    client.bucket = "test"
+    return client
+
+
+@pytest.mark.asyncio
+async def test_large_upload_keeps_event_loop_responsive():
+    """Concurrent requests are served on time while a 1 s upload is in flight."""
+    loop = asyncio.get_running_loop()
+    lags: list[float] = []
+
+    async def other_request():
+        while True:
+            start = loop.time()
+            await asyncio.sleep(0.01)
+            lags.append(loop.time() - start - 0.01)
+
+    ticker = asyncio.create_task(other_request())
+    size = await make_client(1.0).upload_stream_async(BytesIO(b"x" * 1024), "blobs/ab/scan.pdf", "application/pdf")
+    ticker.cancel()
+
+    assert size == 1024
+    assert len(lags) > 50
+    assert max(lags) < 0.1
+
+
+class RecordingS3:
+    """Stands in for boto3 and records the upload calls it receives."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+
+    def put_object(self, **kwargs):
+        self.calls.append(("put_object", kwargs))
+
+    def create_multipart_upload(self, **kwargs):
+        self.calls.append(("create_multipart_upload", kwargs))
+        return {"UploadId": "up-1"}
+
+    def upload_part(self, **kwargs):
+        self.calls.append(("upload_part", kwargs))
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.calls.append(("complete_multipart_upload", kwargs))
+
+    def abort_multipart_upload(self, **kwargs):
+        self.calls.append(("abort_multipart_upload", kwargs))
+
+
+def make_recording_client(monkeypatch, part_size: int) -> tuple[S3Client, RecordingS3]:
+    monkeypatch.setattr(s3, "multipart_part_size", lambda: part_size)
+    monkeypatch.setattr(s3, "_READ_CHUNK", 3)
+    client = S3Client.__new__(S3Client)
+    client.client = RecordingS3()
+    client.bucket = "test"
+    return client, client.client
+
+
+def test_small_upload_is_single_put(monkeypatch):
+    """Files smaller than one part are sent with a single PUT."""
+    client, fake = make_recording_client(monkeypatch, part_size=10)
+
+    size = client.upload_stream(BytesIO(b"hello"), "blobs/2c/a.txt", "text/plain")
+
+    assert size == 5
+    assert [name for name, _ in fake.calls] == ["put_object"]
+    assert fake.calls[0][1]["Body"] == b"hello"
+
+
+def test_large_upload_streams_parts(monkeypatch):
+    """Larger files are sent as a multipart upload, one part at a time."""
+    client, fake = make_recording_client(monkeypatch, part_size=10)
+
+    size = client.upload_stream(BytesIO(b"x" * 25), "blobs/ab/a.pdf", "application/pdf")
+
+    assert size == 25
+    parts = [kwargs["Body"] for name, kwargs in fake.calls if name == "upload_part"]
+    assert [len(p) for p in parts] == [10, 10, 5]
+    complete = fake.calls[-1]
+    assert complete[0] == "complete_multipart_upload"
+    assert [p["PartNumber"] for p in complete[1]["MultipartUpload"]["Parts"]] == [1, 2, 3]
+
+
+def test_oversized_upload_is_aborted(monkeypatch):
+    """Exceeding max_size mid-stream aborts the multipart upload."""
+    client, fake = make_recording_client(monkeypatch, part_size=10)
+
+    with pytest.raises(ValueError, match="too large"):
+        client.upload_stream(BytesIO(b"x" * 100), "blobs/ab/a.pdf", "application/pdf", max_size=25)
+
+    names = [name for name, _ in fake.calls]
+    assert names[-1] == "abort_multipart_upload"
+    assert "complete_multipart_upload" not in names
+    assert sum(len(kwargs["Body"]) for name, kwargs in fake.calls if name == "upload_part") <= 25
+
+
+def test_hash_stream_rewinds_and_limits_size():
+    """Hashing reports digest and size, rewinds the file and rejects oversized input."""
+    fileobj = BytesIO(b"abc")
+    digest, size = hash_stream(fileobj)
+
+    assert digest == "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+    assert size == 3 and fileobj.tell() == 0
+    assert content_key(digest, "Scan.PDF") == f"blobs/ba/{digest}.pdf"
+    with pytest.raises(ValueError, match="too large"):
+        hash_stream(BytesIO(b"x" * 10), max_size=5)
@@ -0,0 +1,34 @@
+"""Tests for password hashing off the event loop."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.utils.security import hash_password, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_password_checks_do_not_block_the_event_loop():
+    """The loop keeps ticking while bcrypt (~250 ms per check) runs on the hashing pool."""
+    hashed = hash_password("correct horse")
+    gaps = []
+
+    async def ticker(done: asyncio.Event):
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    done = asyncio.Event()
+    tick = asyncio.create_task(ticker(done))
+    results = await asyncio.gather(
+        verify_password_async("correct horse", hashed), verify_password_async("wrong", hashed)
+    )
+    done.set()
+    await tick
+
+    assert results == [True, False]
+    assert max(gaps) < 0.15
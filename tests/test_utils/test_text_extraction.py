@@ -0,0 +1,89 @@
+"""Tests for document text extraction."""
+
+import io
+import sys
+import types
+
+import pytest
+from PIL import Image
+from pypdf import PageObject, PdfReader, PdfWriter
+
+from app.utils import text_extraction
+from app.utils.text_extraction import extract_text
+
+
+def make_pdf(text: str) -> bytes:
+    """Build a minimal one-page PDF with a text layer."""
+    content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R"
+        b" /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def test_extracts_pdf_text_layer():
+    """Text is pulled from the PDF text layer with whitespace normalized."""
+    assert extract_text(make_pdf("Invoice   from ACME Logistics"), "application/pdf") == "Invoice from ACME Logistics"
+
+
+def test_unreadable_files_raise_value_error():
+    """Corrupt files and unsupported types surface as ValueError."""
+    with pytest.raises(ValueError):
+        extract_text(b"not a pdf", "application/pdf")
+    with pytest.raises(ValueError):
+        extract_text(b"PK\x03\x04", "application/msword")
+
+
+def encrypt(pdf: bytes, user_password: str) -> bytes:
+    writer = PdfWriter(clone_from=PdfReader(io.BytesIO(pdf)))
+    writer.encrypt(user_password=user_password, owner_password="owner", algorithm="AES-128")
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def test_encrypted_pdfs():
+    """PDFs with only an owner password are read; password-protected ones raise ValueError."""
+    pdf = make_pdf("Service act 42")
+    assert extract_text(encrypt(pdf, ""), "application/pdf") == "Service act 42"
+    with pytest.raises(ValueError):
+        extract_text(encrypt(pdf, "secret"), "application/pdf")
+
+
+def test_malformed_pdf_errors_raise_value_error(monkeypatch):
+    """Errors pypdf lets escape on malformed files (KeyError, TypeError, ...) surface as ValueError."""
+    def broken(self, *args, **kwargs):
+        raise KeyError("/Font")
+
+    monkeypatch.setattr(PageObject, "extract_text", broken)
+    with pytest.raises(ValueError):
+        extract_text(make_pdf("x"), "application/pdf")
+
+
+def test_decompression_bomb_raises_value_error(monkeypatch):
+    """Images over the pixel limit are rejected before OCR."""
+    monkeypatch.setitem(sys.modules, "pytesseract", types.SimpleNamespace(image_to_string=lambda *a, **k: "text"))
+    monkeypatch.setattr(text_extraction, "ocr_available", lambda: True)
+    monkeypatch.setattr(text_extraction, "MAX_IMAGE_PIXELS", 10)
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", Image.MAX_IMAGE_PIXELS)  # restored afterwards
+    out = io.BytesIO()
+    Image.new("L", (100, 100)).save(out, "PNG")
+
+    with pytest.raises(ValueError):
+        extract_text(out.getvalue(), "image/png")
@@ -0,0 +1,157 @@
+"""Tests for the Vault secrets provider against a fake Vault HTTP server."""
+
+import json
+import os
+import stat
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import config
+from app.utils import vault
+from app.utils.vault import VaultSecretsProvider
+
+TOKEN = "test-token"
+
+
+class FakeVault:
+    """Serves the KV v2 read endpoint for ``secret/fleetcore``."""
+
+    def __init__(self):
+        self.secrets = {"SECRET_KEY": "v1"}
+        self.lease_duration = 0
+        self.failures = 0  # answer this many reads with 503
+        self.reads = 0
+        vault_state = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/v1/secret/data/fleetcore":
+                    return self._reply(404, {"errors": []})
+                if self.headers.get("X-Vault-Token") != TOKEN:
+                    return self._reply(403, {"errors": ["permission denied"]})
+                vault_state.reads += 1
+                if vault_state.failures:
+                    vault_state.failures -= 1
+                    return self._reply(503, {"errors": ["Vault is sealed"]})
+                self._reply(
+                    200,
+                    {
+                        "lease_id": "",
+                        "renewable": False,
+                        "lease_duration": vault_state.lease_duration,
+                        "data": {"data": dict(vault_state.secrets), "metadata": {"version": vault_state.reads}},
+                    },
+                )
+
+            def _reply(self, status: int, body: dict):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def fake_vault(monkeypatch):
+    monkeypatch.setattr(vault, "RETRY_BASE_SECONDS", 0.01)
+    server = FakeVault()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_startup_retries_through_a_brief_outage(fake_vault):
+    fake_vault.failures = 2
+    provider = VaultSecretsProvider(fake_vault.url, TOKEN, ttl=0)
+
+    assert provider.get() == {"SECRET_KEY": "v1"}
+    assert fake_vault.reads == 3
+
+
+def test_file_cache_is_shared_private_and_survives_an_outage(fake_vault, tmp_path):
+    cache_file = str(tmp_path / "vault.json")
+    first = VaultSecretsProvider(fake_vault.url, TOKEN, ttl=300, cache_file=cache_file)
+    assert first.get() == {"SECRET_KEY": "v1"}
+    first.stop()
+    assert stat.S_IMODE(os.stat(cache_file).st_mode) == 0o600
+
+    # Another process on the host within the TTL: no Vault round trip
+    second = VaultSecretsProvider(fake_vault.url, TOKEN, ttl=300, cache_file=cache_file)
+    assert second.get() == {"SECRET_KEY": "v1"}
+    second.stop()
+    assert fake_vault.reads == 1
+
+    # Cache expired and Vault down: start with the last known values
+    fake_vault.failures = 100
+    third = VaultSecretsProvider(fake_vault.url, TOKEN, ttl=0.01, cache_file=cache_file)
+    time.sleep(0.02)
+    assert third.get() == {"SECRET_KEY": "v1"}
+    third.stop()
+
+    # ... unless they are older than max_stale
+    fourth = VaultSecretsProvider(fake_vault.url, TOKEN, ttl=0.01, cache_file=cache_file, max_stale=0.01)
+    assert fourth.get() == {}
+    fourth.stop()
+
+
+def test_rotated_secrets_reach_settings_before_the_lease_ends(fake_vault, monkeypatch):
+    fake_vault.secrets = {"TELEGRAM_BOT_TOKEN": "bot-v1", "TELEGRAM_CHAT_ID": "from-vault"}
+    fake_vault.lease_duration = 1  # re-read after ~0.67 s despite the long TTL
+    provider = VaultSecretsProvider(fake_vault.url, TOKEN, ttl=300)
+    monkeypatch.setattr(config, "get_vault_provider", lambda: provider)
+    monkeypatch.setattr(config, "_current", None)
+    monkeypatch.setenv("TELEGRAM_CHAT_ID", "from-env")
+
+    try:
+        assert config.settings.TELEGRAM_BOT_TOKEN == "bot-v1"
+        assert config.settings.TELEGRAM_CHAT_ID == "from-env"
+
+        fake_vault.secrets = {**fake_vault.secrets, "TELEGRAM_BOT_TOKEN": "bot-v2"}
+        assert wait_for(lambda: config.settings.TELEGRAM_BOT_TOKEN == "bot-v2")
+        assert config.settings.TELEGRAM_CHAT_ID == "from-env"
+    finally:
+        provider.stop()
+
+
+def test_cache_file_not_private_or_from_the_future_is_ignored(fake_vault, tmp_path):
+    cache_file = tmp_path / "vault.json"
+    provider = VaultSecretsProvider(fake_vault.url, TOKEN, ttl=300, cache_file=str(cache_file))
+    planted = {"source": provider.source, "fetched_at": time.time(), "secrets": {"SECRET_KEY": "planted"}}
+
+    cache_file.write_text(json.dumps(planted))
+    cache_file.chmod(0o644)
+    assert provider._read_cache() is None
+
+    cache_file.chmod(0o600)
+    assert provider._read_cache().secrets == {"SECRET_KEY": "planted"}
+
+    cache_file.write_text(json.dumps({**planted, "fetched_at": time.time() + 3600}))
+    assert provider._read_cache() is None
+    assert provider.get() == {"SECRET_KEY": "v1"}
+    provider.stop()
+
+
+def test_refresh_is_never_scheduled_past_the_interval():
+    provider = VaultSecretsProvider("http://vault", TOKEN, ttl=300)
+    future = vault.SecretsSnapshot({}, fetched_at=time.time() + 86400, lease_duration=30)
+    assert provider.refresh_in(future) <= 20
@@ -0,0 +1,141 @@
+"""Tests for Redis-backed web sessions."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.services import session_store
+from app.web.sessions import RedisSessionMiddleware
+
+
+class FakeRedis:
+    """The hash/set subset of redis.asyncio the session store uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.data.get(key, {}).pop(field, None)
+
+    async def expire(self, key, seconds):
+        return key in self.data
+
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    async def srem(self, key, *members):
+        self.data.get(key, set()).difference_update(members)
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((getattr(self.redis, name), args, kwargs))
+
+    async def execute(self):
+        return [await fn(*args, **kwargs) for fn, args, kwargs in self.calls]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+async def login(request: Request):
+    request.session["user_id"] = "u1"
+    return JSONResponse({})
+
+
+async def whoami(request: Request):
+    return JSONResponse({"user_id": request.session.get("user_id")})
+
+
+async def logout(request: Request):
+    request.session.clear()
+    return JSONResponse({})
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(session_store, "get_async_redis", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[Route("/login", login), Route("/me", whoami), Route("/logout", logout)])
+    app = RedisSessionMiddleware(app, session_cookie="sid", max_age=3600)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_cookie_holds_only_the_session_id(redis, client):
+    """Session data stays in Redis and survives across requests until logout."""
+    async with client:
+        await client.get("/login")
+        session_id = client.cookies["sid"]
+        assert redis.data[session_store.session_key(session_id)] == {"user_id": '"u1"'}
+        assert (await client.get("/me")).json() == {"user_id": "u1"}
+
+        await client.get("/logout")
+        assert session_store.session_key(session_id) not in redis.data
+        assert (await client.get("/me")).json() == {"user_id": None}
+
+
+@pytest.mark.asyncio
+async def test_revoked_sessions_are_signed_out(redis, client):
+    """Revoking a user's sessions signs them out; their old id is not reused."""
+    async with client:
+        await client.get("/login")
+        session_id = client.cookies["sid"]
+        await session_store.revoke_user_sessions("u1")
+
+        assert (await client.get("/me")).json() == {"user_id": None}
+        await client.get("/login")
+        assert client.cookies["sid"] != session_id
+
+
+@pytest.mark.asyncio
+async def test_store_outage_keeps_the_cookie(redis, client):
+    """While Redis is down the request is served signed out, but the session cookie is not cleared."""
+    async with client:
+        await client.get("/login")
+        session_id = client.cookies["sid"]
+
+        async def down(*args, **kwargs):
+            raise RedisConnectionError("Connection refused")
+
+        redis.hgetall = down
+        response = await client.get("/me")
+        assert response.json() == {"user_id": None}
+        assert "set-cookie" not in response.headers
+
+        del redis.hgetall
+        assert (await client.get("/me")).json() == {"user_id": "u1"}
+        assert client.cookies["sid"] == session_id